@@ -1,13 +1,132 @@
 
+from django import forms
 from django.contrib import admin
 from django.utils.html import format_html
 from django.core.exceptions import ValidationError
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import QuerySet
 from app.models import (
     User, Test,
     ListeningSection, ListeningQuestion,
     ReadingPassage, ReadingQuestion,
     WritingTask
 )
+from app.services.rescoring import rescore_test, sync_rescore_error
+from app.services.test_summary import get_test_summary, rebuild_test_summaries
+from app.services.content_version import touch_test
+from app.services.test_versions import EDITABLE_WHEN_FROZEN, frozen_test_ids
+
+
+class FullTextSearchMixin:
+    """
+    Admin qidiruvi search_vector (GIN index) orqali - ILIKE full scan o'rniga.
+    Faqat raqamdan iborat so'rov (masalan savol raqami) odatiy search_fields bilan.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term or search_term.isdigit():
+            return super().get_search_results(request, queryset, search_term)
+        query = SearchQuery(search_term, search_type='websearch', config='english')
+        return queryset.filter(search_vector=query), False
+
+
+class FrozenTestContentAdminMixin:
+    """
+    Nashr qilingan (muzlatilgan) test kontenti admin orqali ham o'zgartirilmaydi -
+    dashboard dagi IsTestContentEditable bilan bir xil qoida.
+    test_parent_field - obyektni testga bog'lovchi FK ('test', 'section' yoki 'passage').
+    correct_answer (EDITABLE_WHEN_FROZEN) muzlatilgan testda ham tahrirlanadi.
+    """
+    test_parent_field = 'test'
+    frozen_message = "Test nashr qilingan va muzlatilgan. O'zgartirish uchun yangi versiya yarating"
+
+    def get_object_test_id(self, obj):
+        if self.test_parent_field == 'test':
+            return obj.test_id
+        return getattr(obj, self.test_parent_field).test_id
+
+    def frozen_editable_fields(self):
+        return EDITABLE_WHEN_FROZEN & {field.name for field in self.model._meta.fields}
+
+    def is_frozen(self, obj):
+        if obj is None or obj.pk is None:
+            return False
+        # Permission tekshiruvlari bir so'rovda bir necha marta chaqiriladi
+        if not hasattr(obj, '_admin_frozen'):
+            obj._admin_frozen = bool(frozen_test_ids([self.get_object_test_id(obj)]))
+        return obj._admin_frozen
+
+    def frozen_among(self, objs):
+        if isinstance(objs, QuerySet):
+            lookup = 'test_id' if self.test_parent_field == 'test' else f'{self.test_parent_field}__test_id'
+            return frozen_test_ids(objs.values_list(lookup, flat=True).distinct())
+        return frozen_test_ids(self.get_object_test_id(obj) for obj in objs)
+
+    def reject_frozen(self, request, queryset):
+        """Action lar uchun - tanlanganlar orasida muzlatilgan test bo'lsa xabar beradi"""
+        frozen = self.frozen_among(queryset)
+        if frozen:
+            self.message_user(
+                request, f"{self.frozen_message} (test: {', '.join(map(str, sorted(frozen)))})", level='error'
+            )
+        return bool(frozen)
+
+    def has_change_permission(self, request, obj=None):
+        if not self.frozen_editable_fields() and self.is_frozen(obj):
+            return False
+        return super().has_change_permission(request, obj)
+
+    def has_delete_permission(self, request, obj=None):
+        if self.is_frozen(obj):
+            return False
+        return super().has_delete_permission(request, obj)
+
+    def get_readonly_fields(self, request, obj=None):
+        readonly = list(super().get_readonly_fields(request, obj))
+        if self.is_frozen(obj):
+            editable = self.frozen_editable_fields()
+            readonly += [
+                field.name for field in self.model._meta.fields
+                if field.editable and not field.primary_key
+                and field.name not in editable and field.name not in readonly
+            ]
+        return readonly
+
+    def get_deleted_objects(self, objs, request):
+        # delete_selected action ham shu yerdan o'tadi - perms_needed bo'lsa o'chirish rad etiladi
+        deleted_objects, model_count, perms_needed, protected = super().get_deleted_objects(objs, request)
+        if self.frozen_among(objs):
+            perms_needed.add('muzlatilgan test kontenti')
+        return deleted_objects, model_count, perms_needed, protected
+
+    def _frozen_guard_form(self, form_class):
+        admin_instance = self
+
+        class FrozenGuardForm(form_class):
+            def clean(self):
+                cleaned_data = super().clean()
+                if not self.has_changed() or set(self.changed_data) <= EDITABLE_WHEN_FROZEN:
+                    return cleaned_data
+                # self.instance hali eski qiymatlarda - eski va yangi test ham tekshiriladi
+                test_ids = set()
+                if self.instance.pk is not None:
+                    test_ids.add(admin_instance.get_object_test_id(self.instance))
+                parent = cleaned_data.get(admin_instance.test_parent_field)
+                if parent is not None:
+                    test_ids.add(parent.pk if admin_instance.test_parent_field == 'test' else parent.test_id)
+                if frozen_test_ids(test_ids):
+                    raise ValidationError(admin_instance.frozen_message)
+                return cleaned_data
+
+        return FrozenGuardForm
+
+    def get_form(self, request, obj=None, **kwargs):
+        return self._frozen_guard_form(super().get_form(request, obj, **kwargs))
+
+    def get_changelist_form(self, request, **kwargs):
+        # list_editable (points) ham muzlatilgan testda rad etiladi
+        return self._frozen_guard_form(super().get_changelist_form(request, **kwargs))
 
 
 # ============================================
@@ -26,19 +145,81 @@ class UserAdmin(admin.ModelAdmin):
 # TEST ADMIN
 # ============================================
 
+class TestAdminForm(forms.ModelForm):
+    """Admin (list_editable ham) orqali ham faqat to'liq test nashr qilinadi"""
+
+    class Meta:
+        model = Test
+        fields = '__all__'
+
+    def clean_is_published(self):
+        value = self.cleaned_data.get('is_published')
+        # self.instance hali eski qiymatlarda (_post_clean dan oldin)
+        if not value or self.instance.is_published:
+            return value
+        if self.instance.pk is None:
+            raise ValidationError("Yangi test bo'sh - avval kontent qo'shing, keyin nashr qiling")
+
+        summary = get_test_summary(self.instance)
+        if not summary.is_ready:
+            missing = ', '.join(
+                f"{field}: {counts['have']}/{counts['required']}" for field, counts in summary.missing().items()
+            )
+            raise ValidationError(f"Test to'liq emas ({missing})")
+        return value
+
+
 @admin.register(Test)
 class TestAdmin(admin.ModelAdmin):
-    list_display = ['id', 'title', 'difficulty_level', 'is_published', 'created_by', 'created_at']
-    list_filter = ['difficulty_level', 'is_published', 'created_at']
+    form = TestAdminForm
+    list_display = ['id', 'title', 'difficulty_level', 'is_published', 'is_ready', 'created_by', 'created_at']
+    list_filter = ['difficulty_level', 'is_published', 'summary__is_ready', 'created_at']
+    list_select_related = ['summary', 'created_by']
     search_fields = ['title', 'description']
     list_editable = ['is_published']
     ordering = ['-created_at']
 
+    actions = ['rescore_attempts', 'rebuild_summaries']
+
+    def get_changelist_form(self, request, **kwargs):
+        # list_editable formasi ModelAdmin.form ni ishlatmaydi
+        kwargs.setdefault('form', TestAdminForm)
+        return super().get_changelist_form(request, **kwargs)
+
+    @admin.display(boolean=True, description='Tayyor')
+    def is_ready(self, obj):
+        summary = getattr(obj, 'summary', None)
+        return summary.is_ready if summary else None
+
     def save_model(self, request, obj, form, change):
         if not obj.pk:  # Yangi test
             obj.created_by = request.user
         super().save_model(request, obj, form, change)
 
+    def rescore_attempts(self, request, queryset):
+        """Tanlangan testlarning attemptlarini qayta baholash"""
+        for test in queryset:
+            error = sync_rescore_error(test.id)
+            if error:
+                self.message_user(request, f'{test.title}: {error}', level='error')
+                continue
+            stats = rescore_test(test.id)
+            self.message_user(
+                request,
+                f'{test.title}: {stats["attempts"]} attempt qayta baholandi, '
+                f'{stats["changed"]} ta javob o\'zgardi',
+                level='success'
+            )
+
+    rescore_attempts.short_description = 'Attemptlarni qayta baholash'
+
+    def rebuild_summaries(self, request, queryset):
+        """Tanlangan testlar summary sini qayta hisoblash"""
+        count = rebuild_test_summaries(queryset.values_list('pk', flat=True))
+        self.message_user(request, f'{count} ta test summary qayta hisoblandi', level='success')
+
+    rebuild_summaries.short_description = 'Summary ni qayta hisoblash'
+
 
 # ============================================
 # LISTENING ADMIN
@@ -48,7 +229,7 @@ class ListeningQuestionInline(admin.TabularInline):
     """Inline - Section ichida savollarni ko'rsatish"""
     model = ListeningQuestion
     extra = 1
-    fields = ['question_number', 'question_text', 'question_type', 'question_data', 'points']
+    fields = ['question_number', 'question_text', 'question_type', 'question_data', 'correct_answer', 'points']
     ordering = ['question_number']
 
     # JSON fieldlarni to'g'ri ko'rsatish uchun
@@ -62,7 +243,7 @@ class ListeningQuestionInline(admin.TabularInline):
 
 
 @admin.register(ListeningSection)
-class ListeningSectionAdmin(admin.ModelAdmin):
+class ListeningSectionAdmin(FrozenTestContentAdminMixin, admin.ModelAdmin):
     list_display = ['id', 'test', 'section_number', 'audio_preview', 'audio_duration', 'question_count']
     list_filter = ['test', 'section_number']
     search_fields = ['test__title']
@@ -89,7 +270,8 @@ class ListeningSectionAdmin(admin.ModelAdmin):
 
 
 @admin.register(ListeningQuestion)
-class ListeningQuestionAdmin(admin.ModelAdmin):
+class ListeningQuestionAdmin(FrozenTestContentAdminMixin, FullTextSearchMixin, admin.ModelAdmin):
+    test_parent_field = 'section'
     list_display = [
         'question_number',
         'section',
@@ -124,6 +306,10 @@ class ListeningQuestionAdmin(admin.ModelAdmin):
             'fields': ('question_data', 'question_image'),
             'description': 'Question type ga qarab to\'ldiring'
         }),
+        ('Javob kaliti', {
+            'fields': ('correct_answer',),
+            'description': '"A", ["answer1", "answer2"] yoki matching uchun {"1": "C"}'
+        }),
     )
 
     readonly_fields = []
@@ -186,6 +372,8 @@ class ListeningQuestionAdmin(admin.ModelAdmin):
 
     def duplicate_questions(self, request, queryset):
         """Tanlangan savollarni nusxalash"""
+        if self.reject_frozen(request, queryset):
+            return
         count = 0
         for question in queryset:
             question.pk = None
@@ -205,7 +393,14 @@ class ListeningQuestionAdmin(admin.ModelAdmin):
 
     def reset_points(self, request, queryset):
         """Ballni 1 ga qaytarish"""
+        if self.reject_frozen(request, queryset):
+            return
+        test_ids = set(queryset.values_list('section__test_id', flat=True))
         updated = queryset.update(points=1)
+        # update() signal yubormaydi - answer key versiyasi va total_points qo'lda yangilanadi
+        for test_id in test_ids:
+            touch_test(test_id)
+        rebuild_test_summaries(test_ids)
         self.message_user(
             request,
             f'{updated} ta savol balli 1 ga o\'zgartirildi',
@@ -233,7 +428,7 @@ class ReadingQuestionInline(admin.TabularInline):
 
 
 @admin.register(ReadingPassage)
-class ReadingPassageAdmin(admin.ModelAdmin):
+class ReadingPassageAdmin(FrozenTestContentAdminMixin, FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['id', 'test', 'passage_number', 'title', 'word_count', 'question_count']
     list_filter = ['test', 'passage_number']
     search_fields = ['title', 'passage_text']
@@ -262,7 +457,8 @@ class ReadingPassageAdmin(admin.ModelAdmin):
 
 
 @admin.register(ReadingQuestion)
-class ReadingQuestionAdmin(admin.ModelAdmin):
+class ReadingQuestionAdmin(FrozenTestContentAdminMixin, FullTextSearchMixin, admin.ModelAdmin):
+    test_parent_field = 'passage'
     list_display = ['id', 'passage', 'question_number', 'question_type','correct_answer', 'points']
     list_filter = ['passage__test', 'passage', 'question_type']
     search_fields = ['question_text', 'correct_answer']
@@ -275,7 +471,7 @@ class ReadingQuestionAdmin(admin.ModelAdmin):
 # ============================================
 
 @admin.register(WritingTask)
-class WritingTaskAdmin(admin.ModelAdmin):
+class WritingTaskAdmin(FrozenTestContentAdminMixin, FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['id', 'test', 'task_number', 'task_type', 'word_limit', 'time_suggestion', 'image_preview']
     list_filter = ['test', 'task_number', 'task_type']
     search_fields = ['prompt_text']
@@ -0,0 +1,153 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from app.models import TestAttempt, ListeningAnswer, ReadingAnswer, ListeningQuestion, ReadingQuestion
+from app.services.submission import upsert_answers
+
+
+ANSWER_MODELS = {
+    'listening': (ListeningAnswer, ListeningQuestion, 'section__test_id'),
+    'reading': (ReadingAnswer, ReadingQuestion, 'passage__test_id'),
+}
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _delete_then_insert(model, attempt, rows):
+    """Eski usul: hammasini o'chirib qayta yozish"""
+    deleted, _ = model.objects.filter(attempt=attempt).delete()
+    model.objects.bulk_create(rows)
+    return len(rows), deleted
+
+
+def _upsert(model, attempt, rows):
+    return upsert_answers(model, attempt, rows, 'question', update_fields=['user_answer', 'is_correct', 'answered_at'])
+
+
+STRATEGIES = {
+    'delete+insert': _delete_then_insert,
+    'upsert': _upsert,
+}
+
+
+def _wal_position():
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_current_wal_insert_lsn()')
+        return cursor.fetchone()[0]
+
+
+def _wal_bytes(start, end):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_wal_lsn_diff(%s, %s)', [end, start])
+        return int(cursor.fetchone()[0])
+
+
+class Command(BaseCommand):
+    help = ("Javoblarni saqlash usullarini solishtirish (delete+insert va upsert). "
+            "Hammasi bitta transaction ichida bajariladi va rollback qilinadi "
+            "(--commit - har bir round alohida commit, oxirida javoblar tiklanadi)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('attempt_id', type=int)
+        parser.add_argument('--section', choices=list(ANSWER_MODELS), default='listening')
+        parser.add_argument('--answers', type=int, default=40, help='Payload dagi javoblar soni')
+        parser.add_argument('--rounds', type=int, default=20, help='Har bir usul uchun takrorlar')
+        parser.add_argument(
+            '--commit', action='store_true',
+            help="Har bir round commit qilinadi (haqiqiy submit kabi). Bitta katta transaction ichida "
+                 "eski qator versiyalari tozalanmaydi va upsert sekinroq ko'rinadi"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            attempt = TestAttempt.objects.get(pk=options['attempt_id'])
+        except TestAttempt.DoesNotExist:
+            raise CommandError(f"Attempt {options['attempt_id']} topilmadi")
+
+        model, question_model, test_lookup = ANSWER_MODELS[options['section']]
+        question_ids = list(
+            question_model.objects.filter(**{test_lookup: attempt.test_id})
+            .order_by('question_number').values_list('id', flat=True)[:options['answers']]
+        )
+        if not question_ids:
+            raise CommandError("Testda savollar yo'q")
+
+        self.stdout.write(
+            f"{options['section']}: {len(question_ids)} ta javob, {options['rounds']} round, "
+            f"attempt={attempt.id}"
+        )
+
+        if options['commit']:
+            original = list(model.objects.filter(attempt=attempt).values(
+                'question_id', 'user_answer', 'is_correct', 'answered_at'
+            ))
+            try:
+                for name, strategy in STRATEGIES.items():
+                    self._run(name, strategy, model, attempt, question_ids, options['rounds'])
+            finally:
+                with transaction.atomic():
+                    model.objects.filter(attempt=attempt).delete()
+                    restored = model.objects.bulk_create([model(attempt=attempt, **row) for row in original])
+                    # answered_at auto_now_add - asl vaqt alohida qaytariladi
+                    for answer, row in zip(restored, original):
+                        answer.answered_at = row['answered_at']
+                    model.objects.bulk_update(restored, ['answered_at'])
+            return
+
+        try:
+            with transaction.atomic():
+                for name, strategy in STRATEGIES.items():
+                    self._run(name, strategy, model, attempt, question_ids, options['rounds'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _run(self, name, strategy, model, attempt, question_ids, rounds):
+        # Boshlang'ich holat - attemptda allaqachon javoblar bor (qayta submit / rescoring)
+        model.objects.filter(attempt=attempt).delete()
+        model.objects.bulk_create([
+            model(attempt=attempt, question_id=question_id, user_answer='seed')
+            for question_id in question_ids
+        ])
+
+        timings = []
+        rows_written = 0
+        queries = 0
+        wal_start = _wal_position()
+
+        for round_number in range(rounds):
+            # Har roundda bitta javob o'zgaradi, qolganlari bir xil
+            rows = [
+                model(
+                    attempt=attempt,
+                    question_id=question_id,
+                    user_answer=f'answer-{round_number}' if index == round_number % len(question_ids) else 'seed',
+                    is_correct=None
+                )
+                for index, question_id in enumerate(question_ids)
+            ]
+
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                with transaction.atomic():
+                    written, deleted = strategy(model, attempt, rows)
+                timings.append((time.perf_counter() - started) * 1000)
+
+            rows_written += written + deleted
+            queries += len(captured)
+
+        wal_end = _wal_position()
+        wal = f", WAL={_wal_bytes(wal_start, wal_end) // rounds} B/round" if wal_start else ''
+
+        self.stdout.write(
+            f"  {name:<14} rows/round={rows_written / rounds:.0f} queries/round={queries / rounds:.0f} "
+            f"median={statistics.median(timings):.2f}ms max={max(timings):.2f}ms{wal}"
+        )
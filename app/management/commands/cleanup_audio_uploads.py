@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from app.services.audio_upload import STALE_UPLOAD_SECONDS, cleanup_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Tashlab ketilgan audio upload sessiyalari va vaqtinchalik fayllarini o'chirish (cron bilan)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age', type=int, default=STALE_UPLOAD_SECONDS,
+            help="Oxirgi bo'lakdan beri shuncha sekund o'tgan sessiyalar o'chiriladi"
+        )
+
+    def handle(self, *args, **options):
+        removed = cleanup_stale_uploads(options['max_age'])
+        self.stdout.write(self.style.SUCCESS(f"{removed} ta upload sessiyasi o'chirildi"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from app.services.image_derivatives import evict_derivatives
+
+
+class Command(BaseCommand):
+    help = "Rasm variantlari keshini IMAGE_DERIVATIVE_CACHE_MAX_BYTES gacha qisqartirish (cron bilan)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-bytes', type=int, default=None,
+            help="Kesh chegarasi (default: IMAGE_DERIVATIVE_CACHE_MAX_BYTES)"
+        )
+
+    def handle(self, *args, **options):
+        removed = evict_derivatives(options['max_bytes'])
+        self.stdout.write(self.style.SUCCESS(f"{removed} ta variant o'chirildi"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.models import Test
+from app.services.test_package import iter_test_package, export_filename
+
+
+class Command(BaseCommand):
+    help = "Testni zip paketga eksport qilish (manifest.json + media)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('test_id', type=int)
+        parser.add_argument('--output', '-o', help="Fayl nomi (default: test-<id>.zip)")
+
+    def handle(self, *args, **options):
+        try:
+            test = Test.objects.get(pk=options['test_id'])
+        except Test.DoesNotExist:
+            raise CommandError(f"Test {options['test_id']} topilmadi")
+
+        path = options['output'] or export_filename(test)
+        size = 0
+        with open(path, 'wb') as output:
+            for chunk in iter_test_package(test.id):
+                output.write(chunk)
+                size += len(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f"{path} ({size / 1024 / 1024:.1f} MB)"))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from app.services.media_storage import collect_media_garbage, rebuild_media_refs, register_orphan_blobs
+
+
+class Command(BaseCommand):
+    help = "Hech bir section/savol/task ishlatmaydigan media bloblarni o'chirish (cron bilan)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace', type=int, default=None,
+            help="ref_count 0 bo'lganidan keyin kutiladigan sekundlar (default: MEDIA_BLOB_GC_GRACE_SECONDS)"
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Faqat hisobot, hech narsa o'chirilmaydi")
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help="Avval barcha ref_count larni jadvallardan qayta hisoblash"
+        )
+        parser.add_argument(
+            '--scan', action='store_true',
+            help="Diskdagi ro'yxatga olinmagan bloblarni ham topish"
+        )
+
+    def handle(self, *args, **options):
+        if options['scan']:
+            created = register_orphan_blobs()
+            self.stdout.write(f"{created} ta ro'yxatdan o'tmagan blob topildi")
+        if options['rebuild']:
+            updated = rebuild_media_refs()
+            self.stdout.write(f"{updated} ta blob ref_count i tuzatildi")
+
+        removed, freed = collect_media_garbage(options['grace'], dry_run=options['dry_run'])
+        verb = "o'chiriladi" if options['dry_run'] else "o'chirildi"
+        self.stdout.write(self.style.SUCCESS(
+            f"{removed} ta blob {verb} ({freed / 1024 / 1024:.1f} MB)"
+        ))
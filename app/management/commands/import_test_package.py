@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.models import User
+from app.services.test_package import PackageError, import_test_package
+
+
+class Command(BaseCommand):
+    help = "Zip paketdan yangi test yaratish (nashr qilinmagan holda)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', help="created_by uchun username")
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"Foydalanuvchi {options['user']} topilmadi")
+
+        try:
+            with open(options['path'], 'rb') as package:
+                test = import_test_package(package, user=user)
+        except PackageError as e:
+            raise CommandError("Paket noto'g'ri:\n" + '\n'.join(e.errors))
+
+        self.stdout.write(self.style.SUCCESS(f"Test #{test.id} yaratildi: {test.title}"))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from app.services.audio_variants import process_variant_queue, requeue_stale_variants, schedule_audio_variants
+from app.models import ListeningSection
+
+
+class Command(BaseCommand):
+    help = "Section audiolarining yengil variantlarini (AudioVariant) fon rejimida tayyorlash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=5.0, help="Navbat bo'sh bo'lsa kutish (sekund)")
+        parser.add_argument('--once', action='store_true', help="Navbat bo'shagach to'xtash")
+        parser.add_argument(
+            '--backfill', action='store_true',
+            help="Avval barcha sectionlar uchun yetishmayotgan variantlarni navbatga qo'yish"
+        )
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            scheduled = sum(
+                schedule_audio_variants(section_id)
+                for section_id in ListeningSection.objects.values_list('pk', flat=True)
+            )
+            self.stdout.write(f"{scheduled} ta variant navbatga qo'yildi")
+
+        requeued = requeue_stale_variants()
+        if requeued:
+            self.stdout.write(f"{requeued} ta osilib qolgan variant navbatga qaytarildi")
+
+        processed = process_variant_queue(poll_interval=options['poll_interval'], once=options['once'])
+        self.stdout.write(self.style.SUCCESS(f"Tayyor: {processed} ta variant qayta ishlandi"))
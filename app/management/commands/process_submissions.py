@@ -0,0 +1,58 @@
+import os
+from multiprocessing import get_context
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from app.services.submission import process_intake_queue, requeue_stale_intakes
+from app.workers import run_submission_worker
+
+
+class Command(BaseCommand):
+    help = "Navbatga yozilgan submitlarni (SubmissionIntake) qayta ishlash"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Worker processlar soni (0 - joriy process)'
+        )
+        parser.add_argument('--batch-size', type=int, default=20, help='Bir marta olinadigan yozuvlar soni')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Navbat bo'sh bo'lsa kutish (sekund)")
+        parser.add_argument('--once', action='store_true', help="Navbat bo'shagach to'xtash")
+
+    def handle(self, *args, **options):
+        # Osilib qolgan yozuvlar process_intake_queue ichida ham davriy qaytariladi
+        requeued = requeue_stale_intakes()
+        if requeued:
+            self.stdout.write(f"{requeued} ta osilib qolgan yozuv navbatga qaytarildi")
+
+        batch_size = options['batch_size']
+        poll_interval = options['poll_interval']
+        once = options['once']
+
+        if not options['workers']:
+            processed = process_intake_queue(batch_size=batch_size, poll_interval=poll_interval, once=once)
+            self.stdout.write(self.style.SUCCESS(f"Tayyor: {processed} ta submit qayta ishlandi"))
+            return
+
+        # Spawn qilingan processlar o'z DB ulanishini ochadi
+        connections.close_all()
+        ctx = get_context('spawn')
+        processes = [
+            ctx.Process(target=run_submission_worker, args=(batch_size, poll_interval, once))
+            for _ in range(options['workers'])
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"{len(processes)} ta worker ishga tushdi")
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
+
+        self.stdout.write(self.style.SUCCESS("Workerlar to'xtadi"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from app.services.test_summary import rebuild_test_summaries
+
+
+class Command(BaseCommand):
+    help = "TestSummary qatorlarini bazadan qayta hisoblash (deploydan keyin yoki signalsiz o'zgarishlardan so'ng)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('test_ids', nargs='*', type=int, help="Bo'sh bo'lsa - barcha testlar")
+
+    def handle(self, *args, **options):
+        count = rebuild_test_summaries(options['test_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'{count} ta test summary qayta hisoblandi'))
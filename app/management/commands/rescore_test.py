@@ -0,0 +1,53 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.models import Test
+from app.services.rescoring import rescore_test, DEFAULT_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = "Test bo'yicha barcha Listening/Reading javoblarini qayta baholash (answer key o'zgargandan keyin)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('test_id', type=int)
+        parser.add_argument(
+            '--section', choices=['listening', 'reading', 'all'], default='all',
+            help='Qaysi section qayta baholanadi'
+        )
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Process pool hajmi (0 - joriy process)'
+        )
+
+    def handle(self, *args, **options):
+        test_id = options['test_id']
+        if not Test.objects.filter(pk=test_id).exists():
+            raise CommandError(f'Test {test_id} topilmadi')
+
+        if options['section'] == 'all':
+            sections = ('listening', 'reading')
+        else:
+            sections = (options['section'],)
+
+        def progress(section, stats):
+            rate = stats['answers'] / stats['elapsed'] if stats['elapsed'] else 0
+            self.stdout.write(
+                f"[{section}] attempts={stats['attempts']} answers={stats['answers']} "
+                f"changed={stats['changed']} ({rate:.0f} answers/s)"
+            )
+
+        stats = rescore_test(
+            test_id,
+            sections=sections,
+            chunk_size=options['chunk_size'],
+            workers=options['workers'],
+            progress=progress,
+        )
+
+        rate = stats['answers'] / stats['elapsed'] if stats['elapsed'] else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Tayyor: {stats['attempts']} attempt, {stats['answers']} javob, "
+            f"{stats['changed']} ta o'zgardi, {stats['elapsed']:.1f}s ({rate:.0f} answers/s)"
+        ))
@@ -0,0 +1,283 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:29
+
+import django.contrib.auth.models
+import django.contrib.auth.validators
+import django.core.validators
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListeningSection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section_number', models.IntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(4)])),
+                ('audio_file', models.FileField(upload_to='listening/audios/')),
+                ('audio_duration', models.IntegerField(help_text='Duration in seconds')),
+                ('instructions', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'listening_sections',
+                'ordering': ['section_number'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReadingPassage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('passage_number', models.IntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(3)])),
+                ('title', models.CharField(max_length=255)),
+                ('passage_text', models.TextField(help_text='Full reading passage text')),
+                ('word_count', models.IntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'reading_passages',
+                'ordering': ['passage_number'],
+            },
+        ),
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('username', models.CharField(error_messages={'unique': 'A user with that username already exists.'}, help_text='Required. 150 characters or fewer. Letters, digits and @/./+/-/_ only.', max_length=150, unique=True, validators=[django.contrib.auth.validators.UnicodeUsernameValidator()], verbose_name='username')),
+                ('first_name', models.CharField(blank=True, max_length=150, verbose_name='first name')),
+                ('last_name', models.CharField(blank=True, max_length=150, verbose_name='last name')),
+                ('email', models.EmailField(blank=True, max_length=254, verbose_name='email address')),
+                ('is_staff', models.BooleanField(default=False, help_text='Designates whether the user can log into this admin site.', verbose_name='staff status')),
+                ('is_active', models.BooleanField(default=True, help_text='Designates whether this user should be treated as active. Unselect this instead of deleting accounts.', verbose_name='active')),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now, verbose_name='date joined')),
+                ('role', models.CharField(choices=[('student', 'Student'), ('teacher', 'Teacher'), ('admin', 'Admin')], default='student', max_length=20)),
+                ('phone_number', models.CharField(blank=True, max_length=20, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.group', verbose_name='groups')),
+                ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.permission', verbose_name='user permissions')),
+            ],
+            options={
+                'db_table': 'users',
+                'ordering': ['-created_at'],
+            },
+            managers=[
+                ('objects', django.contrib.auth.models.UserManager()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ListeningQuestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question_number', models.IntegerField(blank=True, null=True)),
+                ('question_text', models.TextField()),
+                ('question_type', models.CharField(choices=[('multiple_choice', 'Multiple Choice'), ('completion', 'Completion'), ('matching', 'Matching'), ('table', 'Table Completion')], max_length=20)),
+                ('question_data', models.JSONField(blank=True, help_text='\n        Multiple Choice: {"options": ["A) London", "B) Paris"]}\n        Matching: {"left": ["1. Dog"], "right": ["A. Barks"]}\n        Table: {"headers": ["Name"], "rows": [["___"]]} (ixtiyoriy - rasm bo\'lsa kerak emas)\n        Completion: {"word_limit": 2} or {}\n        ', null=True)),
+                ('question_image', models.ImageField(blank=True, help_text='Table/Map/Diagram uchun rasm, qolganlariga ixtiyoriy', null=True, upload_to='listening/questions/')),
+                ('points', models.IntegerField(default=1)),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='questions', to='app.listeningsection')),
+            ],
+            options={
+                'db_table': 'listening_questions',
+                'ordering': ['question_number'],
+                'unique_together': {('section', 'question_number')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ReadingQuestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question_number', models.IntegerField(blank=True, null=True)),
+                ('question_text', models.TextField()),
+                ('question_type', models.CharField(choices=[('multiple_choice', 'Multiple Choice'), ('true_false', 'True/False/Not Given'), ('yes_no', 'Yes/No/Not Given'), ('completion', 'Completion'), ('matching', 'Matching'), ('short_answer', 'Short Answer')], max_length=20)),
+                ('question_data', models.JSONField(blank=True, help_text='\n        Multiple Choice: {"options": ["A) ...", "B) ..."]}\n        True/False/Yes/No: {} (bo\'sh, options avtomatik)\n        Completion: {"word_limit": 2} (ixtiyoriy)\n        Matching: {"items": ["1. Heading A", "2. Heading B"], "paragraphs": ["A", "B", "C"]}\n        Short Answer: {"word_limit": 3}\n        ', null=True)),
+                ('correct_answer', models.JSONField(blank=True, help_text='\n        Multiple Choice: "A"\n        True/False: "True" or "False" or "Not Given"\n        Yes/No: "Yes" or "No" or "Not Given"\n        Completion: "answer" or ["answer1", "answer2"]\n        Matching: {"1": "C", "2": "A"}\n        Short Answer: "answer" or ["answer1", "answer2"]\n        ', null=True)),
+                ('points', models.IntegerField(default=1)),
+                ('passage', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='questions', to='app.readingpassage')),
+            ],
+            options={
+                'db_table': 'reading_questions',
+                'ordering': ['question_number'],
+                'unique_together': {('passage', 'question_number')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Test',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('difficulty_level', models.CharField(choices=[('beginner', 'Beginner'), ('intermediate', 'Intermediate'), ('advanced', 'Advanced')], default='intermediate', max_length=20)),
+                ('is_published', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_tests', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'tests',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='readingpassage',
+            name='test',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reading_passages', to='app.test'),
+        ),
+        migrations.AddField(
+            model_name='listeningsection',
+            name='test',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listening_sections', to='app.test'),
+        ),
+        migrations.CreateModel(
+            name='TestAttempt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('in_progress', 'In Progress'), ('completed', 'Completed')], default='in_progress', max_length=20)),
+                ('listening_band', models.DecimalField(blank=True, decimal_places=1, help_text='Listening band score 0-9', max_digits=2, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(9)])),
+                ('reading_band', models.DecimalField(blank=True, decimal_places=1, help_text='Reading band score 0-9', max_digits=2, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(9)])),
+                ('writing_band', models.DecimalField(blank=True, decimal_places=1, help_text='Writing band score 0-9', max_digits=2, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(9)])),
+                ('overall_band', models.DecimalField(blank=True, decimal_places=1, help_text='Overall band score', max_digits=2, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(9)])),
+                ('teacher_comment', models.TextField(blank=True, help_text='Teacher umumiy sharhi')),
+                ('graded_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('listening_submitted', models.BooleanField(default=False)),
+                ('listening_submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('reading_submitted', models.BooleanField(default=False)),
+                ('reading_submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('writing_submitted', models.BooleanField(default=False)),
+                ('writing_submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('listening_started_at', models.DateTimeField(blank=True, null=True)),
+                ('reading_started_at', models.DateTimeField(blank=True, null=True)),
+                ('writing_started_at', models.DateTimeField(blank=True, null=True)),
+                ('graded_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='graded_attempts', to=settings.AUTH_USER_MODEL)),
+                ('test', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attempts', to='app.test')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='test_attempts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'test_attempts',
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReadingAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_answer', models.CharField(blank=True, max_length=500)),
+                ('answered_at', models.DateTimeField(auto_now_add=True)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.readingquestion')),
+                ('attempt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reading_answers', to='app.testattempt')),
+            ],
+            options={
+                'db_table': 'reading_answers',
+                'ordering': ['question__question_number'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ListeningAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_answer', models.CharField(blank=True, max_length=500)),
+                ('answered_at', models.DateTimeField(auto_now_add=True)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.listeningquestion')),
+                ('attempt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listening_answers', to='app.testattempt')),
+            ],
+            options={
+                'db_table': 'listening_answers',
+                'ordering': ['question__question_number'],
+            },
+        ),
+        migrations.CreateModel(
+            name='WritingTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_number', models.IntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(2)])),
+                ('task_type', models.CharField(choices=[('TASK_1', 'Task 1 (Data/Letter)'), ('TASK_2', 'Task 2 (Essay)')], max_length=50)),
+                ('prompt_text', models.TextField(help_text='Task prompt/question')),
+                ('image', models.ImageField(blank=True, null=True, upload_to='writing/charts/')),
+                ('instructions', models.TextField(blank=True)),
+                ('word_limit', models.IntegerField(blank=True, help_text='Minimum word count (150 or 250)', null=True)),
+                ('time_suggestion', models.IntegerField(blank=True, help_text='Suggested time in minutes (20 or 40)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('test', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='writing_tasks', to='app.test')),
+            ],
+            options={
+                'db_table': 'writing_tasks',
+                'ordering': ['task_number'],
+            },
+        ),
+        migrations.CreateModel(
+            name='WritingSubmission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('submission_text', models.TextField(blank=True)),
+                ('word_count', models.IntegerField(default=0)),
+                ('submitted_at', models.DateTimeField(auto_now_add=True)),
+                ('time_spent', models.IntegerField(default=0, help_text='Sekundlarda')),
+                ('attempt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='writing_submissions', to='app.testattempt')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.writingtask')),
+            ],
+            options={
+                'db_table': 'writing_submissions',
+                'ordering': ['task__task_number'],
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='readingpassage',
+            unique_together={('test', 'passage_number')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='listeningsection',
+            unique_together={('test', 'section_number')},
+        ),
+        migrations.AddIndex(
+            model_name='testattempt',
+            index=models.Index(fields=['user', 'status'], name='test_attemp_user_id_e1839d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testattempt',
+            index=models.Index(fields=['test', 'status'], name='test_attemp_test_id_3e23fc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testattempt',
+            index=models.Index(fields=['graded_at'], name='test_attemp_graded__db53f9_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='testattempt',
+            unique_together={('user', 'test')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='readinganswer',
+            unique_together={('attempt', 'question')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='listeninganswer',
+            unique_together={('attempt', 'question')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='writingtask',
+            unique_together={('test', 'task_number')},
+        ),
+        migrations.AddIndex(
+            model_name='writingsubmission',
+            index=models.Index(fields=['submitted_at'], name='writing_sub_submitt_5588db_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='writingsubmission',
+            unique_together={('attempt', 'task')},
+        ),
+    ]
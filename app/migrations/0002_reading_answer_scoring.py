@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='readinganswer',
+            name='is_correct',
+            field=models.BooleanField(blank=True, help_text="Answer key bo'lmasa None", null=True),
+        ),
+        migrations.AddField(
+            model_name='testattempt',
+            name='reading_raw_score',
+            field=models.IntegerField(blank=True, help_text='Reading raw score', null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_reading_answer_scoring'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listeninganswer',
+            name='is_correct',
+            field=models.BooleanField(blank=True, help_text="Answer key bo'lmasa None", null=True),
+        ),
+        migrations.AddField(
+            model_name='listeningquestion',
+            name='correct_answer',
+            field=models.JSONField(blank=True, help_text='\n        Multiple Choice: "A"\n        Completion/Table: "answer" or ["answer1", "answer2"] (word_limit question_data dan)\n        Matching: {"1": "C", "2": "A"}\n        ', null=True),
+        ),
+        migrations.AddField(
+            model_name='testattempt',
+            name='listening_raw_score',
+            field=models.IntegerField(blank=True, help_text='Listening raw score', null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_listening_answer_scoring'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnswerDraft',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(choices=[('listening', 'Listening'), ('reading', 'Reading')], max_length=20)),
+                ('question_number', models.IntegerField()),
+                ('user_answer', models.CharField(blank=True, max_length=500)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('attempt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answer_drafts', to='app.testattempt')),
+            ],
+            options={
+                'db_table': 'answer_drafts',
+                'unique_together': {('attempt', 'section', 'question_number')},
+            },
+        ),
+    ]
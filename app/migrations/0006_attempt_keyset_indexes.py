@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_submissionintake'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='testattempt',
+            index=models.Index(fields=['started_at', 'id'], name='attempt_started_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testattempt',
+            index=models.Index(fields=['user', 'started_at', 'id'], name='attempt_user_started_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testattempt',
+            index=models.Index(condition=models.Q(('graded_at__isnull', True), ('status', 'completed')), fields=['completed_at', 'id'], name='attempt_ungraded_queue_idx'),
+        ),
+    ]
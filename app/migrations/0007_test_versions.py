@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_attempt_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='test',
+            name='frozen_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='test',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='versions', to='app.test'),
+        ),
+        migrations.AddField(
+            model_name='test',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
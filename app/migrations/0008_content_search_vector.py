@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:30
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_test_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listeningquestion',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('question_text', config='english'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddField(
+            model_name='readingpassage',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('passage_text', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddField(
+            model_name='readingquestion',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('question_text', config='english'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddField(
+            model_name='writingtask',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('prompt_text', config='english'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='listeningquestion',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='listening_question_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='readingpassage',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='reading_passage_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='readingquestion',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='reading_question_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='writingtask',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='writing_task_search_idx'),
+        ),
+    ]
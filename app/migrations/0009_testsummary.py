@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_content_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestSummary',
+            fields=[
+                ('test', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='app.test')),
+                ('listening_sections', models.IntegerField(default=0)),
+                ('listening_questions', models.IntegerField(default=0)),
+                ('reading_passages', models.IntegerField(default=0)),
+                ('reading_questions', models.IntegerField(default=0)),
+                ('writing_tasks', models.IntegerField(default=0)),
+                ('audio_duration', models.IntegerField(default=0, help_text='Barcha section audiolari, sekund')),
+                ('total_points', models.IntegerField(default=0, help_text='Listening + Reading savollari ballari')),
+                ('is_ready', models.GeneratedField(db_persist=True, expression=models.ExpressionWrapper(models.Q(('listening_sections', 4), ('listening_questions', 40), ('reading_passages', 3), ('reading_questions', 40), ('writing_tasks', 2)), output_field=models.BooleanField()), output_field=models.BooleanField())),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'test_summaries',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:30
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0009_testsummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AudioUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('total_size', models.BigIntegerField()),
+                ('received', models.BigIntegerField(default=0)),
+                ('sha256', models.CharField(blank=True, help_text="Mijoz e'lon qilgan checksum (hex)", max_length=64)),
+                ('status', models.CharField(choices=[('uploading', 'Uploading'), ('complete', 'Complete'), ('failed', 'Failed')], default='uploading', max_length=20)),
+                ('error', models.TextField(blank=True)),
+                ('audio_file', models.FileField(blank=True, upload_to='listening/audios/')),
+                ('audio_duration', models.IntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audio_uploads', to=settings.AUTH_USER_MODEL)),
+                ('section', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='audio_uploads', to='app.listeningsection')),
+            ],
+            options={
+                'db_table': 'audio_uploads',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
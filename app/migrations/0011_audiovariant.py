@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0010_audioupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AudioVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profile', models.CharField(help_text='settings.AUDIO_VARIANT_PROFILES kaliti', max_length=30)),
+                ('source_name', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('error', models.TextField(blank=True)),
+                ('audio_file', models.FileField(blank=True, upload_to='listening/variants/')),
+                ('size', models.BigIntegerField(blank=True, null=True)),
+                ('bitrate', models.IntegerField(blank=True, help_text='kbps', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audio_variants', to='app.listeningsection')),
+            ],
+            options={
+                'db_table': 'audio_variants',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'id'], name='audio_varia_status_76be53_idx')],
+                'unique_together': {('section', 'profile')},
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:30
+
+import app.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0011_audiovariant'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='audioupload',
+            name='audio_file',
+            field=models.FileField(blank=True, storage=app.storage.content_storage, upload_to='listening/audios/'),
+        ),
+        migrations.AlterField(
+            model_name='listeningquestion',
+            name='question_image',
+            field=models.ImageField(blank=True, help_text='Table/Map/Diagram uchun rasm, qolganlariga ixtiyoriy', null=True, storage=app.storage.content_storage, upload_to='listening/questions/'),
+        ),
+        migrations.AlterField(
+            model_name='listeningsection',
+            name='audio_file',
+            field=models.FileField(storage=app.storage.content_storage, upload_to='listening/audios/'),
+        ),
+        migrations.AlterField(
+            model_name='writingtask',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=app.storage.content_storage, upload_to='writing/charts/'),
+        ),
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('digest', models.CharField(db_index=True, help_text='sha256 (hex)', max_length=64)),
+                ('size', models.BigIntegerField()),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'media_blobs',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['ref_count', 'updated_at'], name='media_blobs_ref_cou_5a80b2_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0012_content_addressed_media'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='submissionintake',
+            name='submission__status_6e1d34_idx',
+        ),
+        migrations.AddField(
+            model_name='submissionintake',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='submissionintake',
+            name='next_run_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='submissionintake',
+            index=models.Index(fields=['status', 'next_run_at', 'id'], name='submission__status_805c3c_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0013_submission_intake_retry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testattempt',
+            name='listening_max_score',
+            field=models.IntegerField(blank=True, help_text='Listening band hisoblangan max score', null=True),
+        ),
+        migrations.AddField(
+            model_name='testattempt',
+            name='reading_max_score',
+            field=models.IntegerField(blank=True, help_text='Reading band hisoblangan max score', null=True),
+        ),
+    ]
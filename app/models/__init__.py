@@ -3,3 +3,7 @@ from .listening import *
 from .writing import *
 from .reading import *
 from .test_attempt import *
+from .test_summary import *
+from .audio_upload import *
+from .audio_variant import *
+from .media_blob import *
@@ -0,0 +1,56 @@
+import os
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+from app.storage import content_storage
+
+from .listening import ListeningSection
+
+
+class AudioUpload(models.Model):
+    """
+    Section audiosi uchun qayta davom ettiriladigan (resumable) upload sessiyasi.
+    Bo'laklar AUDIO_UPLOAD_TEMP_DIR dagi vaqtinchalik faylga yoziladi,
+    tugagach checksum tekshirilib storage ga ko'chiriladi (app/services/audio_upload.py).
+    """
+
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    section = models.ForeignKey(
+        ListeningSection, on_delete=models.CASCADE, null=True, blank=True, related_name='audio_uploads'
+    )
+    created_by = models.ForeignKey('User', on_delete=models.CASCADE, related_name='audio_uploads')
+
+    filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Mijoz e'lon qilgan checksum (hex)")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    error = models.TextField(blank=True)
+
+    # Tugagandan keyin
+    # Section bilan bir storage - attach_upload nomni o'zini ko'chiradi
+    audio_file = models.FileField(upload_to='listening/audios/', storage=content_storage, blank=True)
+    audio_duration = models.IntegerField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'audio_uploads'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.total_size})"
+
+    @property
+    def temp_path(self):
+        return os.path.join(settings.AUDIO_UPLOAD_TEMP_DIR, f'{self.id}.part')
@@ -0,0 +1,46 @@
+from django.db import models
+
+from .listening import ListeningSection
+
+
+class AudioVariant(models.Model):
+    """
+    Section audiosining yengil varianti (loudness normalizatsiya, past bitrate).
+    Section audio_file o'zgarganda 'pending' qatorlar yaratiladi va
+    `manage.py process_audio_variants` ularni fon rejimida tayyorlaydi.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    section = models.ForeignKey(ListeningSection, on_delete=models.CASCADE, related_name='audio_variants')
+    profile = models.CharField(max_length=30, help_text="settings.AUDIO_VARIANT_PROFILES kaliti")
+
+    # Qaysi original fayldan tayyorlangan - audio_file almashsa variant eskiradi
+    source_name = models.CharField(max_length=255)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    error = models.TextField(blank=True)
+
+    audio_file = models.FileField(upload_to='listening/variants/', blank=True)
+    size = models.BigIntegerField(null=True, blank=True)
+    bitrate = models.IntegerField(null=True, blank=True, help_text="kbps")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'audio_variants'
+        unique_together = ['section', 'profile']
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'id']),
+        ]
+
+    def __str__(self):
+        return f"Section {self.section_id} - {self.profile} ({self.status})"
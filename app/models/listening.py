@@ -1,6 +1,11 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.utils import timezone
+from .numbering import AutoNumberMixin
+from .tracking import LoadedValuesMixin
+from app.storage import content_storage
 from rest_framework.exceptions import ValidationError
 
 
@@ -27,22 +32,48 @@ class Test(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Versiyalar: parent - asl test, version - 1, 2, ...
+    parent = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True, related_name='versions'
+    )
+    version = models.PositiveIntegerField(default=1)
+    # Nashr qilinganda muzlatiladi - kontent o'zgarmaydi, attemptlar shu versiyaga bog'langan
+    frozen_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         db_table = 'tests'
         ordering = ['-created_at']
 
     def __str__(self):
+        if self.version > 1:
+            return f"{self.title} (v{self.version})"
         return self.title
 
+    @property
+    def is_frozen(self):
+        return self.frozen_at is not None
+
+    def save(self, *args, **kwargs):
+        """Birinchi marta nashr qilinganda testni muzlatish"""
+        if self.is_published and self.frozen_at is None:
+            self.frozen_at = timezone.now()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'frozen_at'}
+        super().save(*args, **kwargs)
+
 
-class ListeningSection(models.Model):
+class ListeningSection(LoadedValuesMixin, models.Model):
     """Listening section - har bir testda 4 ta section"""
 
+    # Ko'chirish / audio almashishi signallarda SELECT siz aniqlanadi (app/models/tracking.py)
+    tracked_fields = ('test_id', 'audio_file')
+
     test = models.ForeignKey(Test, on_delete=models.CASCADE, related_name='listening_sections')
     section_number = models.IntegerField(validators=[MinValueValidator(1), MaxValueValidator(4)])
 
     # Audio
-    audio_file = models.FileField(upload_to='listening/audios/')
+    audio_file = models.FileField(upload_to='listening/audios/', storage=content_storage)
     audio_duration = models.IntegerField(help_text="Duration in seconds")
 
     # Instructions
@@ -95,9 +126,15 @@ class ListeningSection(models.Model):
         return f"{self.test.title} - Section {self.section_number}"
 
 
-class ListeningQuestion(models.Model):
+class ListeningQuestion(LoadedValuesMixin, AutoNumberMixin, models.Model):
     """Listening section savollari"""
 
+    tracked_fields = ('section_id', 'question_image')
+
+    # question_number berilmasa - ota qatorni bloklab keyingi raqam (app/models/numbering.py)
+    number_field = 'question_number'
+    number_parent_field = 'section'
+
     QUESTION_TYPE_CHOICES = [
         ('multiple_choice', 'Multiple Choice'),
         ('completion', 'Completion'),
@@ -128,36 +165,41 @@ class ListeningQuestion(models.Model):
 
     question_image = models.ImageField(
         upload_to='listening/questions/',
+        storage=content_storage,
         blank=True,
         null=True,
         help_text='Table/Map/Diagram uchun rasm, qolganlariga ixtiyoriy'
     )
 
+    correct_answer = models.JSONField(
+        null=True, blank=True,
+        help_text="""
+        Multiple Choice: "A"
+        Completion/Table: "answer" or ["answer1", "answer2"] (word_limit question_data dan)
+        Matching: {"1": "C", "2": "A"}
+        """
+    )
+
     points = models.IntegerField(default=1)
 
+    # Full-text search - baza o'zi yangilaydi
+    search_vector = models.GeneratedField(
+        expression=SearchVector('question_text', config='english'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     class Meta:
         db_table = 'listening_questions'
         ordering = ['question_number']
         unique_together = ['section', 'question_number']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='listening_question_search_idx'),
+        ]
 
     def __str__(self):
         return f"Q{self.question_number} ({self.get_question_type_display()})"
 
-    def save(self, *args, **kwargs):
-        """question_number ni avtomatik hisoblaydigan"""
-        if self.question_number is None:
-            # Shu sectiondagi oxirgi raqamni topish
-            last_question = ListeningQuestion.objects.filter(
-                section=self.section
-            ).order_by('-question_number').first()
-
-            if last_question and last_question.question_number:
-                self.question_number = last_question.question_number + 1
-            else:
-                self.question_number = 1
-
-        super().save(*args, **kwargs)
-
     def clean(self):
         """Validation"""
         if self.question_type == 'multiple_choice':
@@ -181,6 +223,12 @@ class ListeningQuestion(models.Model):
                     'Table uchun question_data (headers, rows) yoki question_image kerak'
                 )
 
+        if self.question_type == 'matching' and self.correct_answer is not None:
+            if not isinstance(self.correct_answer, dict):
+                raise ValidationError({
+                    'correct_answer': 'Matching uchun correct_answer {"1": "A"} ko\'rinishida bo\'lishi kerak'
+                })
+
     @property
     def options(self):
         """Multiple choice options"""
@@ -214,8 +262,8 @@ class ListeningQuestion(models.Model):
 
     @property
     def word_limit(self):
-        """Word limit for completion"""
-        if self.question_type == 'completion' and self.question_data:
+        """Word limit for completion/table"""
+        if self.question_type in ['completion', 'table'] and self.question_data:
             return self.question_data.get('word_limit')
         return None
 
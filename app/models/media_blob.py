@@ -0,0 +1,29 @@
+from django.db import models
+
+
+class MediaBlob(models.Model):
+    """
+    ContentAddressedStorage dagi bitta fayl (app/storage.py).
+    ref_count - shu nomga ishora qilayotgan ListeningSection / ListeningQuestion /
+    WritingTask qatorlari soni. 0 bo'lgan va grace muddati o'tgan bloblarni
+    `manage.py gc_media` o'chiradi.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    digest = models.CharField(max_length=64, db_index=True, help_text="sha256 (hex)")
+    size = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Oxirgi yuklanish yoki ref_count o'zgarishi - gc grace muddati shundan hisoblanadi
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'media_blobs'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['ref_count', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} ref)"
@@ -0,0 +1,62 @@
+"""
+Savol va task raqamlarini ajratish.
+
+Ota obyekt (section, passage yoki test) qatori SELECT ... FOR UPDATE bilan
+bloklanadi, keyin oxirgi raqam MAX bilan olinadi. Bir vaqtda yozayotgan
+muharrirlar navbat bilan kutadi va unique_together to'qnashuvi bo'lmaydi.
+Blok transaction tugaguncha saqlanadi - INSERT shu transaction ichida bo'lishi kerak.
+"""
+from django.db import transaction
+from django.db.models import Max
+
+
+def lock_last_numbers(child_model, parent_field, number_field, parent_ids):
+    """
+    Ota qatorlarni bloklab, har biri uchun oxirgi raqamni qaytarish: {parent_id: last}.
+    Deadlock bo'lmasligi uchun qatorlar doim pk tartibida bloklanadi.
+    Transaction ichida chaqirilishi kerak.
+    """
+    parent_model = child_model._meta.get_field(parent_field).related_model
+    parent_ids = sorted(set(parent_ids))
+
+    locked = list(
+        parent_model.objects.select_for_update().filter(pk__in=parent_ids)
+        .order_by('pk').values_list('pk', flat=True)
+    )
+    last_numbers = dict.fromkeys(locked, 0)
+
+    rows = (
+        child_model.objects.filter(**{f'{parent_field}_id__in': locked})
+        .order_by().values(f'{parent_field}_id').annotate(last=Max(number_field))
+    )
+    for row in rows:
+        last_numbers[row[f'{parent_field}_id']] = row['last'] or 0
+    return last_numbers
+
+
+def allocate_number(child_model, parent_field, number_field, parent_id):
+    """
+    Bitta ota uchun keyingi raqam. Bir nechta qator uchun - lock_last_numbers
+    va bitta bulk_create (bulk_create viewlari).
+    Transaction ichida chaqirilishi kerak - raqam commit gacha band.
+    """
+    return lock_last_numbers(child_model, parent_field, number_field, [parent_id]).get(parent_id, 0) + 1
+
+
+class AutoNumberMixin:
+    """
+    save() da raqam berilmagan bo'lsa, ota qatorni bloklab keyingi raqamni olish.
+    Model klassida: number_field va number_parent_field.
+    """
+    number_field = None
+    number_parent_field = None
+
+    def save(self, *args, **kwargs):
+        if getattr(self, self.number_field) is not None:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            parent_id = getattr(self, f'{self.number_parent_field}_id')
+            number = allocate_number(type(self), self.number_parent_field, self.number_field, parent_id)
+            setattr(self, self.number_field, number)
+            return super().save(*args, **kwargs)
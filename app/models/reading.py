@@ -1,13 +1,19 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from .listening import Test
+from .numbering import AutoNumberMixin
+from .tracking import LoadedValuesMixin
 from django.core.exceptions import ValidationError
 
 
 
-class ReadingPassage(models.Model):
+class ReadingPassage(LoadedValuesMixin, models.Model):
     """Reading passages - har bir testda 3 ta passage"""
 
+    tracked_fields = ('test_id',)
+
     test = models.ForeignKey(Test, on_delete=models.CASCADE, related_name='reading_passages')
     passage_number = models.IntegerField(validators=[MinValueValidator(1), MaxValueValidator(3)])
 
@@ -20,10 +26,23 @@ class ReadingPassage(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Full-text search - baza o'zi yangilaydi (title A, matn B vazn bilan)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config='english') +
+            SearchVector('passage_text', weight='B', config='english')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     class Meta:
         db_table = 'reading_passages'
         unique_together = ['test', 'passage_number']
         ordering = ['passage_number']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='reading_passage_search_idx'),
+        ]
 
     def __str__(self):
         return f"{self.test.title} - Passage {self.passage_number}: {self.title}"
@@ -35,9 +54,15 @@ class ReadingPassage(models.Model):
         super().save(*args, **kwargs)
 
 
-class ReadingQuestion(models.Model):
+class ReadingQuestion(LoadedValuesMixin, AutoNumberMixin, models.Model):
     """Reading passage savollari"""
 
+    tracked_fields = ('passage_id',)
+
+    # question_number berilmasa - ota qatorni bloklab keyingi raqam (app/models/numbering.py)
+    number_field = 'question_number'
+    number_parent_field = 'passage'
+
     QUESTION_TYPE_CHOICES = [
         ('multiple_choice', 'Multiple Choice'),
         ('true_false', 'True/False/Not Given'),
@@ -79,29 +104,23 @@ class ReadingQuestion(models.Model):
 
     points = models.IntegerField(default=1)
 
+    search_vector = models.GeneratedField(
+        expression=SearchVector('question_text', config='english'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     class Meta:
         db_table = 'reading_questions'
         ordering = ['question_number']
         unique_together = ['passage', 'question_number']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='reading_question_search_idx'),
+        ]
 
     def __str__(self):
         return f"Q{self.question_number} ({self.get_question_type_display()})"
 
-    def save(self, *args, **kwargs):
-        """question_number ni avtomatik hisoblaydigan"""
-        if self.question_number is None:
-            # Shu passagedagi oxirgi raqamni topish
-            last_question = ReadingQuestion.objects.filter(
-                passage=self.passage
-            ).order_by('-question_number').first()
-
-            if last_question and last_question.question_number:
-                self.question_number = last_question.question_number + 1
-            else:
-                self.question_number = 1
-
-        super().save(*args, **kwargs)
-
     def clean(self):
         """Validation"""
         if self.question_type == 'multiple_choice':
@@ -1,6 +1,7 @@
 # models.py
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 
 
@@ -47,6 +48,14 @@ class TestAttempt(models.Model):
         help_text="Overall band score"
     )
 
+    # Avtomatik hisoblangan raw score (to'g'ri javoblar bo'yicha ballar yig'indisi)
+    listening_raw_score = models.IntegerField(null=True, blank=True, help_text="Listening raw score")
+    reading_raw_score = models.IntegerField(null=True, blank=True, help_text="Reading raw score")
+    # Band hisoblangan paytdagi maksimal ball - savollar qo'shilsa/o'chirilsa ham
+    # qayta baholashda avtomatik band ni qo'lda qo'yilganidan ajratish uchun
+    listening_max_score = models.IntegerField(null=True, blank=True, help_text="Listening band hisoblangan max score")
+    reading_max_score = models.IntegerField(null=True, blank=True, help_text="Reading band hisoblangan max score")
+
     # Teacher info
     teacher_comment = models.TextField(blank=True, help_text="Teacher umumiy sharhi")
     graded_by = models.ForeignKey(
@@ -92,6 +101,14 @@ class TestAttempt(models.Model):
             models.Index(fields=['user', 'status']),
             models.Index(fields=['test', 'status']),
             models.Index(fields=['graded_at']),
+            # Keyset pagination: (started_at, id) va baholash navbati (completed_at, id)
+            models.Index(fields=['started_at', 'id'], name='attempt_started_keyset_idx'),
+            models.Index(fields=['user', 'started_at', 'id'], name='attempt_user_started_idx'),
+            models.Index(
+                fields=['completed_at', 'id'],
+                name='attempt_ungraded_queue_idx',
+                condition=models.Q(status='completed', graded_at__isnull=True)
+            ),
         ]
 
     def __str__(self):
@@ -142,6 +159,7 @@ class ListeningAnswer(models.Model):
 
     # Student javobi
     user_answer = models.CharField(max_length=500, blank=True)
+    is_correct = models.BooleanField(null=True, blank=True, help_text="Answer key bo'lmasa None")
 
     # Vaqt
     answered_at = models.DateTimeField(auto_now_add=True)
@@ -171,6 +189,7 @@ class ReadingAnswer(models.Model):
 
     # Student javobi
     user_answer = models.CharField(max_length=500, blank=True)
+    is_correct = models.BooleanField(null=True, blank=True, help_text="Answer key bo'lmasa None")
 
     # Vaqt
     answered_at = models.DateTimeField(auto_now_add=True)
@@ -221,4 +240,81 @@ class WritingSubmission(models.Model):
         super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"Task {self.task.task_number} - {self.word_count} words"
\ No newline at end of file
+        return f"Task {self.task.task_number} - {self.word_count} words"
+
+# ==================== ANSWER DRAFTS (AUTOSAVE) ====================
+class AnswerDraft(models.Model):
+    """Listening/Reading javob qoralamalari - imtihon davomida autosave"""
+
+    SECTION_CHOICES = [
+        ('listening', 'Listening'),
+        ('reading', 'Reading'),
+    ]
+
+    attempt = models.ForeignKey(
+        TestAttempt,
+        on_delete=models.CASCADE,
+        related_name='answer_drafts'
+    )
+    section = models.CharField(max_length=20, choices=SECTION_CHOICES)
+    question_number = models.IntegerField()
+
+    user_answer = models.CharField(max_length=500, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'answer_drafts'
+        unique_together = ['attempt', 'section', 'question_number']
+
+    def __str__(self):
+        return f"{self.section} Q{self.question_number}: {self.user_answer}"
+
+
+# ==================== SUBMISSION INTAKE (NAVBAT) ====================
+class SubmissionIntake(models.Model):
+    """
+    Navbatga yozilgan submit so'rovlari (faqat qo'shiladi).
+    process_submissions buyrug'i ularni id tartibida qayta ishlaydi.
+    """
+
+    SECTION_CHOICES = [
+        ('listening', 'Listening'),
+        ('reading', 'Reading'),
+        ('writing', 'Writing'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    user = models.ForeignKey('User', on_delete=models.CASCADE, related_name='submission_intakes')
+    test = models.ForeignKey('Test', on_delete=models.CASCADE, related_name='submission_intakes')
+    section = models.CharField(max_length=20, choices=SECTION_CHOICES)
+
+    # Submit serializer'ining validated_data si (test_id siz)
+    payload = models.JSONField(default=dict)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(blank=True)
+
+    # Vaqtinchalik xatoliklarda qayta urinish (SUBMISSION_INTAKE_MAX_ATTEMPTS gacha)
+    attempts = models.PositiveIntegerField(default=0)
+    next_run_at = models.DateTimeField(default=timezone.now)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'submission_intakes'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'next_run_at', 'id']),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.user} - {self.section} ({self.status})"
@@ -0,0 +1,68 @@
+from django.db import models
+from django.db.models import ExpressionWrapper, Q
+
+from .listening import Test
+
+
+# To'liq IELTS test tarkibi
+REQUIRED_LISTENING_SECTIONS = 4
+REQUIRED_LISTENING_QUESTIONS = 40
+REQUIRED_READING_PASSAGES = 3
+REQUIRED_READING_QUESTIONS = 40
+REQUIRED_WRITING_TASKS = 2
+
+
+class TestSummary(models.Model):
+    """
+    Test tarkibi bo'yicha tayyor hisoblangan qator.
+    Kontent saqlanganda/o'chirilganda signallar orqali yangilanadi (app/services/test_summary.py),
+    shuning uchun o'qishda COUNT/SUM kerak emas.
+    """
+
+    test = models.OneToOneField(Test, on_delete=models.CASCADE, primary_key=True, related_name='summary')
+
+    listening_sections = models.IntegerField(default=0)
+    listening_questions = models.IntegerField(default=0)
+    reading_passages = models.IntegerField(default=0)
+    reading_questions = models.IntegerField(default=0)
+    writing_tasks = models.IntegerField(default=0)
+
+    audio_duration = models.IntegerField(default=0, help_text="Barcha section audiolari, sekund")
+    total_points = models.IntegerField(default=0, help_text="Listening + Reading savollari ballari")
+
+    # Baza o'zi hisoblaydi - F() delta bilan yangilanganda ham to'g'ri qoladi
+    is_ready = models.GeneratedField(
+        expression=ExpressionWrapper(
+            Q(listening_sections=REQUIRED_LISTENING_SECTIONS) &
+            Q(listening_questions=REQUIRED_LISTENING_QUESTIONS) &
+            Q(reading_passages=REQUIRED_READING_PASSAGES) &
+            Q(reading_questions=REQUIRED_READING_QUESTIONS) &
+            Q(writing_tasks=REQUIRED_WRITING_TASKS),
+            output_field=models.BooleanField(),
+        ),
+        output_field=models.BooleanField(),
+        db_persist=True,
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'test_summaries'
+
+    def __str__(self):
+        return f"{self.test_id} summary ({'ready' if self.is_ready else 'incomplete'})"
+
+    def missing(self):
+        """Yetishmayotgan (yoki ortiqcha) qismlar: {'listening_questions': {'have': 38, 'required': 40}}"""
+        required = {
+            'listening_sections': REQUIRED_LISTENING_SECTIONS,
+            'listening_questions': REQUIRED_LISTENING_QUESTIONS,
+            'reading_passages': REQUIRED_READING_PASSAGES,
+            'reading_questions': REQUIRED_READING_QUESTIONS,
+            'writing_tasks': REQUIRED_WRITING_TASKS,
+        }
+        return {
+            field: {'have': getattr(self, field), 'required': count}
+            for field, count in required.items()
+            if getattr(self, field) != count
+        }
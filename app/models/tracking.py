@@ -0,0 +1,41 @@
+class LoadedValuesMixin:
+    """
+    DB dagi qiymatlarni eslab qolish - from_db da (va save / refresh_from_db dan keyin)
+    tracked_fields (attname) qiymatlari saqlanadi. Signallar (app/signals.py) qator
+    boshqa testga ko'chganini yoki fayl almashganini qo'shimcha SELECT siz aniqlaydi.
+    FileField uchun fayl nomi saqlanadi.
+    """
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._capture_loaded_values()
+        return instance
+
+    def _capture_loaded_values(self, fields=None):
+        loaded = self.__dict__.setdefault('_loaded_values', {})
+        for name in self.tracked_fields if fields is None else fields:
+            # Deferred (.only()) maydon - qiymati noma'lum
+            if name in self.__dict__:
+                value = self.__dict__[name]
+                loaded[name] = getattr(value, 'name', value)
+
+    def loaded_value(self, name, default=None):
+        """Oxirgi o'qilgan/saqlangan qiymat; noma'lum bo'lsa (yangi obyekt, deferred) - default"""
+        return self.__dict__.get('_loaded_values', {}).get(name, default)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self._capture_loaded_values()
+        else:
+            self._capture_loaded_values([
+                name for name in self.tracked_fields
+                if name in update_fields or name.removesuffix('_id') in update_fields
+            ])
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._capture_loaded_values()
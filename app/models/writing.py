@@ -1,11 +1,22 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from .listening import Test
+from .numbering import AutoNumberMixin
+from .tracking import LoadedValuesMixin
+from app.storage import content_storage
 
 
-class WritingTask(models.Model):
+class WritingTask(LoadedValuesMixin, AutoNumberMixin, models.Model):
     """Writing tasks - har bir testda 2 ta task"""
 
+    tracked_fields = ('test_id', 'image')
+
+    # task_number berilmasa - ota qatorni bloklab keyingi raqam (app/models/numbering.py)
+    number_field = 'task_number'
+    number_parent_field = 'test'
+
     TASK_TYPE_CHOICES = [
         ('TASK_1', 'Task 1 (Data/Letter)'),
         ('TASK_2', 'Task 2 (Essay)'),
@@ -17,7 +28,7 @@ class WritingTask(models.Model):
     task_type = models.CharField(max_length=50, choices=TASK_TYPE_CHOICES)
     prompt_text = models.TextField(help_text="Task prompt/question")
 
-    image = models.ImageField(upload_to='writing/charts/', blank=True, null=True)
+    image = models.ImageField(upload_to='writing/charts/', storage=content_storage, blank=True, null=True)
 
     instructions = models.TextField(blank=True)
     word_limit = models.IntegerField(help_text="Minimum word count (150 or 250)", null=True, blank=True)
@@ -27,26 +38,20 @@ class WritingTask(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Full-text search - baza o'zi yangilaydi
+    search_vector = models.GeneratedField(
+        expression=SearchVector('prompt_text', config='english'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     class Meta:
         db_table = 'writing_tasks'
         unique_together = ['test', 'task_number']
         ordering = ['task_number']
-
-
-    def save(self, *args, **kwargs):
-        """task_number ni avtomatik ketma-ket hisoblash"""
-        if self.task_number is None:
-            # Shu testdagi oxirgi task raqamini topish
-            last_task = WritingTask.objects.filter(
-                test=self.test
-            ).order_by('-task_number').first()
-
-            if last_task and last_task.task_number:
-                self.task_number = last_task.task_number + 1
-            else:
-                self.task_number = 1
-
-        super().save(*args, **kwargs)
+        indexes = [
+            GinIndex(fields=['search_vector'], name='writing_task_search_idx'),
+        ]
 
     def __str__(self):
         return f"{self.test.title} - Task {self.task_number}"
\ No newline at end of file
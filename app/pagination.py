@@ -0,0 +1,149 @@
+"""
+Keyset (cursor) pagination.
+
+Sahifa OFFSET bilan emas, oxirgi qatorning (ordering qiymati, id) juftligi
+bilan olinadi - WHERE (field, id) < (:value, :id) ORDER BY field, id LIMIT n.
+Index bo'yicha ishlaydi, shuning uchun javob vaqti qator soniga bog'liq emas.
+Cursor o'zgarmas: sahifalar orasida qo'shilgan yangi qatorlar sakrash yoki
+takrorlanishga olib kelmaydi.
+"""
+import base64
+import json
+from collections import OrderedDict
+
+from django.db import connections
+from django.db.models import Q
+from django.utils.encoding import force_str
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+
+def estimate_count(queryset):
+    """
+    Qatorlar sonini arzon baholash.
+    PostgreSQL da planner bahosi (EXPLAIN), boshqa bazalarda oddiy COUNT.
+    """
+    queryset = queryset.order_by().values('pk')
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination(BasePagination):
+    """
+    (ordering_field, id) bo'yicha keyset pagination.
+
+    ordering - ikkita maydon, masalan ('-started_at', '-id'). Ikkinchisi
+    unikal bo'lishi kerak, birinchisi NULL bo'lmasligi kerak (nullable maydonda
+    view NULL qatorlarni filtrlaydi). Mos (field, id) index bo'lishi kerak.
+    ?count=true - taxminiy umumiy son (count_estimate).
+    """
+    ordering = ('-started_at', '-id')
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.count_estimate = None
+
+        if request.query_params.get(self.count_query_param, '').lower() == 'true':
+            self.count_estimate = estimate_count(queryset)
+
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self._after(cursor))
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def _fields(self):
+        return [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+
+    def _after(self, cursor):
+        """WHERE (field, id) cursor dan keyin (tartib yo'nalishiga qarab)"""
+        (field, field_desc), (tie, tie_desc) = self._fields()
+        value, tie_value = cursor
+        field_op = 'lt' if field_desc else 'gt'
+        tie_op = 'lt' if tie_desc else 'gt'
+        return (
+            Q(**{f'{field}__{field_op}': value}) |
+            Q(**{field: value, f'{tie}__{tie_op}': tie_value})
+        )
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, tie_value = json.loads(force_str(base64.urlsafe_b64decode(encoded.encode('ascii'))))
+        except (TypeError, ValueError):
+            raise NotFound('Invalid cursor')
+        return value, tie_value
+
+    def encode_cursor(self, obj):
+        (field, _), (tie, _) = self._fields()
+        value = getattr(obj, field)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        payload = json.dumps([value, getattr(obj, tie)])
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.count_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([('next', self.get_next_link())])
+        if self.count_estimate is not None:
+            response['count_estimate'] = self.count_estimate
+        response['results'] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count_estimate': {'type': 'integer'},
+                'results': schema,
+            },
+        }
+
+
+class AttemptKeysetPagination(KeysetPagination):
+    """Attemptlar ro'yxati - eng yangilari birinchi"""
+    ordering = ('-started_at', '-id')
+
+
+class UngradedQueuePagination(KeysetPagination):
+    """Baholash navbati - eng oldin tugatilganlar birinchi (completed_at NULL emas)"""
+    ordering = ('completed_at', 'id')
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from app.models import TestAttempt, ListeningAnswer, ReadingAnswer, WritingSubmission
+from app.models import TestAttempt, ListeningAnswer, ReadingAnswer, WritingSubmission, SubmissionIntake
 from app.models import Test, ListeningQuestion, ReadingQuestion, WritingTask
 
 
@@ -10,7 +10,10 @@ class ListeningSubmitSerializer(serializers.Serializer):
     test_id = serializers.IntegerField()
     answers = serializers.DictField(
         child=serializers.CharField(max_length=500, allow_blank=True),
-        help_text="Question number: answer. Example: {'1': 'A', '2': 'library'}"
+        required=False,
+        default=dict,
+        help_text="Question number: answer. Example: {'1': 'A', '2': 'library'}. "
+                  "Draft (autosave) ishlatilgan bo'lsa faqat oxirgi o'zgarishlar"
     )
     time_spent = serializers.IntegerField(min_value=0, help_text="Sekundlarda")
 
@@ -23,14 +26,37 @@ class ListeningSubmitSerializer(serializers.Serializer):
         if not isinstance(value, dict):
             raise serializers.ValidationError("Answers must be a dictionary")
 
+        # ✅ Maksimal 40 ta javob
+        if len(value) > 40:
+            raise serializers.ValidationError("Juda ko'p javob (maksimal 40)")
+
+        # Question numberlar valid ekanini tekshirish
+        for q_num in value.keys():
+            try:
+                num = int(q_num)
+                if num < 1 or num > 40:
+                    raise serializers.ValidationError(f"Question number 1-40 oralig'ida bo'lishi kerak: {q_num}")
+            except ValueError:
+                raise serializers.ValidationError(f"Invalid question number: {q_num}")
+
+        return value
+
+class AnswerDraftSerializer(serializers.Serializer):
+    """Autosave - faqat o'zgargan javoblar (delta)"""
+
+    test_id = serializers.IntegerField()
+    answers = serializers.DictField(
+        child=serializers.CharField(max_length=500, allow_blank=True),
+        help_text="Faqat o'zgargan savollar. Example: {'3': 'B', '7': 'museum'}"
+    )
+
+    def validate_answers(self, value):
         if len(value) == 0:
             raise serializers.ValidationError("Kamida 1 ta javob kerak")
 
-        # ✅ Maksimal 40 ta javob
         if len(value) > 40:
             raise serializers.ValidationError("Juda ko'p javob (maksimal 40)")
 
-        # Question numberlar valid ekanini tekshirish
         for q_num in value.keys():
             try:
                 num = int(q_num)
@@ -41,6 +67,7 @@ class ListeningSubmitSerializer(serializers.Serializer):
 
         return value
 
+
 class ListeningAnswerDetailSerializer(serializers.ModelSerializer):
     """Listening javob detallari"""
     question_number = serializers.IntegerField(source='question.question_number')
@@ -49,7 +76,7 @@ class ListeningAnswerDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ListeningAnswer
-        fields = ['question_number', 'section_number', 'question_text', 'user_answer', 'answered_at']
+        fields = ['question_number', 'section_number', 'question_text', 'user_answer', 'is_correct', 'answered_at']
 
 
 # ==================== READING SERIALIZERS ====================
@@ -59,7 +86,10 @@ class ReadingSubmitSerializer(serializers.Serializer):
     test_id = serializers.IntegerField()
     answers = serializers.DictField(
         child=serializers.CharField(max_length=500, allow_blank=True),
-        help_text="Question number: answer. Example: {'1': 'TRUE', '2': 'FALSE'}"
+        required=False,
+        default=dict,
+        help_text="Question number: answer. Example: {'1': 'TRUE', '2': 'FALSE'}. "
+                  "Draft (autosave) ishlatilgan bo'lsa faqat oxirgi o'zgarishlar"
     )
     time_spent = serializers.IntegerField(min_value=0, help_text="Sekundlarda")
 
@@ -72,9 +102,6 @@ class ReadingSubmitSerializer(serializers.Serializer):
         if not isinstance(value, dict):
             raise serializers.ValidationError("Answers must be a dictionary")
 
-        if len(value) == 0:
-            raise serializers.ValidationError("Kamida 1 ta javob kerak")
-
         # ✅ Maksimal 40 ta javob
         if len(value) > 40:
             raise serializers.ValidationError("Juda ko'p javob (maksimal 40)")
@@ -103,7 +130,7 @@ class ReadingAnswerDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ReadingAnswer
-        fields = ['question_number', 'passage_number', 'question_text', 'user_answer', 'answered_at']
+        fields = ['question_number', 'passage_number', 'question_text', 'user_answer', 'is_correct', 'answered_at']
 
 
 # ==================== WRITING SERIALIZERS ====================
@@ -161,8 +188,8 @@ class TestAttemptListSerializer(serializers.ModelSerializer):
         model = TestAttempt
         fields = [
             'id', 'test_title', 'student_name', 'status',
-            'started_at', 'completed_at', 'listening_band',
-            'reading_band', 'writing_band', 'overall_band',
+            'started_at', 'completed_at', 'listening_raw_score', 'listening_band',
+            'reading_raw_score', 'reading_band', 'writing_band', 'overall_band',
             'graded_at', 'is_graded'
         ]
 
@@ -182,18 +209,31 @@ class TestAttemptDetailSerializer(serializers.ModelSerializer):
     reading_answers = ReadingAnswerDetailSerializer(many=True, read_only=True)
     writing_submissions = WritingSubmissionDetailSerializer(many=True, read_only=True)
 
+    # ?include= qiymatlari va ularga mos nested maydonlar
+    SECTION_FIELDS = {
+        'listening': 'listening_answers',
+        'reading': 'reading_answers',
+        'writing': 'writing_submissions',
+    }
+
     class Meta:
         model = TestAttempt
         fields = [
             'id', 'test_title', 'student_name', 'status',
             'started_at', 'completed_at',
-            'listening_band', 'reading_band', 'writing_band', 'overall_band',
+            'listening_raw_score', 'listening_band', 'reading_raw_score', 'reading_band', 'writing_band', 'overall_band',
             'teacher_comment', 'graded_by_name', 'graded_at','is_graded',
             'listening_answers', 'reading_answers', 'writing_submissions'
         ]
 
-        def get_is_graded(self, obj):
-            return obj.is_graded()
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Faqat so'ralgan sectionlar (context['include'] bo'lmasa - hammasi)
+        include = self.context.get('include')
+        if include is not None:
+            for section, field_name in self.SECTION_FIELDS.items():
+                if section not in include:
+                    self.fields.pop(field_name)
 
 
 class GradeAttemptSerializer(serializers.Serializer):
@@ -224,4 +264,18 @@ class GradeAttemptSerializer(serializers.Serializer):
             data.get('writing_band')
         ]):
             raise serializers.ValidationError("Kamida bitta band score kiriting")
-        return data
\ No newline at end of file
+        return data
+
+class SubmissionIntakeSerializer(serializers.ModelSerializer):
+    """Navbatdagi submit holati"""
+
+    test_id = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = SubmissionIntake
+        fields = [
+            'id', 'test_id', 'section', 'status',
+            'result', 'error', 'attempts', 'next_run_at',
+            'created_at', 'processed_at'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,16 @@
+from .scoring import *
+from .rescoring import *
+from .content_version import *
+from .drafts import *
+from .exam_clock import *
+from .test_package import *
+from .submission import *
+from .test_versions import *
+from .test_summary import *
+from .audio_probe import *
+from .audio_upload import *
+from .audio_delivery import *
+from .audio_encoders import *
+from .audio_variants import *
+from .image_derivatives import *
+from .media_storage import *
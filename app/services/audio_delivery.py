@@ -0,0 +1,213 @@
+"""
+Section audiosini ruxsat bilan, byte-range qo'llab uzatish.
+
+<audio> elementi Authorization sarlavhasini yubora olmaydi, shuning uchun
+URL ichida imzolangan token bo'ladi: attempt (talaba) yoki user (teacher
+preview) va section. Har so'rovda attempt hali faol ekanligi tekshiriladi.
+
+Baytlarni Python uzatmaydi:
+- AUDIO_DELIVERY = 'x-accel' - nginx ga X-Accel-Redirect (Range/If-Range ni nginx o'zi bajaradi);
+- AUDIO_DELIVERY = 'sendfile' - fayl seek qilinib FileResponse qaytadi, gunicorn
+  wsgi.file_wrapper orqali os.sendfile bilan aynan Content-Length bayt yuboradi;
+- AUDIO_DELIVERY = 'stream' (default) - oraliq baytlari Python oqimi bilan, uzunligi
+  cheklangan holda (runserver/wsgiref file_wrapper i Content-Length ga qaramaydi).
+"""
+import hashlib
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from app.models import ListeningSection, TestAttempt, User
+
+
+AUDIO_TOKEN_SALT = 'section-audio'
+STREAM_BLOCK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class AudioAccessError(Exception):
+    """Token yaroqsiz yoki attempt faol emas"""
+
+
+# ==================== TOKENS ====================
+def make_audio_token(section_id, attempt_id=None, user_id=None):
+    payload = {'s': section_id}
+    if attempt_id is not None:
+        payload['a'] = attempt_id
+    else:
+        payload['u'] = user_id
+    return signing.dumps(payload, salt=AUDIO_TOKEN_SALT, compress=True)
+
+
+def can_preview_audio(user):
+    """Teacher/admin - attemptsiz (user token bilan) tinglay oladi"""
+    return user.is_staff or getattr(user, 'role', None) in ['admin', 'teacher']
+
+
+def active_listening_attempt_id(user, test_id):
+    """Talabaning listening hali tugamagan faol attempti (bo'lmasa None)"""
+    return TestAttempt.objects.filter(
+        user=user, test_id=test_id, status='in_progress', listening_submitted=False
+    ).values_list('id', flat=True).first()
+
+
+def section_audio_url(request, section_id, attempt_id=None, preview=False):
+    """Imzolangan /web/audio/{token}/ havolasi; ruxsat bo'lmasa None"""
+    if attempt_id is None and not preview:
+        return None
+    token = make_audio_token(section_id, attempt_id=attempt_id, user_id=request.user.id)
+    return request.build_absolute_uri(reverse('section-audio', args=[token]))
+
+
+def resolve_audio_token(token):
+    """Token -> ListeningSection (ruxsat tekshirilgan)"""
+    try:
+        payload = signing.loads(token, salt=AUDIO_TOKEN_SALT, max_age=settings.AUDIO_URL_MAX_AGE)
+    except signing.BadSignature:
+        raise AudioAccessError('Audio havolasi yaroqsiz yoki muddati tugagan')
+
+    section = ListeningSection.objects.filter(pk=payload.get('s')).only('id', 'test_id', 'audio_file').first()
+    if section is None:
+        raise AudioAccessError('Section topilmadi')
+
+    if 'a' in payload:
+        active = TestAttempt.objects.filter(
+            pk=payload['a'], test_id=section.test_id, status='in_progress', listening_submitted=False
+        ).exists()
+        if not active:
+            raise AudioAccessError('Faol attempt topilmadi')
+    else:
+        allowed = User.objects.filter(
+            Q(is_staff=True) | Q(role__in=['teacher', 'admin']), pk=payload.get('u')
+        ).exists()
+        if not allowed:
+            raise AudioAccessError("Ruxsat yo'q")
+    return section
+
+
+# ==================== RANGE ====================
+def parse_range(header, size):
+    """
+    'bytes=start-end' -> (start, end) yoki None (butun fayl).
+    Bir nechta oraliq so'ralsa butun fayl qaytadi (RFC ruxsat beradi).
+    Qoniqtirib bo'lmaydigan oraliq -> ValueError (416).
+    """
+    match = RANGE_RE.match((header or '').strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-500 - oxirgi 500 bayt
+        length = int(last)
+        if length == 0:
+            raise ValueError('empty suffix range')
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError('unsatisfiable range')
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == int(last_modified)
+
+
+def _iter_file(fileobj, length):
+    remaining = length
+    try:
+        while remaining > 0:
+            data = fileobj.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+    finally:
+        fileobj.close()
+
+
+# ==================== RESPONSE ====================
+def audio_validators(section_id, name, path):
+    """(etag, last_modified, size) - media manifest ham shu qiymatlarni e'lon qiladi"""
+    stat = os.stat(path)
+    name_hash = hashlib.md5(name.encode('utf-8')).hexdigest()[:8]
+    etag = f'"{section_id}-{name_hash}-{stat.st_size}-{stat.st_mtime_ns}"'
+    return etag, int(stat.st_mtime), stat.st_size
+
+
+def audio_response(request, section, audio=None):
+    """
+    Range / If-Range / If-None-Match qo'llab, baytlarni OS ga topshiruvchi javob.
+    audio - uzatiladigan fayl (variant), berilmasa section.audio_file
+    """
+    audio = audio or section.audio_file
+    name = audio.name
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+    if settings.AUDIO_DELIVERY == 'x-accel':
+        # nginx: location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = f'{settings.AUDIO_ACCEL_REDIRECT_PREFIX}{name}'
+        response['X-Accel-Buffering'] = 'no'
+        response['Cache-Control'] = 'private, no-store'
+        return response
+
+    try:
+        path = audio.path
+    except NotImplementedError:
+        # Tashqi storage (S3 va h.k.) - o'zining URL i orqali
+        return HttpResponseRedirect(audio.url)
+
+    etag, last_modified, size = audio_validators(section.id, name, path)
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    byte_range = None
+    if _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1
+
+    fileobj = open(path, 'rb')
+    fileobj.seek(start)
+    if settings.AUDIO_DELIVERY == 'sendfile' or byte_range is None:
+        # gunicorn: joriy pozitsiyadan Content-Length bayt - os.sendfile.
+        # Butun fayl - EOF gacha, har qanday serverda to'g'ri
+        response = FileResponse(fileobj, content_type=content_type)
+    else:
+        # Oraliq - faqat kerakli baytlar (wsgiref file_wrapper EOF gacha yuborardi)
+        response = StreamingHttpResponse(_iter_file(fileobj, length), content_type=content_type)
+
+    response['Content-Length'] = str(length)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'private, no-store'
+    if byte_range is not None:
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
@@ -0,0 +1,142 @@
+"""
+Audio variant encoderlari.
+
+Encoder - `extension` atributi va encode(source_path, target_path, profile)
+metodi bo'lgan klass; encode natija bitrate ini (kbps) qaytaradi.
+settings.AUDIO_VARIANT_ENCODER da dotted path bilan tanlanadi.
+
+- WavResampleEncoder - faqat standart kutubxona: 16-bit WAV ni mono ga
+  o'tkazadi, loudness ni normallashtiradi (RMS bo'yicha, peak cheklovi bilan)
+  va chiziqli interpolyatsiya bilan past sample rate ga resample qiladi.
+  Fayl bloklar bilan o'qiladi - xotirada to'planmaydi.
+- FfmpegEncoder - ffmpeg loudnorm filtri va MP3 (production uchun).
+"""
+import array
+import math
+import shutil
+import subprocess
+import sys
+import wave
+
+
+BLOCK_FRAMES = 64 * 1024
+SAMPLE_MAX = 32767
+SAMPLE_MIN = -32768
+
+
+class EncoderError(Exception):
+    """Faylni kodlab bo'lmadi"""
+
+
+class WavResampleEncoder:
+    extension = 'wav'
+
+    def _read_blocks(self, source):
+        """16-bit mono namunalar bloklari (kanallar o'rtacha qilinadi)"""
+        channels = source.getnchannels()
+        source.rewind()
+        while True:
+            frames = source.readframes(BLOCK_FRAMES)
+            if not frames:
+                return
+            samples = array.array('h')
+            samples.frombytes(frames)
+            if sys.byteorder == 'big':
+                samples.byteswap()
+            if channels > 1:
+                samples = array.array('h', (
+                    sum(samples[i:i + channels]) // channels
+                    for i in range(0, len(samples), channels)
+                ))
+            yield samples
+
+    def _measure(self, source):
+        """(rms, peak) - birinchi o'tish"""
+        total = 0
+        count = 0
+        peak = 0
+        for block in self._read_blocks(source):
+            total += sum(sample * sample for sample in block)
+            count += len(block)
+            peak = max(peak, max(block, default=0), -min(block, default=0))
+        rms = math.sqrt(total / count) if count else 0
+        return rms, peak
+
+    def _gain(self, rms, peak, target_dbfs):
+        if not rms or not peak:
+            return 1.0
+        target_rms = SAMPLE_MAX * 10 ** (target_dbfs / 20)
+        # Clipping bo'lmasligi uchun peak 0.98 dan oshmasin
+        return min(target_rms / rms, SAMPLE_MAX * 0.98 / peak)
+
+    def _resample(self, blocks, ratio, gain):
+        """Chiziqli interpolyatsiya; ratio = input_rate / output_rate"""
+        position = 0.0  # keyingi chiqish namunasining input indeksi (global)
+        base = 0        # buffer[0] ning global indeksi
+        buffer = []
+        for block in blocks:
+            buffer.extend(block)
+            out = array.array('h')
+            while True:
+                index = int(position)
+                if index + 1 >= base + len(buffer):
+                    break
+                left = buffer[index - base]
+                right = buffer[index + 1 - base]
+                value = (left + (right - left) * (position - index)) * gain
+                out.append(max(SAMPLE_MIN, min(SAMPLE_MAX, int(round(value)))))
+                position += ratio
+            consumed = int(position) - base
+            if consumed > 0:
+                del buffer[:consumed]
+                base += consumed
+            yield out
+
+    def encode(self, source_path, target_path, profile):
+        try:
+            source = wave.open(source_path, 'rb')
+        except (wave.Error, EOFError) as e:
+            raise EncoderError(f"WAV o'qib bo'lmadi: {e}")
+
+        with source:
+            if source.getsampwidth() != 2:
+                raise EncoderError('Faqat 16-bit PCM WAV qo\'llab-quvvatlanadi (boshqalari uchun FfmpegEncoder)')
+            input_rate = source.getframerate()
+            output_rate = min(profile['sample_rate'], input_rate)
+
+            rms, peak = self._measure(source)
+            gain = self._gain(rms, peak, profile.get('target_dbfs', -20))
+
+            with wave.open(target_path, 'wb') as target:
+                target.setnchannels(1)
+                target.setsampwidth(2)
+                target.setframerate(output_rate)
+                for block in self._resample(self._read_blocks(source), input_rate / output_rate, gain):
+                    if sys.byteorder == 'big':
+                        block.byteswap()
+                    target.writeframes(block.tobytes())
+
+        return output_rate * 16 // 1000
+
+
+class FfmpegEncoder:
+    extension = 'mp3'
+    timeout = 60 * 30
+
+    def encode(self, source_path, target_path, profile):
+        binary = shutil.which('ffmpeg')
+        if binary is None:
+            raise EncoderError("ffmpeg o'rnatilmagan")
+        command = [
+            binary, '-nostdin', '-y', '-v', 'error', '-i', source_path,
+            '-af', f"loudnorm=I={profile.get('loudness', -16)}:TP=-1.5:LRA=11",
+            '-ac', '1', '-ar', str(profile['sample_rate']),
+            '-b:a', f"{profile['bitrate']}k", target_path,
+        ]
+        try:
+            subprocess.run(command, capture_output=True, timeout=self.timeout, check=True)
+        except subprocess.CalledProcessError as e:
+            raise EncoderError(e.stderr.decode('utf-8', 'replace')[-500:])
+        except (subprocess.SubprocessError, OSError) as e:
+            raise EncoderError(str(e))
+        return profile['bitrate']
@@ -0,0 +1,72 @@
+"""
+Audio davomiyligini fayldan aniqlash.
+
+Proberlar settings.AUDIO_DURATION_PROBERS da (dotted path) tartib bilan
+chaqiriladi: har biri fayl yo'lini oladi va sekundlarni (int) yoki None
+qaytaradi. WAV standart `wave` moduli bilan, qolgan formatlar ffprobe bilan
+(o'rnatilgan bo'lsa). Yangi format uchun o'z proberingizni ro'yxatga qo'shing.
+"""
+import json
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+import wave
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+FFPROBE_TIMEOUT = 30
+
+
+def probe_wav(path):
+    try:
+        with wave.open(path, 'rb') as audio:
+            frames = audio.getnframes()
+            rate = audio.getframerate()
+    except (wave.Error, EOFError):
+        return None
+    if not rate:
+        return None
+    return math.ceil(frames / rate)
+
+
+def probe_ffprobe(path):
+    binary = shutil.which('ffprobe')
+    if binary is None:
+        return None
+    try:
+        result = subprocess.run(
+            [binary, '-v', 'error', '-show_entries', 'format=duration', '-of', 'json', path],
+            capture_output=True, timeout=FFPROBE_TIMEOUT, check=True,
+        )
+        duration = float(json.loads(result.stdout)['format']['duration'])
+    except (subprocess.SubprocessError, OSError, ValueError, KeyError, TypeError):
+        return None
+    return math.ceil(duration)
+
+
+def probe_duration(path):
+    """Birinchi muvaffaqiyatli prober natijasi (sekund) yoki None"""
+    for dotted_path in settings.AUDIO_DURATION_PROBERS:
+        duration = import_string(dotted_path)(path)
+        if duration:
+            return duration
+    return None
+
+
+def probe_uploaded_file(uploaded_file):
+    """Multipart bilan kelgan fayl (UploadedFile) davomiyligi"""
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        return probe_duration(uploaded_file.temporary_file_path())
+
+    # Kichik fayllar xotirada - proberlar yo'l bilan ishlaydi
+    suffix = os.path.splitext(uploaded_file.name)[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix) as tmp:
+        for chunk in uploaded_file.chunks():
+            tmp.write(chunk)
+        tmp.flush()
+        uploaded_file.seek(0)
+        return probe_duration(tmp.name)
@@ -0,0 +1,200 @@
+"""
+Section audiosi uchun bo'lakli (chunked), qayta davom ettiriladigan upload.
+
+Protokol:
+1. Sessiya ochish - fayl nomi, hajmi va (ixtiyoriy) sha256.
+2. PUT bo'laklar, `Content-Range: bytes start-end/total`. Bo'lak faqat joriy
+   offset dan boshlanishi mumkin - aks holda 409 va to'g'ri offset qaytadi.
+   Uzilgan upload GET bilan offset ni bilib, shu joydan davom etadi.
+3. Yakunlash - hajm va sha256 tekshiriladi, davomiylik fayldan aniqlanadi,
+   fayl storage ga ko'chiriladi (section berilgan bo'lsa unga biriktiriladi).
+
+Bo'laklar so'rov oqimidan to'g'ridan-to'g'ri diskka yoziladi - fayl xotirada
+to'planmaydi.
+"""
+import hashlib
+import os
+import re
+import time
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+
+from app.models import AudioUpload
+from app.services.audio_probe import probe_duration
+from app.services.test_versions import ensure_test_editable
+
+
+COPY_BUFFER_SIZE = 64 * 1024
+ALLOWED_AUDIO_EXTENSIONS = {'.mp3', '.wav', '.m4a', '.aac', '.ogg', '.oga', '.flac', '.webm'}
+STALE_UPLOAD_SECONDS = 60 * 60 * 24
+
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+class UploadError(Exception):
+    """Upload rad etildi - status HTTP status, offset - mijoz davom etishi kerak bo'lgan joy"""
+
+    def __init__(self, message, status=400, offset=None):
+        self.status = status
+        self.offset = offset
+        super().__init__(message)
+
+
+def parse_content_range(header):
+    """'bytes 0-1048575/52428800' -> (0, 1048575, 52428800)"""
+    match = CONTENT_RANGE_RE.match((header or '').strip())
+    if not match:
+        raise UploadError("Content-Range sarlavhasi 'bytes start-end/total' formatida bo'lishi kerak")
+    start, end, total = (int(value) for value in match.groups())
+    if end < start or end >= total:
+        raise UploadError("Content-Range noto'g'ri")
+    return start, end, total
+
+
+def start_upload(user, filename, total_size, sha256='', section=None):
+    """Yangi upload sessiyasi - bo'sh vaqtinchalik fayl bilan"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in ALLOWED_AUDIO_EXTENSIONS:
+        raise UploadError(f"Audio formati qo'llab-quvvatlanmaydi: {extension or filename}")
+    if total_size <= 0 or total_size > settings.AUDIO_UPLOAD_MAX_SIZE:
+        raise UploadError(f"Fayl hajmi 1 va {settings.AUDIO_UPLOAD_MAX_SIZE} bayt orasida bo'lishi kerak")
+    if sha256 and not re.fullmatch(r'[0-9a-fA-F]{64}', sha256):
+        raise UploadError("sha256 64 ta hex belgidan iborat bo'lishi kerak")
+    if section is not None:
+        ensure_test_editable(section.test_id)
+
+    upload = AudioUpload.objects.create(
+        section=section, created_by=user, filename=os.path.basename(filename),
+        total_size=total_size, sha256=sha256.lower(),
+    )
+    os.makedirs(settings.AUDIO_UPLOAD_TEMP_DIR, exist_ok=True)
+    open(upload.temp_path, 'wb').close()
+    return upload
+
+
+def _lock_upload(upload_id):
+    upload = AudioUpload.objects.select_for_update().get(pk=upload_id)
+    if upload.status != 'uploading':
+        raise UploadError(f"Upload holati: {upload.status}", status=409, offset=upload.received)
+    return upload
+
+
+@transaction.atomic
+def write_chunk(upload_id, stream, content_range):
+    """
+    Bo'lakni oqimdan diskka yozish. Bir upload uchun parallel PUT lar
+    qator blokirovkasi bilan navbatga turadi. Yangi offset qaytadi.
+    """
+    start, end, total = parse_content_range(content_range)
+    upload = _lock_upload(upload_id)
+
+    if total != upload.total_size:
+        raise UploadError(f"Umumiy hajm {upload.total_size} bo'lishi kerak", offset=upload.received)
+    if start != upload.received:
+        raise UploadError("Bo'lak joriy offset dan boshlanishi kerak", status=409, offset=upload.received)
+    length = end - start + 1
+    if length > settings.AUDIO_UPLOAD_MAX_CHUNK_SIZE:
+        raise UploadError(
+            f"Bo'lak hajmi {settings.AUDIO_UPLOAD_MAX_CHUNK_SIZE} baytdan oshmasligi kerak", offset=upload.received
+        )
+
+    written = 0
+    with open(upload.temp_path, 'r+b') as target:
+        target.seek(start)
+        while written < length:
+            data = stream.read(min(COPY_BUFFER_SIZE, length - written))
+            if not data:
+                break
+            target.write(data)
+            written += len(data)
+        if written != length:
+            # Ulanish uzildi - chala bo'lak tashlab yuboriladi
+            target.truncate(start)
+            raise UploadError("Bo'lak to'liq kelmadi", offset=upload.received)
+        target.truncate(end + 1)
+
+    upload.received = end + 1
+    upload.save(update_fields=['received', 'updated_at'])
+    return upload.received
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(COPY_BUFFER_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fail(upload, message, status=400):
+    upload.status = 'failed'
+    upload.error = message
+    upload.save(update_fields=['status', 'error', 'updated_at'])
+    if os.path.exists(upload.temp_path):
+        os.remove(upload.temp_path)
+    return UploadError(message, status=status)
+
+
+def complete_upload(upload_id):
+    """Checksum, davomiylik, storage ga ko'chirish va section ga biriktirish"""
+    with transaction.atomic():
+        upload = _lock_upload(upload_id)
+        if upload.received != upload.total_size:
+            raise UploadError("Upload hali tugamagan", status=409, offset=upload.received)
+
+        checksum = file_sha256(upload.temp_path)
+        duration = None
+        if upload.sha256 and checksum != upload.sha256:
+            error = "sha256 mos kelmadi - fayl buzilgan, qaytadan yuklang"
+        else:
+            duration = probe_duration(upload.temp_path)
+            error = None if duration else "Audio davomiyligini aniqlab bo'lmadi - format qo'llab-quvvatlanmaydi"
+
+        if error is None:
+            if upload.section_id is not None:
+                ensure_test_editable(upload.section.test_id)
+
+            with open(upload.temp_path, 'rb') as source:
+                upload.audio_file.save(upload.filename, File(source), save=False)
+            upload.audio_duration = duration
+            upload.sha256 = checksum
+            upload.status = 'complete'
+            upload.save()
+
+            if upload.section_id is not None:
+                attach_upload(upload, upload.section)
+
+    if error is not None:
+        # Xato holati saqlanishi uchun transaction tashqarisida
+        raise _fail(upload, error)
+
+    os.remove(upload.temp_path)
+    return upload
+
+
+def attach_upload(upload, section):
+    """Tugagan upload faylini sectionga biriktirish (signallar vaqt limitini yangilaydi)"""
+    section.audio_file = upload.audio_file.name
+    section.audio_duration = upload.audio_duration
+    section.save(update_fields=['audio_file', 'audio_duration'])
+    if upload.section_id != section.id:
+        upload.section = section
+        upload.save(update_fields=['section', 'updated_at'])
+
+
+def cleanup_stale_uploads(max_age=STALE_UPLOAD_SECONDS):
+    """Tashlab ketilgan sessiyalar va ularning vaqtinchalik fayllarini o'chirish"""
+    cutoff = time.time() - max_age
+    removed = 0
+    for upload in AudioUpload.objects.filter(status__in=['uploading', 'failed']):
+        path = upload.temp_path
+        last_activity = os.path.getmtime(path) if os.path.exists(path) else upload.updated_at.timestamp()
+        if last_activity >= cutoff:
+            continue
+        if os.path.exists(path):
+            os.remove(path)
+        upload.delete()
+        removed += 1
+    return removed
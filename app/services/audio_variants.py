@@ -0,0 +1,196 @@
+"""
+Audio variantlar pipeline'i.
+
+Section audio_file o'zgarganda (app/signals.py) har bir profil uchun 'pending'
+AudioVariant qatori yoziladi. `manage.py process_audio_variants` navbatdan
+qatorlarni SKIP LOCKED bilan oladi - bir nechta worker parallel ishlay oladi.
+Encoder settings.AUDIO_VARIANT_ENCODER dan olinadi (app/services/audio_encoders.py).
+"""
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from app.models import AudioVariant, ListeningSection
+from app.services.audio_encoders import EncoderError
+from app.services.content_version import touch_test
+
+
+logger = logging.getLogger(__name__)
+
+VARIANT_STALE_SECONDS = 60 * 60
+
+
+def get_encoder():
+    return import_string(settings.AUDIO_VARIANT_ENCODER)()
+
+
+def schedule_audio_variants(section_id):
+    """
+    Section uchun barcha profillarni navbatga qo'yish.
+    Variant allaqachon shu fayldan tayyorlangan bo'lsa - tegilmaydi.
+    """
+    source_name = ListeningSection.objects.filter(pk=section_id).values_list('audio_file', flat=True).first()
+    if not source_name:
+        return 0
+
+    existing = {
+        variant.profile: variant
+        for variant in AudioVariant.objects.filter(section_id=section_id)
+    }
+    scheduled = 0
+    for profile in settings.AUDIO_VARIANT_PROFILES:
+        variant = existing.get(profile)
+        if variant is not None and variant.source_name == source_name and variant.status != 'failed':
+            continue
+        AudioVariant.objects.update_or_create(
+            section_id=section_id, profile=profile,
+            defaults={'source_name': source_name, 'status': 'pending', 'error': '', 'claimed_at': None},
+        )
+        scheduled += 1
+
+    # Olib tashlangan profillar
+    AudioVariant.objects.filter(section_id=section_id).exclude(
+        profile__in=list(settings.AUDIO_VARIANT_PROFILES)
+    ).delete()
+    return scheduled
+
+
+def requeue_stale_variants():
+    cutoff = timezone.now() - timezone.timedelta(seconds=VARIANT_STALE_SECONDS)
+    return AudioVariant.objects.filter(
+        status='processing', claimed_at__lt=cutoff
+    ).update(status='pending', claimed_at=None)
+
+
+def claim_variant():
+    with transaction.atomic():
+        variant = (
+            AudioVariant.objects.select_for_update(skip_locked=True)
+            .filter(status='pending')
+            .select_related('section')
+            .order_by('id')
+            .first()
+        )
+        if variant is not None:
+            variant.status = 'processing'
+            variant.claimed_at = timezone.now()
+            variant.save(update_fields=['status', 'claimed_at', 'updated_at'])
+    return variant
+
+
+def _local_source(field_file, tmp_dir):
+    """Encoderlar fayl yo'li bilan ishlaydi - tashqi storage bo'lsa vaqtincha ko'chiriladi"""
+    try:
+        return field_file.path
+    except NotImplementedError:
+        path = os.path.join(tmp_dir, os.path.basename(field_file.name))
+        with field_file.open('rb') as source, open(path, 'wb') as target:
+            shutil.copyfileobj(source, target)
+        return path
+
+
+def _save_claimed(variant, claimed_source, **fields):
+    """
+    Natijani faqat qator hali shu claim ga tegishli bo'lsa yozish: ishlanayotganda
+    audio almashsa schedule_audio_variants qatorni yangi source_name bilan
+    'pending' qilib qo'yadi - eski fayldan tayyorlangan natija uni bosib ketmasin.
+    """
+    fields['updated_at'] = timezone.now()
+    return AudioVariant.objects.filter(
+        pk=variant.pk, source_name=claimed_source, status='processing'
+    ).update(**fields)
+
+
+def process_variant(variant, encoder=None):
+    """
+    Bitta variantni tayyorlash va saqlash.
+    Qator shu orada qayta navbatga qo'yilgan bo'lsa natija tashlab yuboriladi (None).
+    """
+    encoder = encoder or get_encoder()
+    section = variant.section
+    profile = settings.AUDIO_VARIANT_PROFILES[variant.profile]
+    claimed_source = variant.source_name
+
+    if section.audio_file.name != claimed_source:
+        # Navbatda turganida audio almashdi - yangi fayl bilan qayta navbatga
+        _save_claimed(
+            variant, claimed_source, status='pending', source_name=section.audio_file.name, claimed_at=None
+        )
+        return None
+
+    old_name = variant.audio_file.name
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_path = _local_source(section.audio_file, tmp_dir)
+            target_path = os.path.join(tmp_dir, f'variant.{encoder.extension}')
+            bitrate = encoder.encode(source_path, target_path, profile)
+
+            stem = os.path.splitext(os.path.basename(claimed_source))[0]
+            with open(target_path, 'rb') as output:
+                variant.audio_file.save(f'{stem}_{variant.profile}.{encoder.extension}', File(output), save=False)
+        variant.size = variant.audio_file.size
+        variant.bitrate = bitrate
+        variant.status = 'done'
+        variant.error = ''
+    except (EncoderError, OSError) as e:
+        variant.status = 'failed'
+        variant.error = str(e)
+    except Exception as e:
+        logger.exception('Audio variant %s failed', variant.id)
+        variant.status = 'failed'
+        variant.error = f'Ichki xatolik: {e}'
+
+    saved = _save_claimed(
+        variant, claimed_source,
+        status=variant.status, error=variant.error, audio_file=variant.audio_file.name,
+        size=variant.size, bitrate=variant.bitrate,
+    )
+    if not saved:
+        # Eskirgan natija - yangi yozilgan fayl kerak emas
+        if variant.status == 'done' and variant.audio_file.name != old_name:
+            variant.audio_file.storage.delete(variant.audio_file.name)
+        return None
+
+    if variant.status == 'done':
+        # Media manifest yangi variantni ko'rsatishi uchun
+        touch_test(section.test_id)
+        # Nusxalangan testning varianti ham shu faylga ishora qilishi mumkin (clone_test)
+        if (
+            old_name and old_name != variant.audio_file.name
+            and not AudioVariant.objects.filter(audio_file=old_name).exists()
+        ):
+            variant.audio_file.storage.delete(old_name)
+    return variant
+
+
+def process_variant_queue(poll_interval=5.0, once=False):
+    """Navbatni bo'shatish. once=True - navbat bo'shagach to'xtash"""
+    encoder = get_encoder()
+    processed = 0
+    while True:
+        variant = claim_variant()
+        if variant is None:
+            if once:
+                return processed
+            time.sleep(poll_interval)
+            continue
+        process_variant(variant, encoder)
+        processed += 1
+
+
+def pick_variant(section, profile):
+    """Mijoz so'ragan tayyor variant fayli yoki None (original beriladi)"""
+    if not profile:
+        return None
+    variant = AudioVariant.objects.filter(
+        section_id=section.id, profile=profile, status='done', source_name=section.audio_file.name
+    ).only('audio_file').first()
+    return variant.audio_file if variant else None
@@ -0,0 +1,25 @@
+"""
+Test kontent versiyasi.
+
+Versiya - Test.updated_at (DB dan), shuning uchun barcha web processlar va
+workerlar bir xil qiymatni ko'radi. Test, section, savol, passage yoki writing
+task saqlanganda/o'chirilganda Test.updated_at yangilanadi (app/signals.py).
+Versiyaga bog'langan cache'lar (exam bundle, answer key va h.k.) shu orqali
+avtomatik eskiradi; conditional GET (ETag / Last-Modified) ham shu maydonga tayanadi.
+"""
+from django.utils import timezone
+
+
+def get_content_version(test_id):
+    """Joriy versiya - Test.updated_at mikrosekundlarda (test bo'lmasa 0)"""
+    from app.models import Test
+    updated_at = Test.objects.filter(pk=test_id).values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        return 0
+    return int(updated_at.timestamp()) * 1_000_000 + updated_at.microsecond
+
+
+def touch_test(test_id):
+    """Test.updated_at ni yangilash - versiya o'zgaradi (signal yubormaydi)"""
+    from app.models import Test
+    Test.objects.filter(pk=test_id).update(updated_at=timezone.now())
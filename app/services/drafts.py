@@ -0,0 +1,52 @@
+"""
+Javob qoralamalari (delta autosave).
+
+Client faqat o'zgargan savollarni yuboradi. Har bir PATCH o'zgarishlarni
+bitta upsert (INSERT ... ON CONFLICT DO UPDATE) bilan to'g'ridan-to'g'ri
+AnswerDraft jadvaliga yozadi - har bir savol alohida qator, shuning uchun
+parallel PATCH lar bir-birining javoblarini yo'qotmaydi va qaysi web worker
+yoki navbat workeri o'qishidan qat'i nazar natija bir xil.
+Yakuniy submit faqat qoralamalarni muhrlaydi.
+"""
+from app.models import AnswerDraft
+
+
+def save_draft_answers(attempt_id, section, answers):
+    """O'zgargan javoblarni bitta upsert bilan saqlash"""
+    drafts = [
+        AnswerDraft(
+            attempt_id=attempt_id,
+            section=section,
+            question_number=int(q_number),
+            user_answer=user_answer.strip()
+        )
+        # Bir xil tartib - parallel upsertlar qatorlarni bir xil ketma-ketlikda bloklaydi
+        for q_number, user_answer in sorted(answers.items(), key=lambda item: int(item[0]))
+    ]
+    AnswerDraft.objects.bulk_create(
+        drafts,
+        update_conflicts=True,
+        unique_fields=['attempt', 'section', 'question_number'],
+        update_fields=['user_answer', 'updated_at']
+    )
+    return len(drafts)
+
+
+def get_draft_answers(attempt_id, section):
+    """Saqlangan qoralamalar"""
+    return {
+        str(q_number): user_answer
+        for q_number, user_answer in AnswerDraft.objects.filter(
+            attempt_id=attempt_id, section=section
+        ).values_list('question_number', 'user_answer')
+    }
+
+
+def seal_drafts(attempt_id, section, answers=None):
+    """Submit vaqtida: qoralamalar va oxirgi delta birlashtiriladi, qoralamalar o'chiriladi"""
+    merged = get_draft_answers(attempt_id, section)
+    if answers:
+        merged.update(answers)
+
+    AnswerDraft.objects.filter(attempt_id=attempt_id, section=section).delete()
+    return merged
@@ -0,0 +1,160 @@
+"""
+Imtihon soati - qolgan vaqtni attempt jadvalini o'qimasdan hisoblash.
+
+Test bo'yicha vaqt limitlari kontent o'zgarganda oldindan hisoblanadi
+(app/signals.py). Umumiy cache kaliti kontent versiyasini (Test.updated_at) o'z
+ichiga oladi; uning oldida process ichidagi qisqa muddatli 'local' cache turadi -
+issiq yo'lda versiya ham DB dan o'qilmaydi. Section boshlanganda attempt soati
+((start, limit) har bir section uchun) umumiy cache'ga yoziladi va
+/attempts/{id}/clock/ faqat cache'dan javob beradi. Cache yo'qolgan holdagina
+DB dan bir marta tiklanadi.
+
+Soat barcha processlar (gunicorn workerlar, navbat workeri) uchun umumiy bo'lishi
+kerak - docker-compose da Redis. REDIS_URL bo'lmasa umumiy cache DatabaseCache
+bo'ladi va har bir soat so'rovi bitta SQL o'qish qiladi (config/settings.py).
+"""
+from django.core.cache import cache, caches
+from django.db.models import Sum
+from django.utils import timezone
+
+from app.models import TestAttempt, ListeningSection
+from app.services.content_version import get_content_version
+
+
+LISTENING_EXTRA_TIME = 600
+READING_TIME_LIMIT = 3600
+WRITING_TIME_LIMIT = 3600
+
+CLOCK_SECTIONS = ('listening', 'reading', 'writing')
+CLOCK_CACHE_TIMEOUT = 60 * 60 * 6
+TIME_LIMITS_CACHE_TIMEOUT = 60 * 60
+# Process ichidagi nusxa - boshqa processda kontent o'zgarsa ko'pi bilan shuncha eskiradi
+TIME_LIMITS_LOCAL_TIMEOUT = 60
+
+local_cache = caches['local']
+
+
+# ==================== TEST TIME LIMITS ====================
+def _time_limits_key(test_id, version=None):
+    if version is None:
+        version = get_content_version(test_id)
+    return f'test_time_limits:{test_id}:{version}'
+
+
+def _local_time_limits_key(test_id):
+    return f'test_time_limits:{test_id}'
+
+
+def compute_time_limits(test_id):
+    audio_duration = ListeningSection.objects.filter(test_id=test_id).aggregate(
+        total=Sum('audio_duration')
+    )['total'] or 0
+    return {
+        'listening': audio_duration + LISTENING_EXTRA_TIME,
+        'listening_audio': audio_duration,
+        'reading': READING_TIME_LIMIT,
+        'writing': WRITING_TIME_LIMIT,
+    }
+
+
+def refresh_time_limits(test_id, version=None):
+    """Kontent o'zgarganda chaqiriladi - limitlarni qayta hisoblab cache'ga yozish"""
+    # Versiya hisoblashdan oldin o'qiladi - orada kontent o'zgarsa eski limit yangi kalitga tushmaydi
+    if version is None:
+        version = get_content_version(test_id)
+    limits = compute_time_limits(test_id)
+    cache.set(_time_limits_key(test_id, version), limits, TIME_LIMITS_CACHE_TIMEOUT)
+    local_cache.set(_local_time_limits_key(test_id), limits, TIME_LIMITS_LOCAL_TIMEOUT)
+    return limits
+
+
+def invalidate_time_limits(test_id):
+    cache.delete(_time_limits_key(test_id))
+    local_cache.delete(_local_time_limits_key(test_id))
+
+
+def get_time_limits(test_id):
+    limits = local_cache.get(_local_time_limits_key(test_id))
+    if limits is not None:
+        return limits
+
+    version = get_content_version(test_id)
+    limits = cache.get(_time_limits_key(test_id, version))
+    if limits is None:
+        return refresh_time_limits(test_id, version)
+    local_cache.set(_local_time_limits_key(test_id), limits, TIME_LIMITS_LOCAL_TIMEOUT)
+    return limits
+
+
+# ==================== ATTEMPT CLOCK ====================
+def _clock_key(attempt_id):
+    return f'attempt_clock:{attempt_id}'
+
+
+def load_clock(attempt_id):
+    """Cache bo'sh bo'lsa attempt soatini DB dan tiklash (sovuq yo'l)"""
+    fields = ['user_id', 'test_id']
+    for section in CLOCK_SECTIONS:
+        fields += [f'{section}_started_at', f'{section}_submitted']
+
+    row = TestAttempt.objects.filter(pk=attempt_id).values(*fields).first()
+    if row is None:
+        return None
+
+    limits = get_time_limits(row['test_id'])
+    clock = {'user_id': row['user_id'], 'sections': {}}
+    for section in CLOCK_SECTIONS:
+        started_at = row[f'{section}_started_at']
+        if started_at:
+            clock['sections'][section] = {
+                'started_at': started_at.timestamp(),
+                'time_limit': limits[section],
+                'submitted': row[f'{section}_submitted'],
+            }
+
+    cache.set(_clock_key(attempt_id), clock, CLOCK_CACHE_TIMEOUT)
+    return clock
+
+
+def get_clock(attempt_id):
+    clock = cache.get(_clock_key(attempt_id))
+    if clock is None:
+        clock = load_clock(attempt_id)
+    return clock
+
+
+def start_section_clock(attempt, section, time_limit):
+    """Section boshlanganda (yoki qayta ochilganda) soatni cache'ga yozish"""
+    clock = cache.get(_clock_key(attempt.id)) or {'user_id': attempt.user_id, 'sections': {}}
+    clock['sections'][section] = {
+        'started_at': getattr(attempt, f'{section}_started_at').timestamp(),
+        'time_limit': time_limit,
+        'submitted': False,
+    }
+    cache.set(_clock_key(attempt.id), clock, CLOCK_CACHE_TIMEOUT)
+
+
+def stop_section_clock(attempt_id, section):
+    """
+    Submitdan keyin (commit bo'lgach) - soat cache'dan o'chiriladi va keyingi
+    so'rovda DB dan (submitted=True bilan) tiklanadi. Navbat workeri yoki boshqa
+    process submit qilgan bo'lsa ham read-modify-write poygasi bo'lmaydi.
+    """
+    cache.delete(_clock_key(attempt_id))
+
+
+def clock_state(clock, now=None):
+    """Client uchun: har bir section bo'yicha qolgan vaqt (sekund)"""
+    now = (now or timezone.now()).timestamp()
+    sections = {}
+    for section, entry in clock['sections'].items():
+        elapsed = now - entry['started_at']
+        remaining = 0 if entry['submitted'] else max(0, int(entry['time_limit'] - elapsed))
+        sections[section] = {
+            'started_at': entry['started_at'],
+            'time_limit': entry['time_limit'],
+            'remaining': remaining,
+            'expired': not entry['submitted'] and remaining == 0,
+            'submitted': entry['submitted'],
+        }
+    return {'server_time': now, 'sections': sections}
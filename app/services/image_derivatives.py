@@ -0,0 +1,147 @@
+"""
+Savol va task rasmlarining kichraytirilgan variantlari (Pillow).
+
+Variant birinchi so'rovda yaratiladi va diskda kesh qilinadi:
+IMAGE_DERIVATIVE_CACHE_DIR/<ab>/<sha256>_<size>.<fmt>. Kalit - original
+faylning kontent hashi, shuning uchun bir xil rasm (nusxalangan testlar)
+bitta variantdan foydalanadi. Kesh hajmi IMAGE_DERIVATIVE_CACHE_MAX_BYTES dan
+oshsa `manage.py evict_image_derivatives` (cron) eng uzoq ishlatilmagan fayllarni
+o'chiradi (LRU - har foydalanishda mtime yangilanadi). So'rov ichida kesh aylanib chiqilmaydi.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+IMAGE_FORMATS = {
+    'webp': {'format': 'WEBP', 'options': {'quality': 80, 'method': 4}},
+    'jpeg': {'format': 'JPEG', 'options': {'quality': 82, 'optimize': True, 'progressive': True}},
+}
+HASH_BLOCK_SIZE = 64 * 1024
+SOURCE_HASH_TIMEOUT = 60 * 60 * 24 * 30
+
+# Rasm maydoni bo'lgan modellar: URL dagi kind -> (model yo'li, maydon, test ga yo'l)
+IMAGE_SOURCES = {
+    'listening-question': ('app.ListeningQuestion', 'question_image', 'section__test'),
+    'writing-task': ('app.WritingTask', 'image', 'test'),
+}
+
+
+class DerivativeError(Exception):
+    """Variant yaratib bo'lmadi"""
+
+
+def source_hash(field_file):
+    """Original fayl kontent hashi (fayl nomi bo'yicha keshlanadi - storage nomlari takrorlanmaydi)"""
+    key = f'image_source_hash:{hashlib.md5(field_file.name.encode("utf-8")).hexdigest()}'
+    digest = cache.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with field_file.open('rb') as source:
+            for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b''):
+                sha.update(block)
+        digest = sha.hexdigest()
+        cache.set(key, digest, SOURCE_HASH_TIMEOUT)
+    return digest
+
+
+def derivative_path(digest, size, fmt):
+    return os.path.join(settings.IMAGE_DERIVATIVE_CACHE_DIR, digest[:2], f'{digest}_{size}.{fmt}')
+
+
+def render_derivative(field_file, width, fmt, target_path):
+    """Kichraytirish va qayta siqish; vaqtinchalik fayl orqali atomik yoziladi"""
+    spec = IMAGE_FORMATS[fmt]
+    try:
+        with field_file.open('rb') as source, Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((width, width * 4), Image.Resampling.LANCZOS)
+            if spec['format'] == 'JPEG' or image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if fmt == 'webp' and 'A' in image.getbands() else 'RGB')
+
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target_path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as tmp:
+                    image.save(tmp, spec['format'], **spec['options'])
+                os.replace(tmp_path, target_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise DerivativeError(f"Rasmni qayta ishlab bo'lmadi: {e}")
+
+
+def evict_derivatives(max_bytes=None):
+    """
+    Kesh hajmi chegaradan oshsa - eng eski (mtime) fayllarni o'chirish.
+    Butun keshni aylanib chiqadi - faqat management command (cron) dan chaqiriladi.
+    """
+    max_bytes = settings.IMAGE_DERIVATIVE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    total = 0
+    for root, _, files in os.walk(settings.IMAGE_DERIVATIVE_CACHE_DIR):
+        for name in files:
+            if name.endswith('.tmp'):
+                # Hozir yozilayotgan variant
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+    removed = 0
+    if total <= max_bytes:
+        return removed
+    for _, size, path in sorted(entries):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+        if total <= max_bytes:
+            break
+    return removed
+
+
+def get_derivative(field_file, size, fmt):
+    """Variant fayl yo'li - keshda bo'lmasa yaratiladi"""
+    if size not in settings.IMAGE_DERIVATIVE_SIZES:
+        raise DerivativeError(f"Noma'lum o'lcham: {size}")
+    if fmt not in IMAGE_FORMATS:
+        raise DerivativeError(f"Noma'lum format: {fmt}")
+
+    path = derivative_path(source_hash(field_file), size, fmt)
+    if os.path.exists(path):
+        # LRU: oxirgi foydalanish vaqti
+        os.utime(path)
+        return path
+
+    render_derivative(field_file, settings.IMAGE_DERIVATIVE_SIZES[size], fmt, path)
+    return path
+
+
+def image_variant_urls(field_file, kind, pk, request=None):
+    """
+    Serializerlar uchun: {'thumb': {'webp': url, 'jpeg': url}, ...} yoki None.
+    ?v= - fayl nomidan; rasm almashsa URL ham o'zgaradi.
+    """
+    if not field_file:
+        return None
+    version = hashlib.md5(field_file.name.encode('utf-8')).hexdigest()[:10]
+    urls = {}
+    for size in settings.IMAGE_DERIVATIVE_SIZES:
+        urls[size] = {}
+        for fmt in IMAGE_FORMATS:
+            url = f"{reverse('image-derivative', args=[kind, pk, size, fmt])}?v={version}"
+            urls[size][fmt] = request.build_absolute_uri(url) if request is not None else url
+    return urls
@@ -0,0 +1,180 @@
+"""
+Content-addressed media bloblari uchun reference counting va garbage collection.
+
+ref_count jadvallardan qayta sanaladi (sync_media_refs) - signal (bitta qator
+o'zgarishi) va bulk_create yo'llari (clone, import) bir xil funksiyani chaqiradi,
+shuning uchun xato bo'lsa ham keyingi o'zgarishda o'zi tuzaladi. gc_media esa
+o'chirishdan oldin havolalarni yana bir bor jadvallardan tekshiradi.
+"""
+import os
+import posixpath
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from app.models import ListeningQuestion, ListeningSection, MediaBlob, WritingTask
+from app.storage import content_storage
+
+
+# Blobga ishora qila oladigan maydonlar
+MEDIA_REFERENCES = [
+    (ListeningSection, 'audio_file'),
+    (ListeningQuestion, 'question_image'),
+    (WritingTask, 'image'),
+]
+SYNC_BATCH_SIZE = 500
+
+
+def register_media_blob(name, digest, size):
+    """Yangi yoki qayta yuklangan blob - updated_at yangilanadi (gc grace qaytadan boshlanadi)"""
+    MediaBlob.objects.update_or_create(name=name, defaults={'digest': digest, 'size': size})
+
+
+def media_blob_names(names):
+    """Fayl nomlaridan faqat blob (content-addressed) bo'lganlari"""
+    storage = content_storage()
+    return {name for name in names if storage.is_blob(name)}
+
+
+def instance_media_names(instance):
+    """Model obyektidagi blob nomlari"""
+    return media_blob_names(
+        getattr(instance, field).name for model, field in MEDIA_REFERENCES if isinstance(instance, model)
+    )
+
+
+def count_media_refs(names):
+    """{name: havolalar soni} - barcha MEDIA_REFERENCES bo'yicha"""
+    counts = Counter()
+    for model, field in MEDIA_REFERENCES:
+        rows = (
+            model.objects.filter(**{f'{field}__in': names})
+            .values(field)
+            .annotate(refs=Count('pk'))
+            .order_by()
+        )
+        for row in rows:
+            counts[row[field]] += row['refs']
+    return counts
+
+
+def sync_media_refs(names):
+    """Berilgan bloblarning ref_count ini jadvallardan qayta hisoblash"""
+    storage = content_storage()
+    names = sorted({name for name in names if storage.is_blob(name)})
+    updated = 0
+    for start in range(0, len(names), SYNC_BATCH_SIZE):
+        batch = names[start:start + SYNC_BATCH_SIZE]
+        counts = count_media_refs(batch)
+        for blob_id, name, ref_count in MediaBlob.objects.filter(name__in=batch).values_list(
+            'id', 'name', 'ref_count'
+        ):
+            refs = counts.get(name, 0)
+            if refs != ref_count:
+                MediaBlob.objects.filter(pk=blob_id).update(ref_count=refs, updated_at=timezone.now())
+                updated += 1
+    return updated
+
+
+def sync_media_refs_on_commit(names):
+    """Commit dan keyin sanash - boshqa tranzaksiyalarning o'zgarishlari ham ko'rinadi"""
+    names = set(names)
+    if names:
+        transaction.on_commit(lambda: sync_media_refs(names))
+
+
+def rebuild_media_refs():
+    """Barcha bloblar uchun ref_count ni qayta hisoblash"""
+    names = list(MediaBlob.objects.values_list('name', flat=True))
+    return sync_media_refs(names)
+
+
+def register_orphan_blobs():
+    """
+    Diskda bor, lekin jadvalda yo'q bloblar (masalan yuklash tranzaksiyasi
+    rollback bo'lgan) - ro'yxatga olinadi, keyin oddiy gc qoidasi bilan o'chiriladi.
+    """
+    storage = content_storage()
+    root = storage.path(storage.prefix)
+    found = {}
+    for dirpath, dirnames, files in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name != storage.tmp_dir]
+        for filename in files:
+            relative = os.path.relpath(os.path.join(dirpath, filename), storage.location)
+            found[relative.replace(os.sep, posixpath.sep)] = os.path.join(dirpath, filename)
+
+    names = sorted(found)
+    created = 0
+    for start in range(0, len(names), SYNC_BATCH_SIZE):
+        batch = names[start:start + SYNC_BATCH_SIZE]
+        known = set(MediaBlob.objects.filter(name__in=batch).values_list('name', flat=True))
+        missing = [name for name in batch if name not in known]
+        MediaBlob.objects.bulk_create([
+            MediaBlob(
+                name=name,
+                digest=os.path.splitext(posixpath.basename(name))[0],
+                size=os.path.getsize(found[name]),
+            )
+            for name in missing
+        ], ignore_conflicts=True)
+        sync_media_refs(missing)
+        created += len(missing)
+    return created
+
+
+def _remove_stale_tmp_files(storage, max_age):
+    """Yuklash o'rtasida uzilib qolgan vaqtinchalik fayllar"""
+    tmp_root = storage.path(f'{storage.prefix}/{storage.tmp_dir}')
+    if not os.path.isdir(tmp_root):
+        return
+    cutoff = time.time() - max_age
+    for filename in os.listdir(tmp_root):
+        path = os.path.join(tmp_root, filename)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def collect_media_garbage(grace=None, dry_run=False):
+    """
+    Hech bir section/savol/task ishlatmaydigan bloblarni o'chirish.
+    grace - ref_count 0 bo'lganidan (yoki yuklanganidan) keyin kutiladigan sekundlar:
+    yangi yuklangan, hali saqlanmagan fayllar o'chib ketmasligi uchun.
+    (removed, freed_bytes) qaytadi.
+    """
+    grace = settings.MEDIA_BLOB_GC_GRACE_SECONDS if grace is None else grace
+    cutoff = timezone.now() - timezone.timedelta(seconds=grace)
+    storage = content_storage()
+
+    removed = 0
+    freed = 0
+    candidates = list(
+        MediaBlob.objects.filter(ref_count=0, updated_at__lt=cutoff).values_list('pk', flat=True)
+    )
+    for blob_id in candidates:
+        with transaction.atomic():
+            # Qator bloklangan - shu blobni qayta yuklayotgan storage kutib turadi
+            blob = MediaBlob.objects.select_for_update(skip_locked=True).filter(
+                pk=blob_id, ref_count=0, updated_at__lt=cutoff
+            ).first()
+            if blob is None:
+                continue
+            if count_media_refs([blob.name]).get(blob.name):
+                # ref_count eskirgan - tuzatiladi, blob qoladi
+                sync_media_refs([blob.name])
+                continue
+            if not dry_run:
+                storage.delete(blob.name)
+                blob.delete()
+            removed += 1
+            freed += blob.size
+
+    if not dry_run:
+        _remove_stale_tmp_files(storage, grace)
+    return removed, freed
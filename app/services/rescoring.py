@@ -0,0 +1,184 @@
+"""
+Test bo'yicha barcha attemptlarni qayta baholash (answer key o'zgarganda).
+
+Attemptlar server-side cursor orqali chunk'larda o'qiladi, chunk'lar process
+pool'ga tarqatiladi va natijalar bulk_update bilan yoziladi. Xotira chunk
+hajmi va navbatdagi chunk'lar soni bilan cheklangan.
+"""
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import get_context
+
+from django.db import transaction
+from django.db.models import Q
+
+from app.models import TestAttempt, ListeningAnswer, ReadingAnswer
+from app.workers import setup_django, run_rescore_chunk
+from app.services.scoring import get_answer_key, invalidate_answer_key, check_answer, raw_score_to_band
+
+
+ANSWER_MODELS = {
+    'listening': ListeningAnswer,
+    'reading': ReadingAnswer,
+}
+
+DEFAULT_CHUNK_SIZE = 500
+BULK_UPDATE_BATCH_SIZE = 1000
+# HTTP so'rov ichida (dashboard/admin) qayta baholanadigan attemptlar chegarasi -
+# kattaroq testlar `manage.py rescore_test` bilan process pool'da baholanadi
+SYNC_RESCORE_MAX_ATTEMPTS = 1000
+
+
+def count_rescore_attempts(test_id):
+    """Listening yoki Reading topshirilgan attemptlar soni"""
+    return TestAttempt.objects.filter(
+        Q(listening_submitted=True) | Q(reading_submitted=True), test_id=test_id
+    ).count()
+
+
+def sync_rescore_error(test_id):
+    """So'rov ichida qayta baholash uchun test juda katta bo'lsa - xato matni, aks holda None"""
+    attempts = count_rescore_attempts(test_id)
+    if attempts <= SYNC_RESCORE_MAX_ATTEMPTS:
+        return None
+    return (
+        f"Testda {attempts} ta attempt bor (so'rov ichida {SYNC_RESCORE_MAX_ATTEMPTS} tagacha). "
+        f"`python manage.py rescore_test {test_id}` buyrug'idan foydalaning"
+    )
+
+
+def iter_attempt_chunks(test_id, section, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Section topshirilgan attempt ID larini chunk'larda qaytarish (server-side cursor)"""
+    attempt_ids = TestAttempt.objects.filter(
+        test_id=test_id,
+        **{f'{section}_submitted': True}
+    ).order_by('id').values_list('id', flat=True).iterator(chunk_size=chunk_size)
+
+    chunk = []
+    for attempt_id in attempt_ids:
+        chunk.append(attempt_id)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def rescore_attempt_chunk(section, test_id, attempt_ids):
+    """
+    Bir chunk attemptlarni qayta baholash.
+    (answers, changed_answers, attempts) sonlarini qaytaradi.
+    """
+    answer_key = get_answer_key(section, test_id)
+    by_id = answer_key['by_id']
+    answer_model = ANSWER_MODELS[section]
+
+    answers = answer_model.objects.filter(
+        attempt_id__in=attempt_ids
+    ).only('id', 'attempt_id', 'question_id', 'user_answer', 'is_correct')
+
+    raw_scores = defaultdict(int)
+    changed = []
+    answers_count = 0
+    for answer in answers.iterator(chunk_size=BULK_UPDATE_BATCH_SIZE):
+        answers_count += 1
+        entry = by_id.get(answer.question_id)
+        is_correct = check_answer(entry, answer.user_answer) if entry else None
+        if is_correct:
+            raw_scores[answer.attempt_id] += entry['points']
+        if is_correct != answer.is_correct:
+            answer.is_correct = is_correct
+            changed.append(answer)
+
+    max_score = answer_key['max_score']
+    attempts = list(TestAttempt.objects.filter(id__in=attempt_ids).only(
+        'id', 'listening_band', 'reading_band', 'writing_band', 'overall_band',
+        'listening_raw_score', 'reading_raw_score', 'listening_max_score', 'reading_max_score'
+    ))
+    score_only = []
+    with_band = []
+    for attempt in attempts:
+        raw_score = raw_scores[attempt.id]
+        old_raw_score = getattr(attempt, f'{section}_raw_score')
+        # Eski band qaysi max score bilan hisoblangan (eski yozuvlarda yo'q - joriysi)
+        stored_max_score = getattr(attempt, f'{section}_max_score')
+        old_max_score = stored_max_score or max_score
+        band = getattr(attempt, f'{section}_band')
+        setattr(attempt, f'{section}_raw_score', raw_score)
+
+        # Band faqat avtomatik hisoblangan bo'lsa yangilanadi: teacher qo'lda qo'ygan
+        # (eski raw score va o'sha paytdagi max score ga mos kelmaydigan) band saqlanib qoladi
+        derived = answer_key['is_complete'] and (
+            band is None or band == raw_score_to_band(section, old_raw_score, old_max_score)
+        )
+        if derived:
+            setattr(attempt, f'{section}_max_score', max_score)
+        new_band = raw_score_to_band(section, raw_score, max_score) if derived else band
+        if new_band != band or (derived and stored_max_score != max_score):
+            setattr(attempt, f'{section}_band', new_band)
+            attempt.calculate_overall_band()
+            with_band.append(attempt)
+        elif raw_score != old_raw_score:
+            score_only.append(attempt)
+
+    with transaction.atomic():
+        answer_model.objects.bulk_update(changed, ['is_correct'], batch_size=BULK_UPDATE_BATCH_SIZE)
+        TestAttempt.objects.bulk_update(
+            score_only, [f'{section}_raw_score'], batch_size=BULK_UPDATE_BATCH_SIZE
+        )
+        TestAttempt.objects.bulk_update(
+            with_band,
+            [f'{section}_raw_score', f'{section}_max_score', f'{section}_band', 'overall_band'],
+            batch_size=BULK_UPDATE_BATCH_SIZE
+        )
+
+    return answers_count, len(changed), len(attempts)
+
+
+def rescore_test(test_id, sections=('listening', 'reading'), chunk_size=DEFAULT_CHUNK_SIZE,
+                 workers=0, progress=None):
+    """
+    Testning barcha attemptlarini qayta baholash.
+
+    workers=0 bo'lsa joriy process'da ishlaydi (admin/dashboard action uchun),
+    aks holda chunk'lar ProcessPoolExecutor ga tarqatiladi.
+    progress(section, stats) har bir chunk tugaganda chaqiriladi.
+    """
+    stats = {'attempts': 0, 'answers': 0, 'changed': 0, 'elapsed': 0.0}
+    started = time.monotonic()
+
+    def collect(section, result):
+        answers_count, changed_count, attempts_count = result
+        stats['answers'] += answers_count
+        stats['changed'] += changed_count
+        stats['attempts'] += attempts_count
+        stats['elapsed'] = time.monotonic() - started
+        if progress:
+            progress(section, stats)
+
+    for section in sections:
+        # queryset.update() kabi signalsiz o'zgarishlar bo'lgan bo'lishi mumkin
+        invalidate_answer_key(section, test_id)
+        chunks = iter_attempt_chunks(test_id, section, chunk_size)
+
+        if not workers:
+            for chunk in chunks:
+                collect(section, rescore_attempt_chunk(section, test_id, chunk))
+            continue
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'),
+                                 initializer=setup_django) as pool:
+            pending = set()
+            for chunk in chunks:
+                pending.add(pool.submit(run_rescore_chunk, section, test_id, chunk))
+                # Navbatni cheklash - xotira chunk'lar soniga bog'liq bo'lmasin
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(section, future.result())
+            for future in wait(pending).done:
+                collect(section, future.result())
+
+    stats['elapsed'] = time.monotonic() - started
+    return stats
@@ -0,0 +1,229 @@
+"""
+Avtomatik baholash (scoring) engine.
+
+Har bir test uchun answer key bir marta compile qilinadi va cache'da saqlanadi.
+Cache kaliti test kontent versiyasini (Test.updated_at) o'z ichiga oladi: savol
+o'zgarganda versiya DB da yangilanadi va barcha processlar (gunicorn workerlar,
+navbat workeri) yangi key ni compile qiladi. Eski key TTL bilan o'chib ketadi.
+"""
+import json
+import re
+from decimal import Decimal
+
+from django.core.cache import cache
+
+from app.models import ListeningQuestion, ReadingQuestion
+from app.services.content_version import get_content_version
+
+
+ANSWER_KEY_CACHE_TIMEOUT = 60 * 60 * 24
+
+# IELTS Academic Reading: raw score (40 tadan) -> band
+READING_BAND_TABLE = [
+    (39, Decimal('9.0')), (37, Decimal('8.5')), (35, Decimal('8.0')), (33, Decimal('7.5')),
+    (30, Decimal('7.0')), (27, Decimal('6.5')), (23, Decimal('6.0')), (19, Decimal('5.5')),
+    (15, Decimal('5.0')), (13, Decimal('4.5')), (10, Decimal('4.0')), (8, Decimal('3.5')),
+    (6, Decimal('3.0')), (4, Decimal('2.5')), (2, Decimal('2.0')), (1, Decimal('1.0')),
+]
+
+# IELTS Listening: raw score (40 tadan) -> band
+LISTENING_BAND_TABLE = [
+    (39, Decimal('9.0')), (37, Decimal('8.5')), (35, Decimal('8.0')), (32, Decimal('7.5')),
+    (30, Decimal('7.0')), (26, Decimal('6.5')), (23, Decimal('6.0')), (18, Decimal('5.5')),
+    (16, Decimal('5.0')), (13, Decimal('4.5')), (10, Decimal('4.0')), (8, Decimal('3.5')),
+    (6, Decimal('3.0')), (4, Decimal('2.5')), (2, Decimal('2.0')), (1, Decimal('1.0')),
+]
+
+BAND_TABLES = {
+    'listening': LISTENING_BAND_TABLE,
+    'reading': READING_BAND_TABLE,
+}
+
+# word_limit qaysi savol turlarida amal qiladi
+WORD_LIMIT_TYPES = ('completion', 'short_answer', 'table')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_OPTION_LETTER_RE = re.compile(r'^([a-z])(?:\)|\.|$)')
+_MATCHING_PAIR_RE = re.compile(r'\s*([^:=\-\s]+)\s*[:=\-]\s*([^,;]+)')
+
+_SYNONYMS = {
+    't': 'true', 'f': 'false', 'y': 'yes', 'n': 'no',
+    'ng': 'not given', 'notgiven': 'not given',
+}
+
+
+def _answer_key_cache_key(section, test_id, version):
+    # v2 - word_limit int ga keltirilgan (eski keylarda satr bo'lishi mumkin)
+    return f'answer_key:v2:{section}:{test_id}:{version}'
+
+
+def normalize_answer(value, question_type=None):
+    """Javobni solishtirish uchun normal holatga keltirish"""
+    if value is None:
+        return ''
+    text = _WHITESPACE_RE.sub(' ', str(value)).strip().lower().rstrip('.')
+
+    if question_type in ('true_false', 'yes_no'):
+        return _SYNONYMS.get(text.replace(' ', ''), text)
+
+    if question_type == 'multiple_choice':
+        match = _OPTION_LETTER_RE.match(text)
+        if match:
+            return match.group(1)
+
+    return text
+
+
+def parse_matching_answer(value):
+    """
+    Matching javobini dict ko'rinishiga keltirish.
+    Qabul qilinadi: '{"1": "C", "2": "A"}' yoki '1-C, 2-A' / '1:C; 2:A'
+    """
+    if isinstance(value, dict):
+        pairs = value
+    else:
+        try:
+            pairs = json.loads(value)
+        except (TypeError, ValueError):
+            pairs = dict(_MATCHING_PAIR_RE.findall(value or ''))
+        if not isinstance(pairs, dict):
+            return {}
+    return {str(k).strip(): normalize_answer(v) for k, v in pairs.items()}
+
+
+def _parse_word_limit(value):
+    """question_data erkin JSON - "2" ham kelishi mumkin. Noto'g'ri yoki musbat bo'lmagan qiymat - limit yo'q"""
+    if isinstance(value, bool):
+        return None
+    try:
+        word_limit = int(value)
+    except (TypeError, ValueError):
+        return None
+    return word_limit if word_limit > 0 else None
+
+
+def _compile_question(question_id, question_type, question_data, correct_answer, points):
+    """Bitta savol uchun compiled answer key"""
+    word_limit = None
+    if isinstance(question_data, dict) and question_type in WORD_LIMIT_TYPES:
+        word_limit = _parse_word_limit(question_data.get('word_limit'))
+
+    if correct_answer in (None, '', [], {}):
+        accepted = None
+    elif question_type == 'matching' and isinstance(correct_answer, dict):
+        accepted = parse_matching_answer(correct_answer)
+    else:
+        alternates = correct_answer if isinstance(correct_answer, list) else [correct_answer]
+        accepted = sorted({normalize_answer(a, question_type) for a in alternates})
+
+    return {
+        'id': question_id,
+        'type': question_type,
+        'accepted': accepted,
+        'word_limit': word_limit,
+        'points': points,
+    }
+
+
+def compile_reading_answer_key(test_id):
+    """Reading answer key ni bitta query bilan yig'ish"""
+    rows = ReadingQuestion.objects.filter(
+        passage__test_id=test_id
+    ).values_list(
+        'id', 'question_number', 'question_type', 'question_data', 'correct_answer', 'points'
+    )
+    return _build_answer_key(rows)
+
+
+def compile_listening_answer_key(test_id):
+    """Listening answer key ni bitta query bilan yig'ish"""
+    rows = ListeningQuestion.objects.filter(
+        section__test_id=test_id
+    ).values_list(
+        'id', 'question_number', 'question_type', 'question_data', 'correct_answer', 'points'
+    )
+    return _build_answer_key(rows)
+
+
+def _build_answer_key(rows):
+    questions = {}
+    for question_id, number, question_type, question_data, correct_answer, points in rows:
+        questions[str(number)] = _compile_question(
+            question_id, question_type, question_data, correct_answer, points
+        )
+
+    return {
+        'questions': questions,
+        'by_id': {entry['id']: entry for entry in questions.values()},
+        'max_score': sum(entry['points'] for entry in questions.values()),
+        'is_complete': all(entry['accepted'] is not None for entry in questions.values()),
+    }
+
+
+ANSWER_KEY_COMPILERS = {
+    'listening': compile_listening_answer_key,
+    'reading': compile_reading_answer_key,
+}
+
+
+def get_answer_key(section, test_id):
+    """Compiled answer key (joriy kontent versiyasi uchun cache'dan yoki yangidan)"""
+    key = _answer_key_cache_key(section, test_id, get_content_version(test_id))
+    answer_key = cache.get(key)
+    if answer_key is None:
+        answer_key = ANSWER_KEY_COMPILERS[section](test_id)
+        cache.set(key, answer_key, ANSWER_KEY_CACHE_TIMEOUT)
+    return answer_key
+
+
+def invalidate_answer_key(section, test_id):
+    """
+    Joriy versiyadagi key ni o'chirish. Kontent o'zgarganda versiya o'zi
+    o'zgaradi - bu signalsiz o'zgarishlar (queryset.update) uchun.
+    """
+    cache.delete(_answer_key_cache_key(section, test_id, get_content_version(test_id)))
+
+
+def check_answer(entry, user_answer):
+    """
+    Bitta javobni tekshirish.
+    Answer key bo'lmasa None qaytaradi (teacher tekshiradi).
+    """
+    accepted = entry['accepted']
+    if accepted is None:
+        return None
+
+    if entry['type'] == 'matching' and isinstance(accepted, dict):
+        return parse_matching_answer(user_answer) == accepted
+
+    if entry['word_limit'] and len((user_answer or '').split()) > entry['word_limit']:
+        return False
+
+    return normalize_answer(user_answer, entry['type']) in accepted
+
+
+def score_answers(answers, answer_key):
+    """
+    Javoblarni bitta o'tishda baholash.
+    Har bir answer.is_correct ni belgilaydi va raw score ni qaytaradi.
+    """
+    by_id = answer_key['by_id']
+    raw_score = 0
+    for answer in answers:
+        entry = by_id.get(answer.question_id)
+        answer.is_correct = check_answer(entry, answer.user_answer) if entry else None
+        if answer.is_correct:
+            raw_score += entry['points']
+    return raw_score
+
+
+def raw_score_to_band(section, raw_score, max_score):
+    """Raw score ni IELTS band ga o'girish (40 tadan boshqa testlar proporsional)"""
+    if raw_score is None or not max_score:
+        return None
+
+    scaled = round(raw_score * 40 / max_score)
+    for threshold, band in BAND_TABLES[section]:
+        if scaled >= threshold:
+            return band
+    return Decimal('0.0')
@@ -0,0 +1,334 @@
+"""
+Listening/Reading/Writing submit logikasi.
+
+View'lar (sinxron rejim) va navbat worker'i (process_submissions buyrug'i)
+bir xil funksiyalardan foydalanadi. Rad etilgan submit SubmissionError
+ko'taradi - xabar foydalanuvchiga ko'rsatiladi.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from app.models import (
+    TestAttempt, ListeningAnswer, ReadingAnswer, WritingSubmission, WritingTask, SubmissionIntake
+)
+from app.services.scoring import get_answer_key, score_answers, raw_score_to_band
+from app.services.drafts import seal_drafts
+from app.services.exam_clock import stop_section_clock
+
+
+logger = logging.getLogger(__name__)
+
+INTAKE_STALE_SECONDS = 10 * 60
+# Ishlab turgan workerlar ham yiqilgan worker yozuvlarini vaqti-vaqti bilan qaytaradi
+INTAKE_REQUEUE_INTERVAL = 60
+
+
+class SubmissionError(Exception):
+    """Submit rad etildi"""
+
+
+def check_and_complete_attempt(attempt):
+    """Barcha sectionlar submitted bo'lsa, avtomatik completed qilish"""
+    if attempt.all_sections_submitted():
+        if attempt.status != 'completed':
+            attempt.mark_completed()
+            return True
+    return False
+
+
+def _get_attempt_for_submit(user, test_id, section):
+    """Attemptni lock bilan olish - bir vaqtdagi ikki submit bir-birini kutadi"""
+    try:
+        attempt = TestAttempt.objects.select_for_update().get(user=user, test_id=test_id)
+    except TestAttempt.DoesNotExist:
+        raise SubmissionError(f'Avval /{section}/start/ ni chaqiring')
+
+    # ✅ Allaqachon submitted bo'lsa, REJECT
+    if getattr(attempt, f'{section}_submitted'):
+        raise SubmissionError(
+            f'{section.capitalize()} allaqachon topshirilgan. Qayta yuborib bo\'lmaydi'
+        )
+
+    # Test completed bo'lsa
+    if attempt.status == 'completed':
+        raise SubmissionError('Test allaqachon tugallangan')
+
+    return attempt
+
+
+def upsert_answers(model, attempt, rows, key_field, update_fields):
+    """
+    Javoblarni (attempt, key_field) bo'yicha bitta upsert bilan saqlash.
+    Faqat bu safar yuborilmagan savollar o'chiriladi. (upserted, deleted) qaytaradi.
+    """
+    if rows:
+        model.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['attempt', key_field],
+            update_fields=update_fields
+        )
+
+    kept_ids = [getattr(row, f'{key_field}_id') for row in rows]
+    deleted, _ = model.objects.filter(attempt=attempt).exclude(**{f'{key_field}_id__in': kept_ids}).delete()
+    return len(rows), deleted
+
+
+def _submit_scored_section(user, test_id, section, answer_model, answers, time_spent):
+    """Listening va Reading uchun umumiy submit"""
+    attempt = _get_attempt_for_submit(user, test_id, section)
+
+    # Autosave qoralamalarini muhrlash (oxirgi delta bilan birlashtirish)
+    answers = seal_drafts(attempt.id, section, answers)
+    if not answers:
+        raise SubmissionError('Kamida 1 ta javob kerak')
+
+    # Compiled answer key (cache'dan) - savollar uchun alohida query yo'q
+    answer_key = get_answer_key(section, test_id)
+    question_map = answer_key['questions']
+    total_questions = len(question_map)
+
+    # Javoblarni saqlash
+    answers_to_create = []
+    for q_number_str, user_answer in answers.items():
+        entry = question_map.get(q_number_str)
+        if entry:
+            answers_to_create.append(
+                answer_model(
+                    attempt=attempt,
+                    question_id=entry['id'],
+                    user_answer=user_answer.strip()
+                )
+            )
+
+    # Avtomatik baholash (bitta o'tishda)
+    raw_score = score_answers(answers_to_create, answer_key)
+
+    # Upsert - o'zgarmagan qatorlar o'chirilib qayta yozilmaydi
+    upsert_answers(
+        answer_model, attempt, answers_to_create, 'question',
+        update_fields=['user_answer', 'is_correct', 'answered_at']
+    )
+
+    # ✅ Section ni submitted qilish
+    setattr(attempt, f'{section}_submitted', True)
+    setattr(attempt, f'{section}_submitted_at', timezone.now())
+    setattr(attempt, f'{section}_raw_score', raw_score)
+    # max_score - qayta baholashda band qo'lda qo'yilganini aniqlash uchun
+    setattr(attempt, f'{section}_max_score', answer_key['max_score'])
+    if answer_key['is_complete']:
+        setattr(attempt, f'{section}_band', raw_score_to_band(section, raw_score, answer_key['max_score']))
+        attempt.calculate_overall_band()
+    attempt.save(update_fields=[
+        f'{section}_submitted', f'{section}_submitted_at',
+        f'{section}_raw_score', f'{section}_max_score', f'{section}_band', 'overall_band'
+    ])
+
+    transaction.on_commit(lambda: stop_section_clock(attempt.id, section))
+
+    # Barcha sectionlar submitted bo'lsa, completed qilish
+    auto_completed = check_and_complete_attempt(attempt)
+
+    response_data = {
+        'message': f'{section.capitalize()} muvaffaqiyatli topshirildi',
+        'attempt_id': attempt.id,
+        'status': attempt.status,
+        f'{section}_submitted': True,
+        'auto_completed': auto_completed,
+        'total_questions': total_questions,
+        'answered_questions': len(answers_to_create),
+        'time_spent': time_spent,
+        'raw_score': raw_score,
+        'band': getattr(attempt, f'{section}_band'),
+    }
+
+    # Warning
+    unanswered = total_questions - len(answers_to_create)
+    if unanswered > 0:
+        response_data['warning'] = f"{unanswered} ta savol bo'sh qoldi"
+
+    return response_data
+
+
+@transaction.atomic
+def submit_listening(user, test_id, answers, time_spent):
+    return _submit_scored_section(user, test_id, 'listening', ListeningAnswer, answers, time_spent)
+
+
+@transaction.atomic
+def submit_reading(user, test_id, answers, time_spent):
+    return _submit_scored_section(user, test_id, 'reading', ReadingAnswer, answers, time_spent)
+
+
+@transaction.atomic
+def submit_writing(user, test_id, time_spent, task1_text='', task2_text=''):
+    attempt = _get_attempt_for_submit(user, test_id, 'writing')
+
+    task1_text = task1_text.strip()
+    task2_text = task2_text.strip()
+
+    # Tasklarni olish
+    tasks = list(WritingTask.objects.filter(test_id=test_id).order_by('task_number'))
+    if len(tasks) < 2:
+        raise SubmissionError('Bu testda 2 ta writing task yo\'q')
+
+    # Bo'sh bo'lmagan tasklar (bulk_create save() ni chaqirmaydi - word count shu yerda)
+    submissions = {}
+    for task, text in ((tasks[0], task1_text), (tasks[1], task2_text)):
+        if text:
+            submissions[task.task_number] = WritingSubmission(
+                attempt=attempt,
+                task=task,
+                submission_text=text,
+                word_count=len(text.split()),
+                time_spent=time_spent
+            )
+
+    upsert_answers(
+        WritingSubmission, attempt, list(submissions.values()), 'task',
+        update_fields=['submission_text', 'word_count', 'time_spent', 'submitted_at']
+    )
+
+    task1_submission = submissions.get(tasks[0].task_number)
+    task2_submission = submissions.get(tasks[1].task_number)
+
+    # ✅ Writing ni submitted qilish
+    attempt.writing_submitted = True
+    attempt.writing_submitted_at = timezone.now()
+    attempt.save(update_fields=['writing_submitted', 'writing_submitted_at'])
+    transaction.on_commit(lambda: stop_section_clock(attempt.id, 'writing'))
+
+    # Auto complete
+    auto_completed = check_and_complete_attempt(attempt)
+
+    response_data = {
+        'message': 'Writing muvaffaqiyatli topshirildi',
+        'attempt_id': attempt.id,
+        'status': attempt.status,
+        'writing_submitted': True,
+        'auto_completed': auto_completed,
+        'task1_word_count': task1_submission.word_count if task1_submission else 0,
+        'task2_word_count': task2_submission.word_count if task2_submission else 0,
+        'time_spent': time_spent,
+    }
+
+    warnings = []
+    if not task1_text:
+        warnings.append("Task 1 bo'sh")
+    if not task2_text:
+        warnings.append("Task 2 bo'sh")
+    if warnings:
+        response_data['warning'] = ", ".join(warnings)
+
+    return response_data
+
+
+SUBMIT_HANDLERS = {
+    'listening': submit_listening,
+    'reading': submit_reading,
+    'writing': submit_writing,
+}
+
+
+# ==================== SUBMISSION INTAKE (NAVBAT) ====================
+def enqueue_submission(user, test_id, section, payload):
+    """Submitni navbatga yozish - HTTP javob darhol qaytadi (202)"""
+    return SubmissionIntake.objects.create(
+        user=user,
+        test_id=test_id,
+        section=section,
+        payload=payload,
+    )
+
+
+def requeue_stale_intakes():
+    """Worker yiqilib qolgan 'processing' yozuvlarni navbatga qaytarish"""
+    cutoff = timezone.now() - timezone.timedelta(seconds=INTAKE_STALE_SECONDS)
+    return SubmissionIntake.objects.filter(
+        status='processing', claimed_at__lt=cutoff
+    ).update(status='pending', claimed_at=None)
+
+
+def claim_intake_batch(batch_size):
+    """Navbatdan eng eski yozuvlarni olish (boshqa worker olganlarini o'tkazib yuborib)"""
+    with transaction.atomic():
+        intakes = list(
+            SubmissionIntake.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_run_at__lte=timezone.now())
+            .select_related('user')
+            .order_by('id')[:batch_size]
+        )
+        if intakes:
+            SubmissionIntake.objects.filter(
+                id__in=[intake.id for intake in intakes]
+            ).update(status='processing', claimed_at=timezone.now())
+    return intakes
+
+
+def retry_delay(attempts):
+    """Eksponensial kutish: 30s, 60s, 120s ... (SUBMISSION_INTAKE_RETRY_MAX_DELAY gacha)"""
+    return min(
+        settings.SUBMISSION_INTAKE_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.SUBMISSION_INTAKE_RETRY_MAX_DELAY,
+    )
+
+
+def process_intake(intake):
+    """
+    Bitta navbat yozuvini mavjud submit logikasi bilan qayta ishlash.
+    SubmissionError - yakuniy rad (failed). Boshqa xatoliklar (masalan DB uzilishi)
+    vaqtinchalik deb hisoblanadi: yozuv kechiktirilib navbatga qaytadi va faqat
+    SUBMISSION_INTAKE_MAX_ATTEMPTS urinishdan keyin failed bo'ladi.
+    """
+    handler = SUBMIT_HANDLERS[intake.section]
+    intake.attempts += 1
+    try:
+        intake.result = handler(intake.user, intake.test_id, **intake.payload)
+        intake.status = 'done'
+        intake.error = ''
+    except SubmissionError as e:
+        intake.status = 'failed'
+        intake.error = str(e)
+    except Exception as e:
+        logger.exception('Submission intake %s failed (attempt %s)', intake.id, intake.attempts)
+        # Uzilgan ulanish bo'lsa - holatni yangi ulanish bilan saqlash uchun
+        close_old_connections()
+        intake.error = f'Ichki xatolik: {e}'
+        if intake.attempts < settings.SUBMISSION_INTAKE_MAX_ATTEMPTS:
+            intake.status = 'pending'
+            intake.claimed_at = None
+            intake.next_run_at = timezone.now() + timezone.timedelta(seconds=retry_delay(intake.attempts))
+            intake.save(update_fields=['status', 'error', 'attempts', 'claimed_at', 'next_run_at'])
+            return intake
+        intake.status = 'failed'
+
+    intake.processed_at = timezone.now()
+    intake.save(update_fields=['status', 'result', 'error', 'attempts', 'processed_at'])
+    return intake
+
+
+def process_intake_queue(batch_size=20, poll_interval=1.0, once=False):
+    """Navbatni tartib bilan bo'shatish. once=True - navbat bo'shagach to'xtash"""
+    processed = 0
+    next_requeue = 0
+    while True:
+        if time.monotonic() >= next_requeue:
+            requeued = requeue_stale_intakes()
+            if requeued:
+                logger.warning('%s stale submission intakes requeued', requeued)
+            next_requeue = time.monotonic() + INTAKE_REQUEUE_INTERVAL
+
+        intakes = claim_intake_batch(batch_size)
+        if not intakes:
+            if once:
+                return processed
+            time.sleep(poll_interval)
+            continue
+
+        for intake in intakes:
+            process_intake(intake)
+            processed += 1
@@ -0,0 +1,497 @@
+"""
+Test paketi - butun test bitta zip arxivda (manifest.json + media).
+
+Export: arxiv oqim (stream) ko'rinishida yaratiladi - media fayllar
+bo'laklab o'qiladi va darhol yuboriladi, xotirada to'liq saqlanmaydi.
+
+Import: avval manifest va barcha media havolalari tekshiriladi, keyin test
+bitta transaction ichida bulk insert bilan yaratiladi. Media fayllar arxivdan
+storage'ga oqim bilan ko'chiriladi; xatolik bo'lsa saqlangan fayllar o'chiriladi.
+
+Arxiv tuzilishi:
+    manifest.json
+    media/listening/audios/section1.mp3
+    media/listening/questions/map.png
+    media/writing/charts/chart.png
+"""
+import json
+import os
+import posixpath
+import time
+import zipfile
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError as DRFValidationError
+
+from app.models import Test, ListeningSection, ListeningQuestion, ReadingPassage, ReadingQuestion, WritingTask
+from app.services.test_summary import refresh_test_summary
+from app.services.media_storage import sync_media_refs_on_commit
+from app.services.audio_variants import schedule_audio_variants
+from app.services.exam_clock import refresh_time_limits
+
+
+PACKAGE_FORMAT = 'mock-test-package'
+PACKAGE_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+MEDIA_PREFIX = 'media/'
+
+MAX_MANIFEST_SIZE = 5 * 1024 * 1024
+MAX_MEDIA_SIZE = 300 * 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class PackageError(Exception):
+    """Paket noto'g'ri - errors ro'yxatida barcha topilgan xatolar"""
+
+    def __init__(self, errors):
+        if isinstance(errors, str):
+            errors = [errors]
+        self.errors = errors
+        super().__init__('; '.join(errors))
+
+
+# ==================== EXPORT ====================
+def export_queryset():
+    return Test.objects.prefetch_related(
+        Prefetch(
+            'listening_sections',
+            queryset=ListeningSection.objects.order_by('section_number').prefetch_related(
+                Prefetch('questions', queryset=ListeningQuestion.objects.order_by('question_number'))
+            )
+        ),
+        Prefetch(
+            'reading_passages',
+            queryset=ReadingPassage.objects.order_by('passage_number').prefetch_related(
+                Prefetch('questions', queryset=ReadingQuestion.objects.order_by('question_number'))
+            )
+        ),
+        Prefetch('writing_tasks', queryset=WritingTask.objects.order_by('task_number')),
+    )
+
+
+def _media_ref(field_file, media):
+    """Fayl arxivga qo'shiladi, manifestda uning arxivdagi yo'li yoziladi"""
+    if not field_file:
+        return None
+    arcname = MEDIA_PREFIX + field_file.name
+    media[arcname] = field_file
+    return arcname
+
+
+def build_manifest(test):
+    """(manifest, media) - media: {arxivdagi nom: FieldFile}"""
+    media = {}
+    manifest = {
+        'format': PACKAGE_FORMAT,
+        'version': PACKAGE_VERSION,
+        'test': {
+            'title': test.title,
+            'description': test.description,
+            'difficulty_level': test.difficulty_level,
+        },
+        'listening_sections': [
+            {
+                'section_number': section.section_number,
+                'audio_file': _media_ref(section.audio_file, media),
+                'audio_duration': section.audio_duration,
+                'instructions': section.instructions,
+                'questions': [
+                    {
+                        'question_number': question.question_number,
+                        'question_text': question.question_text,
+                        'question_type': question.question_type,
+                        'question_data': question.question_data,
+                        'question_image': _media_ref(question.question_image, media),
+                        'correct_answer': question.correct_answer,
+                        'points': question.points,
+                    }
+                    for question in section.questions.all()
+                ],
+            }
+            for section in test.listening_sections.all()
+        ],
+        'reading_passages': [
+            {
+                'passage_number': passage.passage_number,
+                'title': passage.title,
+                'passage_text': passage.passage_text,
+                'questions': [
+                    {
+                        'question_number': question.question_number,
+                        'question_text': question.question_text,
+                        'question_type': question.question_type,
+                        'question_data': question.question_data,
+                        'correct_answer': question.correct_answer,
+                        'points': question.points,
+                    }
+                    for question in passage.questions.all()
+                ],
+            }
+            for passage in test.reading_passages.all()
+        ],
+        'writing_tasks': [
+            {
+                'task_number': task.task_number,
+                'task_type': task.task_type,
+                'prompt_text': task.prompt_text,
+                'image': _media_ref(task.image, media),
+                'instructions': task.instructions,
+                'word_limit': task.word_limit,
+                'time_suggestion': task.time_suggestion,
+            }
+            for task in test.writing_tasks.all()
+        ],
+    }
+    return manifest, media
+
+
+class _ZipStream:
+    """
+    zipfile uchun seek qilinmaydigan yozish buferi.
+    Yozilgan baytlar drain() orqali olinib, darhol clientga yuboriladi.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_test_package(test_id):
+    """Zip arxivni bo'laklab qaytaruvchi generator (StreamingHttpResponse uchun)"""
+    test = export_queryset().get(pk=test_id)
+    manifest, media = build_manifest(test)
+
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, mode='w') as archive:
+        archive.writestr(
+            MANIFEST_NAME,
+            json.dumps(manifest, ensure_ascii=False, indent=2),
+            compress_type=zipfile.ZIP_DEFLATED
+        )
+        yield stream.drain()
+
+        for arcname, field_file in media.items():
+            # Audio/rasmlar allaqachon siqilgan - qayta siqilmaydi
+            info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_STORED
+            with field_file.storage.open(field_file.name, 'rb') as source, \
+                    archive.open(info, mode='w', force_zip64=True) as target:
+                for chunk in iter(lambda: source.read(STREAM_CHUNK_SIZE), b''):
+                    target.write(chunk)
+                    data = stream.drain()
+                    if data:
+                        yield data
+
+    yield stream.drain()
+
+
+def export_filename(test):
+    return f'test-{test.id}.zip'
+
+
+# ==================== IMPORT ====================
+def read_manifest(archive):
+    try:
+        info = archive.getinfo(MANIFEST_NAME)
+    except KeyError:
+        raise PackageError(f'{MANIFEST_NAME} topilmadi')
+    if info.file_size > MAX_MANIFEST_SIZE:
+        raise PackageError(f'{MANIFEST_NAME} juda katta')
+
+    try:
+        manifest = json.loads(archive.read(info).decode('utf-8'))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise PackageError(f"{MANIFEST_NAME} o'qilmadi: {e}")
+
+    if not isinstance(manifest, dict) or manifest.get('format') != PACKAGE_FORMAT:
+        raise PackageError("Noma'lum paket formati")
+    if manifest.get('version') != PACKAGE_VERSION:
+        raise PackageError(f"Paket versiyasi qo'llab-quvvatlanmaydi: {manifest.get('version')}")
+    return manifest
+
+
+def _validation_messages(error):
+    if isinstance(error, DjangoValidationError):
+        if hasattr(error, 'message_dict'):
+            return [f'{field}: {", ".join(messages)}' for field, messages in error.message_dict.items()]
+        return list(error.messages)
+    return [str(error.detail)]
+
+
+def _check_instance(instance, label, errors, exclude):
+    """Model validatsiyasi (clean_fields + clean) - saqlashdan oldin"""
+    try:
+        instance.clean_fields(exclude=exclude)
+        instance.clean()
+    except (DjangoValidationError, DRFValidationError) as e:
+        errors.extend(f'{label}: {message}' for message in _validation_messages(e))
+
+
+def _check_media(ref, label, archive_names, archive, errors, required=False):
+    if not ref:
+        if required:
+            errors.append(f'{label}: media fayl majburiy')
+        return
+    if not isinstance(ref, str) or ref not in archive_names:
+        errors.append(f'{label}: arxivda {ref!r} topilmadi')
+        return
+    if archive.getinfo(ref).file_size > MAX_MEDIA_SIZE:
+        errors.append(f'{label}: {ref} juda katta')
+
+
+def _numbered(items, key):
+    """Raqam berilmagan elementlarga ketma-ket raqam (MAX query o'rniga)"""
+    used = {item.get(key) for item in items if item.get(key) is not None}
+    next_number = 1
+    for item in items:
+        if item.get(key) is None:
+            while next_number in used:
+                next_number += 1
+            item[key] = next_number
+            used.add(next_number)
+    return items
+
+
+def _require_list(container, key, label, errors):
+    value = container.get(key, [])
+    if not isinstance(value, list) or not all(isinstance(item, dict) for item in value):
+        errors.append(f'{label}: {key} obyektlar listi bo\'lishi kerak')
+        return []
+    return value
+
+
+def build_test_objects(manifest, archive):
+    """
+    Manifestdan saqlanmagan model obyektlarini yaratish va hammasini tekshirish.
+    Birorta xato bo'lsa PackageError (barcha xatolar bilan).
+    """
+    errors = []
+    archive_names = set(archive.namelist())
+
+    test_data = manifest.get('test')
+    if not isinstance(test_data, dict):
+        raise PackageError('test obyekti topilmadi')
+
+    test = Test(
+        title=test_data.get('title') or '',
+        description=test_data.get('description') or '',
+        difficulty_level=test_data.get('difficulty_level') or 'intermediate',
+        is_published=False,
+    )
+    _check_instance(test, 'test', errors, exclude=['created_by'])
+
+    # Listening
+    listening = []
+    sections_data = _numbered(_require_list(manifest, 'listening_sections', 'manifest', errors), 'section_number')
+    for section_data in sections_data:
+        label = f"listening section {section_data['section_number']}"
+        _check_media(section_data.get('audio_file'), label, archive_names, archive, errors, required=True)
+        section = ListeningSection(
+            section_number=section_data['section_number'],
+            audio_file=section_data.get('audio_file') or '',
+            audio_duration=section_data.get('audio_duration'),
+            instructions=section_data.get('instructions') or '',
+        )
+        _check_instance(section, label, errors, exclude=['test', 'audio_file'])
+
+        questions = []
+        for question_data in _numbered(_require_list(section_data, 'questions', label, errors), 'question_number'):
+            q_label = f"{label} Q{question_data['question_number']}"
+            _check_media(question_data.get('question_image'), q_label, archive_names, archive, errors)
+            question = ListeningQuestion(
+                question_number=question_data['question_number'],
+                question_text=question_data.get('question_text') or '',
+                question_type=question_data.get('question_type') or '',
+                question_data=question_data.get('question_data'),
+                question_image=question_data.get('question_image') or None,
+                correct_answer=question_data.get('correct_answer'),
+                points=question_data.get('points', 1),
+            )
+            _check_instance(question, q_label, errors, exclude=['section', 'question_image'])
+            questions.append(question)
+        listening.append((section, questions))
+
+    # Reading
+    reading = []
+    passages_data = _numbered(_require_list(manifest, 'reading_passages', 'manifest', errors), 'passage_number')
+    for passage_data in passages_data:
+        label = f"reading passage {passage_data['passage_number']}"
+        passage_text = passage_data.get('passage_text') or ''
+        passage = ReadingPassage(
+            passage_number=passage_data['passage_number'],
+            title=passage_data.get('title') or '',
+            passage_text=passage_text,
+            word_count=len(passage_text.split()),
+        )
+        _check_instance(passage, label, errors, exclude=['test'])
+
+        questions = []
+        for question_data in _numbered(_require_list(passage_data, 'questions', label, errors), 'question_number'):
+            q_label = f"{label} Q{question_data['question_number']}"
+            question = ReadingQuestion(
+                question_number=question_data['question_number'],
+                question_text=question_data.get('question_text') or '',
+                question_type=question_data.get('question_type') or '',
+                question_data=question_data.get('question_data'),
+                correct_answer=question_data.get('correct_answer'),
+                points=question_data.get('points', 1),
+            )
+            _check_instance(question, q_label, errors, exclude=['passage'])
+            questions.append(question)
+        reading.append((passage, questions))
+
+    # Writing
+    writing = []
+    for task_data in _numbered(_require_list(manifest, 'writing_tasks', 'manifest', errors), 'task_number'):
+        label = f"writing task {task_data['task_number']}"
+        _check_media(task_data.get('image'), label, archive_names, archive, errors)
+        task = WritingTask(
+            task_number=task_data['task_number'],
+            task_type=task_data.get('task_type') or '',
+            prompt_text=task_data.get('prompt_text') or '',
+            image=task_data.get('image') or None,
+            instructions=task_data.get('instructions') or '',
+            word_limit=task_data.get('word_limit'),
+            time_suggestion=task_data.get('time_suggestion'),
+        )
+        _check_instance(task, label, errors, exclude=['test', 'image'])
+        writing.append(task)
+
+    # Unique raqamlar (unique_together) - bazaga yetib bormasdan
+    for label, numbers in [
+        ('listening section', [section.section_number for section, _ in listening]),
+        ('reading passage', [passage.passage_number for passage, _ in reading]),
+        ('writing task', [task.task_number for task in writing]),
+    ] + [
+        (f'listening section {section.section_number} savol', [q.question_number for q in questions])
+        for section, questions in listening
+    ] + [
+        (f'reading passage {passage.passage_number} savol', [q.question_number for q in questions])
+        for passage, questions in reading
+    ]:
+        duplicates = sorted({number for number in numbers if numbers.count(number) > 1})
+        if duplicates:
+            errors.append(f"{label}: takrorlangan raqamlar {duplicates}")
+
+    if errors:
+        raise PackageError(errors)
+
+    return test, listening, reading, writing
+
+
+def schedule_test_followups_on_commit(test_id, section_ids):
+    """
+    bulk_create signal yubormaydi - signallar qiladigan ishlar commit dan keyin:
+    section audiolari uchun variantlar navbati va testning vaqt limitlari.
+    """
+    section_ids = list(section_ids)
+
+    def run():
+        for section_id in section_ids:
+            schedule_audio_variants(section_id)
+        refresh_time_limits(test_id)
+
+    transaction.on_commit(run)
+
+
+def _store_media(archive, ref, field, saved):
+    """Arxivdagi faylni storage'ga oqim bilan ko'chirish, saqlangan nomni qaytarish"""
+    basename = posixpath.basename(ref)
+    name = os.path.join(field.upload_to, basename)
+    with archive.open(ref) as source:
+        stored = field.storage.save(name, File(source, name=basename))
+    saved.append((field.storage, stored))
+    return stored
+
+
+def import_test_package(fileobj, user=None):
+    """
+    Zip paketdan yangi test yaratish (nashr qilinmagan holda).
+    fileobj - seek qilinadigan fayl (yuklangan fayl yoki ochilgan path).
+    """
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        raise PackageError("Fayl zip arxiv emas")
+
+    with archive:
+        manifest = read_manifest(archive)
+        test, listening, reading, writing = build_test_objects(manifest, archive)
+
+        saved_files = []
+        try:
+            with transaction.atomic():
+                test.created_by = user
+                test.save()
+
+                # Media fayllar - FieldFile nomlari arxivdan ko'chirilgan fayllarga almashtiriladi
+                for section, questions in listening:
+                    section.test = test
+                    section.audio_file = _store_media(
+                        archive, section.audio_file.name, ListeningSection._meta.get_field('audio_file'), saved_files
+                    )
+                    for question in questions:
+                        if question.question_image:
+                            question.question_image = _store_media(
+                                archive, question.question_image.name,
+                                ListeningQuestion._meta.get_field('question_image'), saved_files
+                            )
+                for task in writing:
+                    task.test = test
+                    if task.image:
+                        task.image = _store_media(
+                            archive, task.image.name, WritingTask._meta.get_field('image'), saved_files
+                        )
+                for passage, _ in reading:
+                    passage.test = test
+
+                # Bulk insert - savol raqamlari manifestdan (save() dagi MAX query yo'q)
+                ListeningSection.objects.bulk_create([section for section, _ in listening])
+                ReadingPassage.objects.bulk_create([passage for passage, _ in reading])
+                WritingTask.objects.bulk_create(writing)
+
+                listening_questions = []
+                for section, questions in listening:
+                    for question in questions:
+                        question.section = section
+                        listening_questions.append(question)
+                ListeningQuestion.objects.bulk_create(listening_questions)
+
+                reading_questions = []
+                for passage, questions in reading:
+                    for question in questions:
+                        question.passage = passage
+                        reading_questions.append(question)
+                ReadingQuestion.objects.bulk_create(reading_questions)
+
+                # bulk_create signal yubormaydi
+                refresh_test_summary(test.id)
+                sync_media_refs_on_commit(name for _, name in saved_files)
+                schedule_test_followups_on_commit(test.id, [section.pk for section, _ in listening])
+        except Exception:
+            for storage, name in saved_files:
+                # Content-addressed blob boshqa testda ham ishlatilgan bo'lishi mumkin - gc_media o'chiradi
+                if not getattr(storage, 'is_blob', lambda name: False)(name):
+                    storage.delete(name)
+            raise
+
+    return test
@@ -0,0 +1,86 @@
+"""
+TestSummary ni yangilab borish.
+
+Yangi qator / o'chirish - F() delta bilan bitta UPDATE (bulk muallifligida ham arzon).
+Mavjud qator o'zgarsa (points, audio_duration, boshqa sectionga ko'chirish) -
+test bo'yicha qayta hisoblash. Qayta hisoblash summary qatorini bloklaydi,
+shuning uchun parallel delta yo'qolmaydi.
+bulk_create / queryset.update() signal yubormaydi - u yerda refresh_test_summary chaqiriladi.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from app.models import (
+    Test, TestSummary, ListeningSection, ListeningQuestion, ReadingPassage, ReadingQuestion, WritingTask
+)
+
+
+def compute_test_summary(test_id):
+    """Summary maydonlari - bazadan qayta hisoblangan"""
+    sections = ListeningSection.objects.filter(test_id=test_id).aggregate(
+        count=Count('pk'), duration=Coalesce(Sum('audio_duration'), 0)
+    )
+    listening = ListeningQuestion.objects.filter(section__test_id=test_id).aggregate(
+        count=Count('pk'), points=Coalesce(Sum('points'), 0)
+    )
+    reading = ReadingQuestion.objects.filter(passage__test_id=test_id).aggregate(
+        count=Count('pk'), points=Coalesce(Sum('points'), 0)
+    )
+    return {
+        'listening_sections': sections['count'],
+        'listening_questions': listening['count'],
+        'reading_passages': ReadingPassage.objects.filter(test_id=test_id).count(),
+        'reading_questions': reading['count'],
+        'writing_tasks': WritingTask.objects.filter(test_id=test_id).count(),
+        'audio_duration': sections['duration'],
+        'total_points': listening['points'] + reading['points'],
+    }
+
+
+@transaction.atomic
+def refresh_test_summary(test_id):
+    """Summary ni to'liq qayta hisoblash (qator bo'lmasa yaratiladi)"""
+    if not Test.objects.filter(pk=test_id).exists():
+        return None
+    TestSummary.objects.get_or_create(test_id=test_id)
+    TestSummary.objects.select_for_update().filter(pk=test_id).values_list('pk', flat=True).get()
+
+    values = compute_test_summary(test_id)
+    TestSummary.objects.filter(pk=test_id).update(updated_at=timezone.now(), **values)
+    return values
+
+
+def apply_summary_delta(test_id, create_missing=True, **deltas):
+    """
+    Hisoblagichlarni +/- ga o'zgartirish: apply_summary_delta(1, listening_questions=1, total_points=2)
+    create_missing=False - o'chirishda (test cascade bilan o'chayotganda qator qayta yaratilmasin)
+    """
+    updated = TestSummary.objects.filter(pk=test_id).update(
+        updated_at=timezone.now(),
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+    if not updated and create_missing:
+        # Eski testlar uchun qator hali yo'q
+        refresh_test_summary(test_id)
+
+
+def get_test_summary(test):
+    """test.summary - qator bo'lmasa (eski testlar) hisoblab yaratiladi"""
+    try:
+        return test.summary
+    except TestSummary.DoesNotExist:
+        refresh_test_summary(test.pk)
+        return TestSummary.objects.get(pk=test.pk)
+
+
+def rebuild_test_summaries(test_ids=None):
+    """Barcha (yoki berilgan) testlar summary sini qayta hisoblash"""
+    if test_ids is None:
+        test_ids = Test.objects.values_list('pk', flat=True)
+    count = 0
+    for test_id in test_ids:
+        if refresh_test_summary(test_id) is not None:
+            count += 1
+    return count
@@ -0,0 +1,128 @@
+"""
+Test nusxalash va versiyalar.
+
+Nashr qilingan test muzlatiladi (Test.frozen_at) - uning section, savol,
+passage va tasklarini o'zgartirib bo'lmaydi, attemptlar aynan shu versiyaga
+bog'lanib qoladi. O'zgartirish uchun yangi versiya yaratiladi: butun test
+bulk insert bilan nusxalanadi, media fayllar esa qayta yuklanmaydi -
+yangi qatorlar o'sha fayl nomlariga ishora qiladi.
+
+Istisno: correct_answer tahriri (answer key xatosi) muzlatilgan testda ham
+ruxsat etiladi - keyin `rescore_test` bilan qayta baholanadi.
+"""
+from django.db import transaction
+from django.db.models import Max, Q
+
+from app.models import (
+    Test, ListeningSection, ListeningQuestion, ReadingPassage, ReadingQuestion, WritingTask, AudioVariant
+)
+from app.services.test_package import export_queryset, schedule_test_followups_on_commit
+from app.services.test_summary import refresh_test_summary
+from app.services.media_storage import instance_media_names, sync_media_refs_on_commit
+
+
+# Muzlatilgan testda ham o'zgartirish mumkin bo'lgan maydonlar
+EDITABLE_WHEN_FROZEN = {'correct_answer'}
+
+
+class FrozenTestError(Exception):
+    """Test nashr qilingan - kontentini o'zgartirib bo'lmaydi"""
+
+
+def frozen_test_ids(test_ids):
+    test_ids = {test_id for test_id in test_ids if test_id is not None}
+    if not test_ids:
+        return set()
+    return set(
+        Test.objects.filter(pk__in=test_ids, frozen_at__isnull=False).values_list('pk', flat=True)
+    )
+
+
+def ensure_test_editable(test_id, changed_fields=None):
+    """changed_fields faqat EDITABLE_WHEN_FROZEN dan iborat bo'lsa - muzlatilgan testda ham ruxsat"""
+    if changed_fields is not None and set(changed_fields) <= EDITABLE_WHEN_FROZEN:
+        return
+    if frozen_test_ids([test_id]):
+        raise FrozenTestError(
+            f"Test {test_id} nashr qilingan va muzlatilgan. O'zgartirish uchun yangi versiya yarating"
+        )
+
+
+def _copy(instance, **overrides):
+    """Saqlanmagan nusxa - FileField lar shu fayl nomini saqlaydi (qayta yuklanmaydi)"""
+    values = {
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+        if not field.primary_key and not field.generated
+    }
+    values.update(overrides)
+    return type(instance)(**values)
+
+
+@transaction.atomic
+def clone_test(test_id, user=None, as_version=False):
+    """
+    Testni barcha kontenti bilan nusxalash (bulk insert).
+
+    as_version=True - shu testning yangi versiyasi (parent = asl test, version + 1),
+    aks holda mustaqil nusxa.
+    Natija har doim nashr qilinmagan (tahrirlanadigan) test.
+    """
+    source = export_queryset().get(pk=test_id)
+
+    if as_version:
+        root_id = source.parent_id or source.id
+        # Bir vaqtda ikkita versiya bir xil raqam olmasligi uchun asl test bloklanadi
+        Test.objects.select_for_update().filter(pk=root_id).values_list('pk', flat=True).get()
+        last_version = Test.objects.filter(Q(pk=root_id) | Q(parent_id=root_id)).aggregate(
+            last=Max('version')
+        )['last'] or 1
+        test = _copy(
+            source, parent_id=root_id, version=last_version + 1,
+            is_published=False, frozen_at=None, created_by_id=user.id if user else source.created_by_id,
+        )
+    else:
+        test = _copy(
+            source, title=f'{source.title} (nusxa)', parent_id=None, version=1,
+            is_published=False, frozen_at=None, created_by_id=user.id if user else source.created_by_id,
+        )
+    test.save()
+
+    sections = [(section, _copy(section, test_id=test.id)) for section in source.listening_sections.all()]
+    passages = [(passage, _copy(passage, test_id=test.id)) for passage in source.reading_passages.all()]
+    writing_tasks = [_copy(task, test_id=test.id) for task in source.writing_tasks.all()]
+    ListeningSection.objects.bulk_create([copy for _, copy in sections])
+    ReadingPassage.objects.bulk_create([copy for _, copy in passages])
+    WritingTask.objects.bulk_create(writing_tasks)
+
+    listening_questions = [
+        _copy(question, section_id=copy.id)
+        for section, copy in sections
+        for question in section.questions.all()
+    ]
+    ListeningQuestion.objects.bulk_create(listening_questions)
+
+    # Tayyor audio variantlar ham nusxalanadi (qayta encode qilinmaydi) - fayllar umumiy
+    copies_by_section = {section.id: copy for section, copy in sections}
+    AudioVariant.objects.bulk_create([
+        _copy(variant, section_id=copies_by_section[variant.section_id].id, claimed_at=None)
+        for variant in AudioVariant.objects.filter(section_id__in=copies_by_section, status='done')
+        if variant.source_name == copies_by_section[variant.section_id].audio_file.name
+    ])
+    ReadingQuestion.objects.bulk_create([
+        _copy(question, passage_id=copy.id)
+        for passage, copy in passages
+        for question in passage.questions.all()
+    ])
+
+    # bulk_create signal yubormaydi.
+    # Media fayllar nusxalanmaydi - bloblar umumiy, faqat ref_count qayta sanaladi
+    refresh_test_summary(test.id)
+    sync_media_refs_on_commit(
+        name
+        for obj in [*(copy for _, copy in sections), *listening_questions, *writing_tasks]
+        for name in instance_media_names(obj)
+    )
+    # Yetishmagan variantlar navbatga qo'yiladi, vaqt limitlari hisoblanadi
+    schedule_test_followups_on_commit(test.id, [copy.id for _, copy in sections])
+    return test
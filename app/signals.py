@@ -0,0 +1,251 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from app.models import (
+    Test, TestSummary, ListeningSection, ListeningQuestion, ReadingPassage, ReadingQuestion, WritingTask
+)
+from app.services.scoring import invalidate_answer_key
+from app.services.content_version import touch_test
+from app.services.exam_clock import refresh_time_limits, invalidate_time_limits
+from app.services.test_summary import apply_summary_delta, refresh_test_summary
+from app.services.audio_variants import schedule_audio_variants
+from app.services.media_storage import (
+    MEDIA_REFERENCES, instance_media_names, media_blob_names, sync_media_refs_on_commit
+)
+
+
+def _section_test_id(section_id):
+    return ListeningSection.objects.filter(pk=section_id).values_list('test_id', flat=True).first()
+
+
+def _passage_test_id(passage_id):
+    return ReadingPassage.objects.filter(pk=passage_id).values_list('test_id', flat=True).first()
+
+
+def _test_content_changed(test_id):
+    touch_test(test_id)
+
+
+def _invalidate_answer_key_on_commit(section, test_id):
+    """
+    Commit dan keyin: undan oldin boshqa so'rov eski key ni qayta cache'lab qo'yishi mumkin.
+    Cache kaliti versiyalangan (Test.updated_at) - bu qo'shimcha tozalash.
+    """
+    transaction.on_commit(lambda: invalidate_answer_key(section, test_id))
+
+
+# ==================== TEST CONTENT ====================
+# Kontent o'zgarsa: compiled answer key, vaqt limitlari va versiyaga bog'langan cache'lar eskiradi
+# (Test.save() ning o'zi updated_at ni yangilaydi)
+
+@receiver(post_delete, sender=Test)
+def test_deleted(sender, instance, **kwargs):
+    invalidate_time_limits(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ListeningSection)
+def listening_section_changed(sender, instance, **kwargs):
+    _test_content_changed(instance.test_id)
+    _invalidate_answer_key_on_commit('listening', instance.test_id)
+    # audio_duration o'zgargan bo'lishi mumkin - listening vaqt limiti qayta hisoblanadi
+    transaction.on_commit(lambda: refresh_time_limits(instance.test_id))
+
+
+@receiver([post_save, post_delete], sender=ListeningQuestion)
+def listening_question_changed(sender, instance, **kwargs):
+    test_id = _section_test_id(instance.section_id)
+    if test_id:
+        _test_content_changed(test_id)
+        _invalidate_answer_key_on_commit('listening', test_id)
+
+
+@receiver([post_save, post_delete], sender=ReadingPassage)
+def reading_passage_changed(sender, instance, **kwargs):
+    _test_content_changed(instance.test_id)
+    _invalidate_answer_key_on_commit('reading', instance.test_id)
+
+
+@receiver([post_save, post_delete], sender=ReadingQuestion)
+def reading_question_changed(sender, instance, **kwargs):
+    test_id = _passage_test_id(instance.passage_id)
+    if test_id:
+        _test_content_changed(test_id)
+        _invalidate_answer_key_on_commit('reading', test_id)
+
+
+@receiver([post_save, post_delete], sender=WritingTask)
+def writing_task_changed(sender, instance, **kwargs):
+    _test_content_changed(instance.test_id)
+
+
+# ==================== MOVES ====================
+# Qator boshqa testga (yoki boshqa testdagi section/passage ga) ko'chirilsa -
+# yuqoridagi receiverlar faqat yangi testni yangilaydi, eski test shu yerda
+
+# model: (ota maydon, answer key bo'limi)
+CONTENT_PARENTS = {
+    ListeningSection: ('test', 'listening'),
+    ListeningQuestion: ('section', 'listening'),
+    ReadingPassage: ('test', 'reading'),
+    ReadingQuestion: ('passage', 'reading'),
+    WritingTask: ('test', None),
+}
+
+
+def _parent_test_id(sender, parent_id):
+    if sender is ListeningQuestion:
+        return _section_test_id(parent_id)
+    if sender is ReadingQuestion:
+        return _passage_test_id(parent_id)
+    return parent_id
+
+
+_UNKNOWN = object()
+
+
+def _previous_value(sender, instance, attname):
+    """from_db da eslab qolingan qiymat; noma'lum bo'lsa (deferred, qo'lda pk berilgan) - DB dan"""
+    value = instance.loaded_value(attname, _UNKNOWN)
+    if value is _UNKNOWN:
+        value = sender.objects.filter(pk=instance.pk).values_list(attname, flat=True).first()
+    return value
+
+
+def content_previous_test(sender, instance, **kwargs):
+    parent_field = CONTENT_PARENTS[sender][0]
+    update_fields = kwargs.get('update_fields')
+    if instance.pk is None or (update_fields is not None and parent_field not in update_fields):
+        return
+    parent_id = getattr(instance, f'{parent_field}_id')
+    previous_parent_id = _previous_value(sender, instance, f'{parent_field}_id')
+    if previous_parent_id is None or previous_parent_id == parent_id:
+        return
+    previous_test_id = _parent_test_id(sender, previous_parent_id)
+    if previous_test_id != _parent_test_id(sender, parent_id):
+        instance._previous_test_id = previous_test_id
+
+
+def content_moved(sender, instance, **kwargs):
+    previous_test_id = instance.__dict__.pop('_previous_test_id', None)
+    if previous_test_id is None:
+        return
+    refresh_test_summary(previous_test_id)
+    _test_content_changed(previous_test_id)
+    section = CONTENT_PARENTS[sender][1]
+    if section:
+        _invalidate_answer_key_on_commit(section, previous_test_id)
+    if sender is ListeningSection:
+        transaction.on_commit(lambda: refresh_time_limits(previous_test_id))
+
+
+# Har bir saqlashda emas - faqat kontent modellari uchun
+for _model in CONTENT_PARENTS:
+    pre_save.connect(content_previous_test, sender=_model)
+    post_save.connect(content_moved, sender=_model)
+
+
+# ==================== TEST SUMMARY ====================
+# Yangi / o'chirilgan qator - delta, mavjud qator o'zgarsa - qayta hisoblash
+
+def _update_summary(test_id, created, sign, **deltas):
+    if test_id is None:
+        return
+    if created is False:
+        refresh_test_summary(test_id)
+    else:
+        apply_summary_delta(
+            test_id, create_missing=sign > 0, **{field: sign * delta for field, delta in deltas.items()}
+        )
+
+
+@receiver(post_save, sender=Test)
+def test_summary_created(sender, instance, created, **kwargs):
+    if created:
+        TestSummary.objects.get_or_create(test=instance)
+
+
+@receiver(post_save, sender=ListeningSection)
+@receiver(post_delete, sender=ListeningSection)
+def listening_section_summary(sender, instance, created=None, **kwargs):
+    sign = -1 if created is None else 1
+    _update_summary(instance.test_id, created, sign, listening_sections=1, audio_duration=instance.audio_duration or 0)
+
+
+@receiver(post_save, sender=ListeningQuestion)
+@receiver(post_delete, sender=ListeningQuestion)
+def listening_question_summary(sender, instance, created=None, **kwargs):
+    sign = -1 if created is None else 1
+    _update_summary(
+        _section_test_id(instance.section_id), created, sign, listening_questions=1, total_points=instance.points
+    )
+
+
+@receiver(post_save, sender=ReadingPassage)
+@receiver(post_delete, sender=ReadingPassage)
+def reading_passage_summary(sender, instance, created=None, **kwargs):
+    sign = -1 if created is None else 1
+    _update_summary(instance.test_id, created, sign, reading_passages=1)
+
+
+@receiver(post_save, sender=ReadingQuestion)
+@receiver(post_delete, sender=ReadingQuestion)
+def reading_question_summary(sender, instance, created=None, **kwargs):
+    sign = -1 if created is None else 1
+    _update_summary(
+        _passage_test_id(instance.passage_id), created, sign, reading_questions=1, total_points=instance.points
+    )
+
+
+@receiver(post_save, sender=WritingTask)
+@receiver(post_delete, sender=WritingTask)
+def writing_task_summary(sender, instance, created=None, **kwargs):
+    sign = -1 if created is None else 1
+    _update_summary(instance.test_id, created, sign, writing_tasks=1)
+
+
+# ==================== AUDIO VARIANTS ====================
+# audio_file o'zgarsa variantlar qayta navbatga qo'yiladi (fayl o'zgarmagan bo'lsa - hech narsa)
+
+@receiver(post_save, sender=ListeningSection)
+def listening_section_audio_changed(sender, instance, **kwargs):
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'audio_file' not in update_fields:
+        return
+    section_id = instance.pk
+    transaction.on_commit(lambda: schedule_audio_variants(section_id))
+
+
+# ==================== MEDIA BLOBS ====================
+# Fayl almashsa eski va yangi blobning ref_count i qayta sanaladi
+
+MEDIA_FIELDS = dict(MEDIA_REFERENCES)
+
+
+def media_previous_names(sender, instance, **kwargs):
+    field = MEDIA_FIELDS[sender]
+    update_fields = kwargs.get('update_fields')
+    if instance.pk is None or (update_fields is not None and field not in update_fields):
+        return
+    instance._media_previous_names = media_blob_names([_previous_value(sender, instance, field)])
+
+
+def media_refs_saved(sender, instance, **kwargs):
+    field = MEDIA_FIELDS[sender]
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and field not in update_fields:
+        return
+    previous = instance.__dict__.pop('_media_previous_names', set())
+    current = instance_media_names(instance)
+    if previous != current or kwargs.get('created'):
+        sync_media_refs_on_commit(previous | current)
+
+
+def media_refs_deleted(sender, instance, **kwargs):
+    sync_media_refs_on_commit(instance_media_names(instance))
+
+
+for _model in MEDIA_FIELDS:
+    pre_save.connect(media_previous_names, sender=_model)
+    post_save.connect(media_refs_saved, sender=_model)
+    post_delete.connect(media_refs_deleted, sender=_model)
@@ -0,0 +1,68 @@
+"""
+Kontent bo'yicha manzillanadigan (content-addressed) media storage.
+
+Fayl oqim bilan o'qilib sha256 hisoblanadi va bir marta saqlanadi:
+cas/<ab>/<cd>/<sha256><.ext>. Xuddi shu fayl qayta yuklansa (nusxalangan test,
+qayta import) diskka yozilmaydi - mavjud blob nomi qaytadi.
+
+Har bir blob uchun MediaBlob qatori yuritiladi (hajm, ref_count). Bloblar
+storage.delete() bilan emas, `manage.py gc_media` bilan o'chiriladi - bitta
+blob bir nechta testda ishlatilgan bo'lishi mumkin.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage, storages
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    prefix = 'cas'
+    tmp_dir = '.tmp'
+
+    def blob_name(self, digest, extension=''):
+        return f'{self.prefix}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+    def is_blob(self, name):
+        return bool(name) and name.startswith(f'{self.prefix}/')
+
+    def _save(self, name, content):
+        # Kengaytma saqlanadi - mimetype va Pillow/ffmpeg unga tayanadi
+        extension = os.path.splitext(name)[1].lower()
+        tmp_root = self.path(f'{self.prefix}/{self.tmp_dir}')
+        os.makedirs(tmp_root, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_root)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+
+            name = self.blob_name(digest.hexdigest(), extension)
+            # Qator fayldan oldin: gc_media shu blobni o'chirayotgan bo'lsa -
+            # uning tranzaksiyasi tugashini kutamiz, keyin fayl bor-yo'qligini tekshiramiz
+            from app.services.media_storage import register_media_blob
+            register_media_blob(name, digest.hexdigest(), size)
+
+            path = self.path(name)
+            if os.path.exists(path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(path, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return name
+
+
+def content_storage():
+    """FileField(storage=...) uchun - settings.STORAGES['content'] (migratsiyalarda backend yozilmaydi)"""
+    return storages['content']
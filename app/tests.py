@@ -1,3 +1,23 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from app.services.scoring import _compile_question, check_answer
+
+
+class WordLimitTests(SimpleTestCase):
+    """question_data.word_limit - teacher kiritgan erkin JSON"""
+
+    def compile(self, word_limit):
+        return _compile_question(1, 'completion', {'word_limit': word_limit}, 'big cat', 1)
+
+    def test_string_limit_is_coerced(self):
+        entry = self.compile('2')
+        self.assertEqual(entry['word_limit'], 2)
+        self.assertTrue(check_answer(entry, 'big cat'))
+        self.assertFalse(check_answer(entry, 'the big cat'))
+
+    def test_invalid_limits_are_ignored(self):
+        for word_limit in ('two', -1, 0, True, None, [2]):
+            with self.subTest(word_limit=word_limit):
+                entry = self.compile(word_limit)
+                self.assertIsNone(entry['word_limit'])
+                self.assertTrue(check_answer(entry, 'big cat'))
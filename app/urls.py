@@ -1,6 +1,6 @@
 from django.urls import path, include
 from .views import CustomTokenRefreshView
-from app.views import RegisterView, LoginView, ProfileView
+from app.views import RegisterView, LoginView, ProfileView, section_audio, image_derivative
 from rest_framework.routers import DefaultRouter
 
 
@@ -8,7 +8,8 @@ from .views import (
     ListeningSubmissionViewSet,
     ReadingSubmissionViewSet,
     WritingSubmissionViewSet,
-    TestAttemptViewSet
+    TestAttemptViewSet,
+    SubmissionIntakeViewSet
 )
 
 router = DefaultRouter()
@@ -16,6 +17,7 @@ router.register(r'listening', ListeningSubmissionViewSet, basename='listening')
 router.register(r'reading', ReadingSubmissionViewSet, basename='reading')
 router.register(r'writing', WritingSubmissionViewSet, basename='writing')
 router.register(r'attempts', TestAttemptViewSet, basename='attempts')
+router.register(r'intake', SubmissionIntakeViewSet, basename='submission-intake')
 
 
 
@@ -33,6 +35,12 @@ urlpatterns = [
     #answer submit
     path('submissions/', include(router.urls)),
 
+    # section audio (imzolangan havola, Range qo'llab)
+    path('audio/<str:token>/', section_audio, name='section-audio'),
+
+    # rasm variantlari (kichraytirilgan, WebP/JPEG)
+    path('images/<slug:kind>/<int:pk>/<slug:size>.<slug:fmt>', image_derivative, name='image-derivative'),
+
 
 
 
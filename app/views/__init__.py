@@ -2,4 +2,6 @@ from .auth_views import *
 
 # from .listening_views import *
 from .student_answer import *
+from .audio_view import *
+from .image_view import *
 from .custom_jwt_view import CustomTokenRefreshView
\ No newline at end of file
@@ -0,0 +1,28 @@
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_safe
+
+from app.services.audio_delivery import AudioAccessError, audio_response, resolve_audio_token
+from app.services.audio_variants import pick_variant
+
+
+@require_safe
+def section_audio(request, token):
+    """
+    Section audiosi (imzolangan havola orqali).
+
+    GET /web/audio/{token}/
+    Havola listening start javobida (`audio` ro'yxati) yoki dashboarddagi
+    /listening-sections/{id}/audio_url/ dan olinadi. Range/If-Range -> 206.
+    ?variant=<profil> - tayyor yengil variant (bo'lmasa original).
+    """
+    try:
+        section = resolve_audio_token(token)
+    except AudioAccessError as e:
+        return JsonResponse({'error': str(e)}, status=403)
+
+    if not section.audio_file:
+        raise Http404('Audio fayl yo\'q')
+    try:
+        return audio_response(request, section, pick_variant(section, request.GET.get('variant')))
+    except FileNotFoundError:
+        raise Http404('Audio fayl topilmadi')
@@ -0,0 +1,72 @@
+import mimetypes
+
+from django.apps import apps
+from django.db.models import F
+from django.http import FileResponse, Http404
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_safe
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from app.services.image_derivatives import IMAGE_SOURCES, DerivativeError, get_derivative
+
+
+def _is_teacher(request):
+    """Session (admin) yoki JWT orqali teacher/admin"""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        try:
+            authenticated = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        if authenticated is None:
+            return False
+        user = authenticated[0]
+    return user.is_staff or user.role in ['admin', 'teacher']
+
+
+@require_safe
+def image_derivative(request, kind, pk, size, fmt):
+    """
+    Savol/task rasmining kichraytirilgan varianti (WebP yoki JPEG).
+
+    GET /web/images/{kind}/{id}/{size}.{fmt}?v=...
+    URL lar serializerdagi *_variants maydonlarida. Birinchi so'rovda yaratiladi,
+    keyin diskdagi keshdan (sendfile orqali) beriladi.
+    Nashr qilingan test rasmlari - ochiq (public kesh), qolganlari faqat teacher/admin ga.
+    """
+    if kind not in IMAGE_SOURCES:
+        raise Http404
+    model_label, field_name, test_path = IMAGE_SOURCES[kind]
+    instance = (
+        apps.get_model(model_label).objects.filter(pk=pk)
+        .annotate(test_published=F(f'{test_path}__is_published'))
+        .only('id', field_name).first()
+    )
+    field_file = getattr(instance, field_name, None)
+    if not field_file:
+        raise Http404('Rasm topilmadi')
+    # Nashr qilinmagan (draft) test - mavjudligini ham oshkor qilmaymiz
+    if not instance.test_published and not _is_teacher(request):
+        raise Http404('Rasm topilmadi')
+
+    try:
+        path = get_derivative(field_file, size, fmt)
+        try:
+            variant = open(path, 'rb')
+        except FileNotFoundError:
+            # Shu orada keshdan o'chirilgan (evict_image_derivatives) - qayta yaratiladi
+            variant = open(get_derivative(field_file, size, fmt), 'rb')
+    except DerivativeError as e:
+        raise Http404(str(e))
+    except FileNotFoundError:
+        raise Http404('Rasm topilmadi')
+
+    response = FileResponse(variant, content_type=mimetypes.guess_type(path)[0])
+    # ?v= rasm almashganda o'zgaradi - uzoq muddat keshlash xavfsiz
+    max_age = 60 * 60 * 24 * 30
+    if instance.test_published:
+        patch_cache_control(response, public=True, max_age=max_age)
+    else:
+        patch_cache_control(response, private=True, max_age=max_age)
+    return response
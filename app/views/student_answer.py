@@ -1,32 +1,151 @@
 # views.py - FINAL VERSION
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.db import transaction
+from django.db.models import Prefetch
+from django.urls import reverse
 from django.utils import timezone
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 from app.models import (
-    TestAttempt, ListeningAnswer, ReadingAnswer, WritingSubmission,
-    Test, ListeningQuestion, ReadingQuestion, WritingTask, ListeningSection
+    TestAttempt, Test, SubmissionIntake, ListeningAnswer, ReadingAnswer, WritingSubmission, ListeningSection,
+    AudioVariant
 )
 from app.serializers import (
+    AnswerDraftSerializer,
     ListeningSubmitSerializer,
     ReadingSubmitSerializer,
     WritingSubmitSerializer,
+    SubmissionIntakeSerializer,
     TestAttemptDetailSerializer, TestAttemptListSerializer, GradeAttemptSerializer
 )
+from app.pagination import AttemptKeysetPagination, UngradedQueuePagination
+from app.services.drafts import save_draft_answers, get_draft_answers
+from app.services.exam_clock import get_time_limits, start_section_clock, get_clock, clock_state
+from app.services.audio_delivery import make_audio_token
+from app.services.submission import SUBMIT_HANDLERS, SubmissionError, enqueue_submission
+
+
+SUBMIT_MODE_PARAMETER = OpenApiParameter(
+    name='mode',
+    description="`sync` - darhol baholash (201), `queued` - navbatga yozish (202 + status_url). "
+                "Default: settings.SUBMISSION_INTAKE_MODE",
+    required=False,
+    type=str,
+    enum=['sync', 'queued']
+)
+
 
+def handle_submit(request, section, serializer_class):
+    """
+    Listening/Reading/Writing submit.
+    Sync rejimda darhol baholanadi, queued rejimda navbatga yoziladi va 202 qaytadi -
+    process_submissions buyrug'i uni keyinroq bir xil logika bilan qayta ishlaydi.
+    """
+    serializer = serializer_class(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    payload = dict(serializer.validated_data)
+    test_id = payload.pop('test_id')
+    # Mavjud bo'lmagan test - 404 (attempt yo'qligi uchun 400 emas)
+    get_object_or_404(Test.objects.only('id'), pk=test_id)
+
+    mode = request.query_params.get('mode', settings.SUBMISSION_INTAKE_MODE)
+    if mode not in ('sync', 'queued'):
+        return Response(
+            {'error': "mode faqat 'sync' yoki 'queued' bo'lishi mumkin"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-def check_and_complete_attempt(attempt):
-    """Barcha sectionlar submitted bo'lsa, avtomatik completed qilish"""
-    if attempt.all_sections_submitted():
-        if attempt.status != 'completed':
-            attempt.mark_completed()
-            return True
-    return False
+    if mode == 'queued':
+        # Arzon tekshiruv (lock'siz) - aniq rad etiladigan submitlar navbatga tushmaydi
+        attempt = TestAttempt.objects.filter(
+            user=request.user, test_id=test_id
+        ).values('status', f'{section}_submitted').first()
+        if attempt is None:
+            return Response(
+                {'error': f'Avval /{section}/start/ ni chaqiring'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if attempt[f'{section}_submitted'] or attempt['status'] == 'completed':
+            return Response(
+                {'error': f'{section.capitalize()} allaqachon topshirilgan'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        intake = enqueue_submission(request.user, test_id, section, payload)
+        return Response({
+            'message': f'{section.capitalize()} qabul qilindi, baholanmoqda',
+            'intake_id': intake.id,
+            'status': intake.status,
+            'status_url': request.build_absolute_uri(
+                reverse('submission-intake-detail', args=[intake.id])
+            ),
+        }, status=status.HTTP_202_ACCEPTED)
+
+    try:
+        response_data = SUBMIT_HANDLERS[section](request.user, test_id, **payload)
+    except SubmissionError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(response_data, status=status.HTTP_201_CREATED)
+
+
+def handle_answer_draft(request, section):
+    """
+    Listening/Reading autosave.
+    GET - saqlangan qoralamalarni tiklash, PATCH - faqat o'zgargan javoblarni yuborish
+    """
+    if request.method == 'GET':
+        test_id = request.query_params.get('test_id')
+        if not test_id:
+            return Response(
+                {'error': 'test_id majburiy'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        attempt = TestAttempt.objects.filter(user=request.user, test_id=test_id).only('id').first()
+        if attempt is None:
+            return Response(
+                {'error': f'Avval /{section}/start/ ni chaqiring'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({
+            'attempt_id': attempt.id,
+            'answers': get_draft_answers(attempt.id, section),
+        })
+
+    serializer = AnswerDraftSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    attempt = TestAttempt.objects.filter(
+        user=request.user,
+        test_id=serializer.validated_data['test_id']
+    ).only('id', 'status', f'{section}_submitted').first()
+
+    if attempt is None:
+        return Response(
+            {'error': f'Avval /{section}/start/ ni chaqiring'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if getattr(attempt, f'{section}_submitted') or attempt.status == 'completed':
+        return Response(
+            {'error': f'{section.capitalize()} allaqachon topshirilgan'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    saved = save_draft_answers(attempt.id, section, serializer.validated_data['answers'])
+
+    return Response({
+        'attempt_id': attempt.id,
+        'saved': saved,
+    })
 
 
 # ==================== LISTENING VIEWSET ====================
@@ -83,25 +202,68 @@ class ListeningSubmissionViewSet(viewsets.ViewSet):
             attempt.listening_started_at = timezone.now()
             attempt.save(update_fields=['listening_started_at'])
 
-        # Audio durationlarni yig'ish
-        sections = ListeningSection.objects.filter(test=test)
-        total_audio_duration = sum(section.audio_duration for section in sections)
-        time_limit = total_audio_duration + 600
+        # Oldindan hisoblangan limitlar (kontent o'zgarganda yangilanadi)
+        limits = get_time_limits(test.id)
+        start_section_clock(attempt, 'listening', limits['listening'])
+
+        # Imzolangan audio havolalari - attempt faol bo'lgandagina ishlaydi
+        # variants - tayyor yengil variantlar, url?variant=<profil> bilan tanlanadi
+        sections = ListeningSection.objects.filter(test_id=test.id).order_by('section_number').prefetch_related(
+            Prefetch(
+                'audio_variants',
+                queryset=AudioVariant.objects.filter(status='done').only('section_id', 'profile', 'source_name', 'size'),
+            )
+        ).only('id', 'section_number', 'audio_duration', 'audio_file')
+        audio = [
+            {
+                'section_id': section.id,
+                'section_number': section.section_number,
+                'audio_duration': section.audio_duration,
+                'url': request.build_absolute_uri(
+                    reverse('section-audio', args=[make_audio_token(section.id, attempt_id=attempt.id)])
+                ),
+                'variants': [
+                    {'profile': variant.profile, 'size': variant.size}
+                    for variant in section.audio_variants.all()
+                    if variant.source_name == section.audio_file.name
+                ],
+            }
+            for section in sections
+        ]
 
         return Response({
             'attempt_id': attempt.id,
-            'time_limit': time_limit,
-            'audio_duration': total_audio_duration,
+            'time_limit': limits['listening'],
+            'audio_duration': limits['listening_audio'],
             'extra_time': 300,
             'started_at': attempt.listening_started_at,
+            'audio': audio,
         })
 
+    @extend_schema(
+        request=AnswerDraftSerializer,
+        parameters=[OpenApiParameter('test_id', int, description='GET uchun: test ID')],
+        responses={200: {'type': 'object'}}
+    )
+    @action(detail=False, methods=['get', 'patch'])
+    def draft(self, request):
+        """
+        Listening javoblarini autosave qilish (faqat o'zgarganlar)
+
+        PATCH /api/listening/draft/
+        {
+            "test_id": 1,
+            "answers": {"3": "B", "7": "museum"}
+        }
+        """
+        return handle_answer_draft(request, 'listening')
+
     @extend_schema(
         request=ListeningSubmitSerializer,
-        responses={201: TestAttemptDetailSerializer}
+        parameters=[SUBMIT_MODE_PARAMETER],
+        responses={201: TestAttemptDetailSerializer, 202: SubmissionIntakeSerializer}
     )
     @action(detail=False, methods=['post'])
-    @transaction.atomic
     def submit(self, request):
         """
         Barcha listening javoblarini yuborish (FAQAT BIR MARTA)
@@ -113,90 +275,7 @@ class ListeningSubmissionViewSet(viewsets.ViewSet):
             "time_spent": 2050
         }
         """
-        serializer = ListeningSubmitSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        test_id = serializer.validated_data['test_id']
-        answers = serializer.validated_data['answers']
-        time_spent = serializer.validated_data['time_spent']
-
-        test = get_object_or_404(Test, pk=test_id)
-
-        # Attempt olish
-        try:
-            attempt = TestAttempt.objects.get(user=request.user, test=test)
-        except TestAttempt.DoesNotExist:
-            return Response(
-                {'error': 'Avval /listening/start/ ni chaqiring'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # ✅ ASOSIY CHECK: Allaqachon submitted bo'lsa, REJECT
-        if attempt.listening_submitted:
-            return Response(
-                {'error': 'Listening allaqachon topshirilgan. Qayta yuborib bo\'lmaydi'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # Test completed bo'lsa
-        if attempt.status == 'completed':
-            return Response(
-                {'error': 'Test allaqachon tugallangan'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # Questionlarni olish
-        questions = ListeningQuestion.objects.filter(
-            section__test=test
-        ).select_related('section')
-
-        total_questions = questions.count()
-        question_map = {str(q.question_number): q for q in questions}
-
-        # Javoblarni saqlash
-        answers_to_create = []
-        for q_number_str, user_answer in answers.items():
-            question = question_map.get(q_number_str)
-            if question:
-                answers_to_create.append(
-                    ListeningAnswer(
-                        attempt=attempt,
-                        question=question,
-                        user_answer=user_answer.strip()
-                    )
-                )
-
-        # Avvalgilarni o'chirish va yangilarini saqlash
-        ListeningAnswer.objects.filter(attempt=attempt).delete()
-        if answers_to_create:
-            ListeningAnswer.objects.bulk_create(answers_to_create)
-
-        # ✅ Listening ni submitted qilish
-        attempt.listening_submitted = True
-        attempt.listening_submitted_at = timezone.now()
-        attempt.save(update_fields=['listening_submitted', 'listening_submitted_at'])
-
-        # Barcha sectionlar submitted bo'lsa, completed qilish
-        auto_completed = check_and_complete_attempt(attempt)
-
-        # Response
-        response_data = {
-            'message': 'Listening muvaffaqiyatli topshirildi',
-            'attempt_id': attempt.id,
-            'status': attempt.status,
-            'listening_submitted': True,
-            'auto_completed': auto_completed,
-            'total_questions': total_questions,
-            'answered_questions': len(answers_to_create),
-            'time_spent': time_spent,
-        }
-
-        # Warning
-        unanswered = total_questions - len(answers_to_create)
-        if unanswered > 0:
-            response_data['warning'] = f"{unanswered} ta savol bo'sh qoldi"
-
-        return Response(response_data, status=status.HTTP_201_CREATED)
+        return handle_submit(request, 'listening', ListeningSubmitSerializer)
 
 
 # ==================== READING VIEWSET ====================
@@ -253,100 +332,42 @@ class ReadingSubmissionViewSet(viewsets.ViewSet):
             attempt.reading_started_at = timezone.now()
             attempt.save(update_fields=['reading_started_at'])
 
+        time_limit = get_time_limits(test.id)['reading']
+        start_section_clock(attempt, 'reading', time_limit)
+
         return Response({
             'attempt_id': attempt.id,
-            'time_limit': 3600,
+            'time_limit': time_limit,
             'started_at': attempt.reading_started_at,
         })
 
+    @extend_schema(
+        request=AnswerDraftSerializer,
+        parameters=[OpenApiParameter('test_id', int, description='GET uchun: test ID')],
+        responses={200: {'type': 'object'}}
+    )
+    @action(detail=False, methods=['get', 'patch'])
+    def draft(self, request):
+        """
+        Reading javoblarini autosave qilish (faqat o'zgarganlar)
+
+        PATCH /api/reading/draft/
+        {
+            "test_id": 1,
+            "answers": {"3": "B", "7": "museum"}
+        }
+        """
+        return handle_answer_draft(request, 'reading')
+
     @extend_schema(
         request=ReadingSubmitSerializer,
-        responses={201: TestAttemptDetailSerializer}
+        parameters=[SUBMIT_MODE_PARAMETER],
+        responses={201: TestAttemptDetailSerializer, 202: SubmissionIntakeSerializer}
     )
     @action(detail=False, methods=['post'])
-    @transaction.atomic
     def submit(self, request):
         """Reading javoblarini yuborish (FAQAT BIR MARTA)"""
-        serializer = ReadingSubmitSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        test_id = serializer.validated_data['test_id']
-        answers = serializer.validated_data['answers']
-        time_spent = serializer.validated_data['time_spent']
-
-        test = get_object_or_404(Test, pk=test_id)
-
-        # Attempt olish
-        try:
-            attempt = TestAttempt.objects.get(user=request.user, test=test)
-        except TestAttempt.DoesNotExist:
-            return Response(
-                {'error': 'Avval /reading/start/ ni chaqiring'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # ✅ Allaqachon submitted bo'lsa, REJECT
-        if attempt.reading_submitted:
-            return Response(
-                {'error': 'Reading allaqachon topshirilgan. Qayta yuborib bo\'lmaydi'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        if attempt.status == 'completed':
-            return Response(
-                {'error': 'Test tugallangan'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # Questionlarni olish
-        questions = ReadingQuestion.objects.filter(
-            passage__test=test
-        ).select_related('passage')
-
-        total_questions = questions.count()
-        question_map = {str(q.question_number): q for q in questions}
-
-        # Javoblarni saqlash
-        answers_to_create = []
-        for q_number_str, user_answer in answers.items():
-            question = question_map.get(q_number_str)
-            if question:
-                answers_to_create.append(
-                    ReadingAnswer(
-                        attempt=attempt,
-                        question=question,
-                        user_answer=user_answer.strip()
-                    )
-                )
-
-        ReadingAnswer.objects.filter(attempt=attempt).delete()
-        if answers_to_create:
-            ReadingAnswer.objects.bulk_create(answers_to_create)
-
-        # ✅ Reading ni submitted qilish
-        attempt.reading_submitted = True
-        attempt.reading_submitted_at = timezone.now()
-        attempt.save(update_fields=['reading_submitted', 'reading_submitted_at'])
-
-        # Auto complete check
-        auto_completed = check_and_complete_attempt(attempt)
-
-        response_data = {
-            'message': 'Reading muvaffaqiyatli topshirildi',
-            'attempt_id': attempt.id,
-            'status': attempt.status,
-            'reading_submitted': True,
-            'auto_completed': auto_completed,
-            'total_questions': total_questions,
-            'answered_questions': len(answers_to_create),
-            'time_spent': time_spent,
-        }
-
-        unanswered = total_questions - len(answers_to_create)
-        if unanswered > 0:
-            response_data['warning'] = f"{unanswered} ta savol bo'sh qoldi"
-
-        return Response(response_data, status=status.HTTP_201_CREATED)
+        return handle_submit(request, 'reading', ReadingSubmitSerializer)
 
 
 # ==================== WRITING VIEWSET ====================
@@ -400,112 +421,64 @@ class WritingSubmissionViewSet(viewsets.ViewSet):
             attempt.writing_started_at = timezone.now()
             attempt.save(update_fields=['writing_started_at'])
 
+        time_limit = get_time_limits(test.id)['writing']
+        start_section_clock(attempt, 'writing', time_limit)
+
         return Response({
             'attempt_id': attempt.id,
-            'time_limit': 3600,
+            'time_limit': time_limit,
             'started_at': attempt.writing_started_at,
         })
 
     @extend_schema(
         request=WritingSubmitSerializer,
-        responses={201: TestAttemptDetailSerializer}
+        parameters=[SUBMIT_MODE_PARAMETER],
+        responses={201: TestAttemptDetailSerializer, 202: SubmissionIntakeSerializer}
     )
     @action(detail=False, methods=['post'])
-    @transaction.atomic
     def submit(self, request):
         """Writing javoblarini yuborish (FAQAT BIR MARTA)"""
-        serializer = WritingSubmitSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        test_id = serializer.validated_data['test_id']
-        task1_text = serializer.validated_data.get('task1_text', '').strip()
-        task2_text = serializer.validated_data.get('task2_text', '').strip()
-        time_spent = serializer.validated_data['time_spent']
-
-        test = get_object_or_404(Test, pk=test_id)
-
-        try:
-            attempt = TestAttempt.objects.get(user=request.user, test=test)
-        except TestAttempt.DoesNotExist:
-            return Response(
-                {'error': 'Avval /writing/start/ ni chaqiring'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # ✅ Allaqachon submitted bo'lsa, REJECT
-        if attempt.writing_submitted:
-            return Response(
-                {'error': 'Writing allaqachon topshirilgan. Qayta yuborib bo\'lmaydi'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        if attempt.status == 'completed':
-            return Response(
-                {'error': 'Test tugallangan'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # Tasklarni olish
-        tasks = WritingTask.objects.filter(test=test).order_by('task_number')
-        if tasks.count() < 2:
-            return Response(
-                {'error': 'Bu testda 2 ta writing task yo\'q'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # Avvalgilarni o'chirish
-        WritingSubmission.objects.filter(attempt=attempt).delete()
+        return handle_submit(request, 'writing', WritingSubmitSerializer)
 
-        # Yangi submissionlar
-        task1_submission = None
-        task2_submission = None
-
-        if task1_text:
-            task1_submission = WritingSubmission.objects.create(
-                attempt=attempt,
-                task=tasks[0],
-                submission_text=task1_text,
-                time_spent=time_spent
-            )
-
-        if task2_text:
-            task2_submission = WritingSubmission.objects.create(
-                attempt=attempt,
-                task=tasks[1],
-                submission_text=task2_text,
-                time_spent=time_spent
-            )
-
-        # ✅ Writing ni submitted qilish
-        attempt.writing_submitted = True
-        attempt.writing_submitted_at = timezone.now()
-        attempt.save(update_fields=['writing_submitted', 'writing_submitted_at'])
-
-        # Auto complete
-        auto_completed = check_and_complete_attempt(attempt)
-
-        response_data = {
-            'message': 'Writing muvaffaqiyatli topshirildi',
-            'attempt_id': attempt.id,
-            'status': attempt.status,
-            'writing_submitted': True,
-            'auto_completed': auto_completed,
-            'task1_word_count': task1_submission.word_count if task1_submission else 0,
-            'task2_word_count': task2_submission.word_count if task2_submission else 0,
-            'time_spent': time_spent,
-        }
-
-        warnings = []
-        if not task1_text:
-            warnings.append("Task 1 bo'sh")
-        if not task2_text:
-            warnings.append("Task 2 bo'sh")
-        if warnings:
-            response_data['warning'] = ", ".join(warnings)
-
-        return Response(response_data, status=status.HTTP_201_CREATED)
 
+# TestAttemptListSerializer uchun kerakli ustunlar
+ATTEMPT_LIST_COLUMNS = (
+    'id', 'test', 'user', 'status', 'started_at', 'completed_at',
+    'listening_raw_score', 'listening_band', 'reading_raw_score', 'reading_band',
+    'writing_band', 'overall_band', 'graded_at',
+    'test__title', 'user__username',
+)
 
+# Detail uchun: har bir section - tartiblangan va faqat kerakli ustunlar
+ATTEMPT_SECTION_PREFETCHES = {
+    'listening': lambda: Prefetch(
+        'listening_answers',
+        queryset=ListeningAnswer.objects.select_related('question__section').only(
+            'attempt', 'question', 'user_answer', 'is_correct', 'answered_at',
+            'question__question_number', 'question__question_text',
+            'question__section', 'question__section__section_number',
+        ).order_by('question__question_number')
+    ),
+    'reading': lambda: Prefetch(
+        'reading_answers',
+        queryset=ReadingAnswer.objects.select_related('question__passage').only(
+            'attempt', 'question', 'user_answer', 'is_correct', 'answered_at',
+            'question__question_number', 'question__question_text',
+            'question__passage', 'question__passage__passage_number',
+        ).order_by('question__question_number')
+    ),
+    'writing': lambda: Prefetch(
+        'writing_submissions',
+        queryset=WritingSubmission.objects.select_related('task').only(
+            'attempt', 'task', 'submission_text', 'word_count', 'time_spent', 'submitted_at',
+            'task__task_number', 'task__task_type',
+        ).order_by('task__task_number')
+    ),
+}
+
+
+def attempt_section_prefetches(sections):
+    return [ATTEMPT_SECTION_PREFETCHES[section]() for section in sections]
 
 
 @extend_schema(tags=['Test Attempts'])
@@ -513,33 +486,63 @@ class TestAttemptViewSet(viewsets.ReadOnlyModelViewSet):
     """Test attemptlarini ko'rish va boshqarish"""
     permission_classes = [IsAuthenticated]
     serializer_class = TestAttemptDetailSerializer
+    pagination_class = AttemptKeysetPagination
 
     def get_queryset(self):
         user = self.request.user
 
-        # Student faqat o'ziniki
+        queryset = TestAttempt.objects.all()
+
+        # Student faqat o'ziniki, Teacher/Admin barchasi
         if user.role == 'student':
-            return TestAttempt.objects.filter(
-                user=user
-            ).select_related('test', 'graded_by').prefetch_related(
-                'listening_answers__question__section',
-                'reading_answers__question__passage',
-                'writing_submissions__task'
-            )
+            queryset = queryset.filter(user=user)
 
-        # Teacher/Admin barchasi
-        return TestAttempt.objects.all().select_related(
-            'test', 'user', 'graded_by'
-        ).prefetch_related(
-            'listening_answers__question__section',
-            'reading_answers__question__passage',
-            'writing_submissions__task'
+        # Ro'yxat - faqat TestAttemptListSerializer ustunlari, javoblarsiz
+        if self.action == 'list':
+            return queryset.select_related('test', 'user').only(*ATTEMPT_LIST_COLUMNS)
+
+        return queryset.select_related('test', 'user', 'graded_by').prefetch_related(
+            *attempt_section_prefetches(self.get_included_sections())
         )
 
+    def get_included_sections(self):
+        """?include=listening,reading,writing (bo'lmasa - hammasi)"""
+        include = self.request.query_params.get('include')
+        if not include:
+            return set(ATTEMPT_SECTION_PREFETCHES)
+
+        sections = {section.strip() for section in include.split(',') if section.strip()}
+        unknown = sections - set(ATTEMPT_SECTION_PREFETCHES)
+        if unknown:
+            raise ValidationError({
+                'error': f"Noma'lum include: {', '.join(sorted(unknown))}. "
+                         f"Mumkin: {', '.join(ATTEMPT_SECTION_PREFETCHES)}"
+            })
+        return sections
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['include'] = self.get_included_sections()
+        return context
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'include', str,
+                description="Qaysi sectionlar javoblari qaytadi: listening,reading,writing (default - hammasi)"
+            ),
+        ]
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @extend_schema(
         parameters=[
             OpenApiParameter('status', str, description='Filter by status'),
             OpenApiParameter('graded', bool, description='Filter by graded status'),
+            OpenApiParameter('cursor', str, description='Keyingi sahifa cursori (next linkdan)'),
+            OpenApiParameter('page_size', int, description='Sahifa hajmi (default 50, max 200)'),
+            OpenApiParameter('count', bool, description='true - taxminiy umumiy son (count_estimate)'),
         ]
     )
     def list(self, request, *args, **kwargs):
@@ -549,6 +552,7 @@ class TestAttemptViewSet(viewsets.ReadOnlyModelViewSet):
         Query params:
         - status: in_progress, completed
         - graded: true, false
+        - cursor, page_size, count: keyset pagination (started_at, id)
         """
         queryset = self.get_queryset()
 
@@ -565,8 +569,9 @@ class TestAttemptViewSet(viewsets.ReadOnlyModelViewSet):
             else:
                 queryset = queryset.filter(graded_at__isnull=True)
 
-        serializer = TestAttemptListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(queryset)
+        serializer = TestAttemptListSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         request=GradeAttemptSerializer,
@@ -621,10 +626,45 @@ class TestAttemptViewSet(viewsets.ReadOnlyModelViewSet):
 
         return Response({
             'message': 'Baho muvaffaqiyatli qo\'yildi',
-            'attempt': TestAttemptDetailSerializer(attempt).data
+            'attempt': TestAttemptDetailSerializer(attempt, context=self.get_serializer_context()).data
         })
 
     @extend_schema(
+        responses={200: {'type': 'object'}}
+    )
+    @action(
+        detail=True, methods=['get'],
+        authentication_classes=[JWTStatelessUserAuthentication]
+    )
+    def clock(self, request, pk=None):
+        """
+        Qolgan vaqt (har bir boshlangan section uchun)
+
+        GET /api/attempts/{id}/clock/
+        Foydalanuvchi tokendan olinadi, javob cache'dan - DB so'rovi yo'q.
+        """
+        if not str(pk).isdigit():
+            return Response(
+                {'error': 'Attempt topilmadi'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        clock = get_clock(int(pk))
+        if clock is None or str(clock['user_id']) != str(request.user.id):
+            return Response(
+                {'error': 'Attempt topilmadi'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        response = Response({'attempt_id': int(pk), **clock_state(clock)})
+        response['Cache-Control'] = 'no-store'
+        return response
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter('cursor', str, description='Keyingi sahifa cursori (next linkdan)'),
+            OpenApiParameter('page_size', int, description='Sahifa hajmi (default 50, max 200)'),
+            OpenApiParameter('count', bool, description='true - taxminiy umumiy son (count_estimate)'),
+        ],
         responses={200: TestAttemptListSerializer(many=True)}
     )
     @action(detail=False, methods=['get'])
@@ -633,6 +673,7 @@ class TestAttemptViewSet(viewsets.ReadOnlyModelViewSet):
         Baholanmagan attemptlar (Teacher uchun)
 
         GET /api/attempts/ungraded/
+        Navbat tartibi: eng oldin tugatilganlar birinchi (completed_at, id)
         """
         if request.user.role not in ['teacher', 'admin']:
             return Response(
@@ -640,18 +681,25 @@ class TestAttemptViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
+        # completed_at NULL qatorlar keyset cursor (completed_at < / =) bilan solishtirilmaydi -
+        # navbatga faqat tugash vaqti bor attemptlar kiradi
         attempts = TestAttempt.objects.filter(
             status='completed',
-            graded_at__isnull=True
-        ).select_related('test', 'user')
-
-        serializer = TestAttemptListSerializer(attempts, many=True)
-        return Response(serializer.data)
-
-
-
-
+            graded_at__isnull=True,
+            completed_at__isnull=False
+        ).select_related('test', 'user').only(*ATTEMPT_LIST_COLUMNS)
 
+        paginator = UngradedQueuePagination()
+        page = paginator.paginate_queryset(attempts, request, view=self)
+        serializer = TestAttemptListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 
+@extend_schema(tags=['Submission Intake'])
+class SubmissionIntakeViewSet(viewsets.ReadOnlyModelViewSet):
+    """Navbatga yozilgan submitlar holati (faqat o'zining)"""
+    permission_classes = [IsAuthenticated]
+    serializer_class = SubmissionIntakeSerializer
 
+    def get_queryset(self):
+        return SubmissionIntake.objects.filter(user=self.request.user).order_by('-id')
@@ -0,0 +1,28 @@
+"""
+Spawn qilingan worker processlar uchun kirish nuqtalari.
+
+Bu modul top-level'da app.models ni import qilmasligi kerak: spawn qilingan
+process uni django.setup() dan oldin import qiladi.
+"""
+
+
+def setup_django():
+    """Spawn qilingan worker process uchun Django ni sozlash (pool initializer sifatida ham)"""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def run_submission_worker(batch_size, poll_interval, once):
+    """process_submissions buyrug'ining bitta worker processi"""
+    setup_django()
+    from app.services.submission import process_intake_queue
+    return process_intake_queue(batch_size=batch_size, poll_interval=poll_interval, once=once)
+
+
+def run_rescore_chunk(section, test_id, attempt_ids):
+    """rescore_test process pool'ining vazifasi - rescoring moduli Django sozlangandan keyin import qilinadi"""
+    setup_django()
+    from app.services.rescoring import rescore_attempt_chunk
+    return rescore_attempt_chunk(section, test_id, attempt_ids)
@@ -54,6 +54,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'app',
     'dashboard',
@@ -193,6 +194,40 @@ REST_FRAMEWORK = {
 
 }
 
+# Submit rejimi: 'sync' - so'rov ichida baholash, 'queued' - navbatga yozib 202 qaytarish
+# (navbatni `manage.py process_submissions` bo'shatadi). ?mode= parametri bilan almashtirish mumkin
+SUBMISSION_INTAKE_MODE = os.environ.get('SUBMISSION_INTAKE_MODE', 'sync')
+# Vaqtinchalik xatolikda qayta urinishlar soni va kutish (sekund, har safar 2 barobar)
+SUBMISSION_INTAKE_MAX_ATTEMPTS = 5
+SUBMISSION_INTAKE_RETRY_DELAY = 30
+SUBMISSION_INTAKE_RETRY_MAX_DELAY = 60 * 30
+
+# Cache barcha processlar uchun umumiy bo'lishi kerak: gunicorn workerlar,
+# process_submissions va process_audio_variants konteynerlari bir xil
+# soat / answer key / bundle ni ko'radi. docker-compose da Redis (REDIS_URL);
+# REDIS_URL bo'lmasa - PostgreSQL jadvali (`manage.py createcachetable`),
+# bunda har bir cache o'qish SQL so'rov bo'ladi.
+# 'local' - process ichidagi qisqa muddatli qatlam (imtihon vaqt limitlari).
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        }
+    }
+CACHES['local'] = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'mock-local',
+}
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Mock API',
     'DESCRIPTION': 'mock project description',
@@ -207,6 +242,46 @@ SPECTACULAR_SETTINGS = {
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    # Section audio, savol va task rasmlari: sha256 bo'yicha bir marta saqlanadi (app/storage.py)
+    'content': {'BACKEND': 'app.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+# Ishlatilmay qolgan blob shuncha sekunddan keyin `manage.py gc_media` bilan o'chiriladi
+MEDIA_BLOB_GC_GRACE_SECONDS = 60 * 60 * 24 * 7
+
+# Audio chunked upload: bo'laklar shu papkada yig'iladi, tugagach storage ga ko'chiriladi
+AUDIO_UPLOAD_TEMP_DIR = os.environ.get('AUDIO_UPLOAD_TEMP_DIR', str(MEDIA_ROOT / 'uploads' / 'tmp'))
+AUDIO_UPLOAD_MAX_SIZE = 200 * 1024 * 1024
+AUDIO_UPLOAD_MAX_CHUNK_SIZE = 8 * 1024 * 1024
+# Section audio uzatish: 'stream' (har qanday server), 'sendfile' (faqat gunicorn - os.sendfile
+# Content-Length ga amal qiladi) yoki 'x-accel' (nginx X-Accel-Redirect)
+AUDIO_DELIVERY = os.environ.get('AUDIO_DELIVERY', 'stream')
+AUDIO_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+# Imzolangan audio havolasi amal qilish muddati (sekund)
+AUDIO_URL_MAX_AGE = 60 * 60 * 4
+# Audio variantlar (manage.py process_audio_variants): mijoz ?variant=<profil> bilan tanlaydi
+AUDIO_VARIANT_PROFILES = {
+    'standard': {'sample_rate': 22050, 'bitrate': 64},
+    'low': {'sample_rate': 16000, 'bitrate': 32},
+}
+# FfmpegEncoder - loudnorm + MP3; WavResampleEncoder - faqat standart kutubxona (16-bit WAV)
+AUDIO_VARIANT_ENCODER = os.environ.get('AUDIO_VARIANT_ENCODER', 'app.services.audio_encoders.FfmpegEncoder')
+# Rasm variantlari: nom -> maksimal kenglik (px); kesh diskda, LRU bilan chegaralangan
+IMAGE_DERIVATIVE_SIZES = {
+    'thumb': 320,
+    'medium': 960,
+    'large': 1600,
+}
+IMAGE_DERIVATIVE_CACHE_DIR = os.environ.get('IMAGE_DERIVATIVE_CACHE_DIR', str(MEDIA_ROOT / 'cache' / 'images'))
+IMAGE_DERIVATIVE_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+# Audio davomiyligini aniqlovchilar - tartib bilan, birinchi natija olinadi
+AUDIO_DURATION_PROBERS = [
+    'app.services.audio_probe.probe_wav',
+    'app.services.audio_probe.probe_ffprobe',
+]
+
 
 
 
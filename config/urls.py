@@ -15,10 +15,11 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 from django.conf import settings
 from django.conf.urls.static import static
+from django.views.static import serve
 
 
 urlpatterns = [
@@ -44,5 +45,11 @@ urlpatterns = [
 
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    # Faqat rasmlar - section audiolari faqat imzolangan /web/audio/{token}/ orqali
+    urlpatterns += [
+        re_path(
+            r'^%s(?P<path>.+\.(?:png|jpe?g|gif|webp|PNG|JPE?G|GIF|WEBP))$' % settings.MEDIA_URL.lstrip('/'),
+            serve, {'document_root': settings.MEDIA_ROOT},
+        ),
+    ]
 
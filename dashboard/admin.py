@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils import timezone
-from app.models import TestAttempt, ListeningAnswer, ReadingAnswer, WritingSubmission
+from app.models import TestAttempt, ListeningAnswer, ReadingAnswer, WritingSubmission, SubmissionIntake
 
 
 # ==================== INLINE CLASSES ====================
@@ -10,7 +10,7 @@ class ListeningAnswerInline(admin.TabularInline):
     """Listening answers inline"""
     model = ListeningAnswer
     extra = 0
-    readonly_fields = ['question', 'user_answer', 'answered_at']
+    readonly_fields = ['question', 'user_answer', 'is_correct', 'answered_at']
     can_delete = False
 
     def has_add_permission(self, request, obj=None):
@@ -21,7 +21,7 @@ class ReadingAnswerInline(admin.TabularInline):
     """Reading answers inline"""
     model = ReadingAnswer
     extra = 0
-    readonly_fields = ['question', 'user_answer', 'answered_at']
+    readonly_fields = ['question', 'user_answer', 'is_correct', 'answered_at']
     can_delete = False
 
     def has_add_permission(self, request, obj=None):
@@ -60,7 +60,10 @@ class TestAttemptAdmin(admin.ModelAdmin):
     search_fields = ('user__username', 'user__first_name', 'user__last_name', 'test__title')
 
     # O'zgartirib bo'lmaydigan (faqat o'qish uchun) maydonlar
-    readonly_fields = ('started_at', 'completed_at', 'created_at', 'updated_at')
+    readonly_fields = (
+        'started_at', 'completed_at', 'created_at', 'updated_at',
+        'listening_raw_score', 'reading_raw_score'
+    )
 
     # Formada maydonlarni mantiqiy guruhlarga bo'lish
     fieldsets = (
@@ -74,6 +77,7 @@ class TestAttemptAdmin(admin.ModelAdmin):
         ('Natijalar (Band Scores)', {
             'fields': (
                 ('listening_band', 'reading_band', 'writing_band'),
+                ('listening_raw_score', 'reading_raw_score'),
                 'overall_band'
             )
         }),
@@ -112,11 +116,13 @@ class ListeningAnswerAdmin(admin.ModelAdmin):
         'attempt_info',
         'question_number',
         'user_answer',
+        'is_correct',
         'answered_at'
     ]
 
     list_filter = [
         'answered_at',
+        'is_correct',
         'attempt__status'
     ]
 
@@ -127,7 +133,7 @@ class ListeningAnswerAdmin(admin.ModelAdmin):
         'user_answer'
     ]
 
-    readonly_fields = ['attempt', 'question', 'answered_at']
+    readonly_fields = ['attempt', 'question', 'is_correct', 'answered_at']
 
     def attempt_info(self, obj):
         """Attempt ma'lumotlari"""
@@ -156,11 +162,13 @@ class ReadingAnswerAdmin(admin.ModelAdmin):
         'attempt_info',
         'question_number',
         'user_answer',
+        'is_correct',
         'answered_at'
     ]
 
     list_filter = [
         'answered_at',
+        'is_correct',
         'attempt__status'
     ]
 
@@ -171,7 +179,7 @@ class ReadingAnswerAdmin(admin.ModelAdmin):
         'user_answer'
     ]
 
-    readonly_fields = ['attempt', 'question', 'answered_at']
+    readonly_fields = ['attempt', 'question', 'is_correct', 'answered_at']
 
     def attempt_info(self, obj):
         """Attempt ma'lumotlari"""
@@ -274,4 +282,22 @@ class WritingSubmissionAdmin(admin.ModelAdmin):
         seconds = obj.time_spent % 60
         return f"{minutes}m {seconds}s"
 
-    time_spent_display.short_description = 'Time Spent'
\ No newline at end of file
+    time_spent_display.short_description = 'Time Spent'
+
+@admin.register(SubmissionIntake)
+class SubmissionIntakeAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'test', 'section', 'status', 'attempts', 'next_run_at', 'created_at', 'processed_at']
+    list_filter = ['status', 'section']
+    search_fields = ['user__username', 'test__title']
+    readonly_fields = ['user', 'test', 'section', 'payload', 'result', 'error', 'attempts', 'next_run_at',
+                       'created_at', 'claimed_at', 'processed_at']
+    actions = ['requeue']
+
+    def requeue(self, request, queryset):
+        """Xato bilan tugaganlarni qayta navbatga qo'yish"""
+        updated = queryset.filter(status='failed').update(
+            status='pending', claimed_at=None, error='', attempts=0, next_run_at=timezone.now()
+        )
+        self.message_user(request, f"{updated} ta yozuv navbatga qaytarildi")
+
+    requeue.short_description = "Navbatga qaytarish (failed)"
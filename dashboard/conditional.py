@@ -0,0 +1,101 @@
+"""
+Conditional GET (ETag / Last-Modified) kontent endpointlari uchun.
+
+Validator javobni serialize qilmasdan hisoblanadi: test(lar)ning updated_at
+qiymati (section, savol, passage yoki task o'zgarganda signal orqali
+yangilanadi) va foydalanuvchi roli. Bitta test uchun bu - pk bo'yicha bitta
+indexli so'rov. If-None-Match mos kelsa 304 qaytadi.
+
+If-Modified-Since bo'yicha 304 berilmaydi: Last-Modified sekundgacha aniq,
+bir sekund ichidagi ikkinchi o'zgarish eskirgan 304 ga olib kelardi. ETag
+mikrosekundli updated_at dan - u yagona validator.
+"""
+import functools
+import math
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from app.models import Test
+
+
+def conditional_content(handler):
+    """GET handler uchun: validator mos kelsa handler chaqirilmaydi (304)"""
+    @functools.wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        validator = self.get_content_validator()
+        if validator is None:
+            return handler(self, request, *args, **kwargs)
+
+        last_modified, etag = validator
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                response['ETag'] = etag
+                # Yuqoriga yaxlitlanadi - sekund ichidagi o'zgarish eski vaqt bilan ko'rinmaydi
+                response['Last-Modified'] = http_date(math.ceil(last_modified.timestamp()))
+        patch_vary_headers(response, ['Authorization'])
+        return response
+    return wrapper
+
+
+class ConditionalContentMixin:
+    """
+    list / retrieve uchun conditional GET.
+
+    content_test_field - modeldan Test ga yo'l ('' - model Test ning o'zi)
+    content_test_param - ro'yxatni test bo'yicha filterlovchi query param
+    """
+    content_test_field = 'test'
+    content_test_param = 'test_id'
+
+    def get_content_role(self):
+        user = self.request.user
+        if user.is_staff:
+            return 'admin'
+        return getattr(user, 'role', None) or 'anonymous'
+
+    def get_content_validator(self):
+        """(last_modified, etag) yoki None - shart tekshirilmaydi"""
+        lookup = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        if lookup is not None:
+            # Bitta obyekt: pk bo'yicha bitta so'rov (test bilan join)
+            if self.content_test_field:
+                queryset = self.get_queryset().model.objects.filter(pk=lookup)
+                field = f'{self.content_test_field}__updated_at'
+            else:
+                queryset = self.get_queryset().filter(pk=lookup)
+                field = 'updated_at'
+            try:
+                last_modified = queryset.values_list(field, flat=True).first()
+            except (TypeError, ValueError):
+                return None
+            count = 1
+        else:
+            tests = self.get_queryset() if not self.content_test_field else Test.objects.all()
+            test_id = self.request.query_params.get(self.content_test_param)
+            if test_id:
+                if not test_id.isdigit():
+                    return None
+                tests = tests.filter(pk=test_id)
+            # Test o'chirilsa MAX o'zgarmasligi mumkin - soni ham validatorga kiradi
+            stats = tests.order_by().aggregate(last=Max('updated_at'), count=Count('pk'))
+            last_modified, count = stats['last'], stats['count']
+
+        if last_modified is None:
+            return None
+
+        etag = quote_etag(
+            f'{self.basename}-{self.get_content_role()}-{count}-{last_modified.timestamp():.6f}'
+        )
+        return last_modified, etag
+
+    @conditional_content
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_content
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
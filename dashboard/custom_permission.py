@@ -1,6 +1,8 @@
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import permissions
 
+from app.services.test_versions import EDITABLE_WHEN_FROZEN, frozen_test_ids
+
 
 
 
@@ -20,3 +22,40 @@ class IsTeacherOrAdminOrReadOnly(permissions.BasePermission):
                 request.user.is_authenticated and
                 (request.user.is_staff or request.user.role in ['admin', 'teacher'])
         )
+
+
+class IsTestContentEditable(permissions.BasePermission):
+    """
+    Nashr qilingan (muzlatilgan) test kontentini o'zgartirib bo'lmaydi.
+    View quyidagilarni beradi:
+    - get_request_test_ids(request) - so'rov ma'lumotidagi testlar
+    - get_object_test_id(obj) - obyekt tegishli test
+    correct_answer tahriri muzlatilgan testda ham ruxsat etiladi.
+    """
+    message = "Test nashr qilingan va muzlatilgan. O'zgartirish uchun yangi versiya yarating (POST /Tests/{id}/new_version/)"
+
+    def has_permission(self, request, view):
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        return not frozen_test_ids(view.get_request_test_ids(request))
+
+    def has_object_permission(self, request, view, obj):
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        if request.method in ('PUT', 'PATCH') and set(request.data.keys()) <= EDITABLE_WHEN_FROZEN:
+            return True
+        return not frozen_test_ids([view.get_object_test_id(obj)])
+
+
+def request_values(data, key):
+    """request.data (obyekt yoki list) dagi `key` qiymatlari - int ga o'giriladi"""
+    items = data if isinstance(data, list) else [data]
+    values = set()
+    for item in items:
+        if not hasattr(item, 'get'):
+            continue
+        try:
+            values.add(int(item.get(key)))
+        except (TypeError, ValueError):
+            pass
+    return values
@@ -0,0 +1,96 @@
+"""
+Exam bundle - butun test bitta oldindan render qilingan JSON hujjat.
+
+Bundle kontent versiyasi bo'yicha cache'lanadi: test kontenti o'zgarsa versiya
+yangilanadi va keyingi so'rov yangi bundle render qiladi. Bir vaqtda kelgan
+so'rovlardan faqat bittasi render qiladi, qolganlari cache'ni kutadi.
+
+Bundle hamma uchun bir xil va audio manzilisiz. Imzolangan audio havolalari
+so'rovchiga bog'liq - tayyor JSON oxiriga `audio_urls` kaliti qo'shiladi
+(bundle qayta render qilinmaydi).
+"""
+import time
+
+from django.core.cache import cache
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from app.models import Test, ListeningSection, ListeningQuestion, ReadingPassage, ReadingQuestion, WritingTask
+from app.services.content_version import get_content_version
+from app.services.audio_delivery import section_audio_url
+from dashboard.serializers import ExamBundleSerializer
+
+
+EXAM_BUNDLE_CACHE_TIMEOUT = 60 * 60 * 24
+RENDER_LOCK_TIMEOUT = 30
+RENDER_WAIT_SECONDS = 5
+RENDER_WAIT_STEP = 0.05
+
+
+def exam_bundle_queryset():
+    """Bundle uchun barcha kontent - o'zgarmas sondagi query bilan"""
+    return Test.objects.prefetch_related(
+        Prefetch(
+            'listening_sections',
+            queryset=ListeningSection.objects.order_by('section_number').prefetch_related(
+                Prefetch('questions', queryset=ListeningQuestion.objects.order_by('question_number'))
+            )
+        ),
+        Prefetch(
+            'reading_passages',
+            queryset=ReadingPassage.objects.order_by('passage_number').prefetch_related(
+                Prefetch('questions', queryset=ReadingQuestion.objects.order_by('question_number'))
+            )
+        ),
+        Prefetch('writing_tasks', queryset=WritingTask.objects.order_by('task_number')),
+    )
+
+
+def render_exam_bundle(test_id):
+    test = exam_bundle_queryset().get(pk=test_id)
+    return JSONRenderer().render(ExamBundleSerializer(test).data)
+
+
+def get_exam_bundle(test_id):
+    """
+    (body, etag) qaytaradi.
+    body - tayyor JSON bytes, etag - kontent versiyasiga bog'langan.
+    """
+    version = get_content_version(test_id)
+    key = f'exam_bundle:{test_id}:{version}'
+    etag = f'"bundle-{test_id}-{version}"'
+
+    body = cache.get(key)
+    if body is not None:
+        return body, etag
+
+    lock_key = f'{key}:lock'
+    if not cache.add(lock_key, 1, RENDER_LOCK_TIMEOUT):
+        # Boshqa worker render qilmoqda - tayyor bo'lishini kutamiz
+        deadline = time.monotonic() + RENDER_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(RENDER_WAIT_STEP)
+            body = cache.get(key)
+            if body is not None:
+                return body, etag
+
+    try:
+        body = render_exam_bundle(test_id)
+        cache.set(key, body, EXAM_BUNDLE_CACHE_TIMEOUT)
+    finally:
+        cache.delete(lock_key)
+
+    return body, etag
+
+
+def with_audio_urls(body, request, test_id, attempt_id=None, preview=False):
+    """
+    Tayyor bundle JSON ga {"audio_urls": {section_id: url}} qo'shish.
+    Ruxsat bo'lmasa (faol attempt yo'q) - bo'sh obyekt, listening boshlangach qayta so'raladi.
+    """
+    urls = {}
+    if attempt_id is not None or preview:
+        for section_id in ListeningSection.objects.filter(test_id=test_id).values_list('id', flat=True):
+            urls[section_id] = section_audio_url(request, section_id, attempt_id=attempt_id, preview=preview)
+    # body - JSONRenderer natijasi, '}' bilan tugaydi
+    return body[:-1] + b',"audio_urls":' + JSONRenderer().render(urls) + b'}'
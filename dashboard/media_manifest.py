@@ -0,0 +1,197 @@
+"""
+Exam media manifest - test uchun kerak bo'ladigan barcha media fayllar ro'yxati.
+
+Section audiolari (va tayyor variantlari), listening savol rasmlari va writing
+chart rasmlari: hajm, sha256, content type va cache validatorlari. Mijoz
+instruktsiya ekranida hammasini oldindan yuklab, checksum bilan tekshira oladi.
+
+Manifest exam bundle kabi kontent versiyasi bo'yicha cache'lanadi (audio variant
+tayyor bo'lganda ham versiya yangilanadi). Audio havolalari imzolangan va
+attempt ga bog'langan - ular cache'ga yozilmaydi, har so'rovda qo'shiladi.
+"""
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.urls import reverse
+from django.utils.http import http_date
+
+from app.models import AudioVariant, ListeningQuestion, ListeningSection, Test, WritingTask
+from app.services.audio_delivery import audio_validators, make_audio_token
+from app.services.content_version import get_content_version
+from app.services.image_derivatives import image_variant_urls, source_hash
+from app.storage import content_storage
+
+
+MEDIA_MANIFEST_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def media_sha256(field_file):
+    """Content-addressed blob nomining o'zi sha256; boshqa fayllar o'qib hisoblanadi (cache'lanadi)"""
+    if content_storage().is_blob(field_file.name):
+        return os.path.splitext(os.path.basename(field_file.name))[0]
+    return source_hash(field_file)
+
+
+def _file_entry(field_file):
+    """Fayl haqida umumiy ma'lumot: hajm, sha256, content type, Last-Modified"""
+    entry = {
+        'content_type': mimetypes.guess_type(field_file.name)[0] or 'application/octet-stream',
+        'size': field_file.size,
+        'sha256': media_sha256(field_file),
+        'last_modified': None,
+    }
+    try:
+        entry['last_modified'] = http_date(int(os.path.getmtime(field_file.path)))
+    except NotImplementedError:
+        pass
+    return entry
+
+
+def _audio_entry(section_id, field_file):
+    entry = _file_entry(field_file)
+    entry['etag'] = None
+    if settings.AUDIO_DELIVERY != 'x-accel':
+        # /web/audio/ aynan shu ETag bilan javob beradi (If-None-Match / If-Range uchun)
+        try:
+            entry['etag'] = audio_validators(section_id, field_file.name, field_file.path)[0]
+        except NotImplementedError:
+            pass
+    return entry
+
+
+def _image_entry(kind, obj, field_file):
+    return {
+        'type': 'image',
+        'kind': kind,
+        'id': obj.id,
+        'url': field_file.url,
+        **_file_entry(field_file),
+        'variants': image_variant_urls(field_file, kind, obj.id),
+    }
+
+
+def build_media_manifest(test_id):
+    test = Test.objects.prefetch_related(
+        Prefetch(
+            'listening_sections',
+            queryset=ListeningSection.objects.order_by('section_number').prefetch_related(
+                Prefetch(
+                    'questions',
+                    queryset=ListeningQuestion.objects.exclude(question_image='').exclude(
+                        question_image__isnull=True
+                    ).order_by('question_number').only('id', 'section_id', 'question_number', 'question_image'),
+                ),
+                Prefetch('audio_variants', queryset=AudioVariant.objects.filter(status='done').order_by('profile')),
+            ).only('id', 'test_id', 'section_number', 'audio_file', 'audio_duration'),
+        ),
+        Prefetch(
+            'writing_tasks',
+            queryset=WritingTask.objects.exclude(image='').exclude(image__isnull=True).order_by(
+                'task_number'
+            ).only('id', 'test_id', 'task_number', 'image'),
+        ),
+    ).get(pk=test_id)
+
+    assets = []
+    missing = []
+    for section in test.listening_sections.all():
+        try:
+            audio = section.audio_file and {
+                'type': 'audio',
+                'section_id': section.id,
+                'section_number': section.section_number,
+                'duration': section.audio_duration,
+                **_audio_entry(section.id, section.audio_file),
+                'variants': [
+                    {'profile': variant.profile, **_audio_entry(section.id, variant.audio_file)}
+                    for variant in section.audio_variants.all()
+                    if variant.source_name == section.audio_file.name and variant.audio_file
+                ],
+            }
+        except FileNotFoundError:
+            missing.append(section.audio_file.name)
+        else:
+            if audio:
+                assets.append(audio)
+
+        for question in section.questions.all():
+            try:
+                image = _image_entry('listening-question', question, question.question_image)
+            except FileNotFoundError:
+                missing.append(question.question_image.name)
+                continue
+            image['question_number'] = question.question_number
+            assets.append(image)
+
+    for task in test.writing_tasks.all():
+        try:
+            image = _image_entry('writing-task', task, task.image)
+        except FileNotFoundError:
+            missing.append(task.image.name)
+            continue
+        image['task_number'] = task.task_number
+        assets.append(image)
+
+    return {
+        'test_id': test.id,
+        'assets': assets,
+        'total_size': sum(asset['size'] for asset in assets),
+        # Bazada bor, diskda yo'q fayllar - teacher uchun signal
+        'missing': missing,
+    }
+
+
+def get_media_manifest(test_id):
+    """(manifest, version) - versiya ETag uchun"""
+    version = get_content_version(test_id)
+    key = f'media_manifest:{test_id}:{version}'
+    manifest = cache.get(key)
+    if manifest is None:
+        manifest = build_media_manifest(test_id)
+        cache.set(key, manifest, MEDIA_MANIFEST_CACHE_TIMEOUT)
+    return manifest, version
+
+
+def with_urls(manifest, request, attempt_id=None, preview=False):
+    """
+    Absolyut URL lar va audio havolalari: attempt_id - talabaning faol attempti,
+    preview=True - teacher/admin. Ikkalasi ham bo'lmasa audio url = None
+    (listening boshlangach qayta so'raladi). Cache'dagi manifest o'zgartirilmaydi.
+    `missing` (diskdagi ichki yo'llar) faqat preview javobida qoladi.
+    """
+    assets = []
+    for asset in manifest['assets']:
+        if asset['type'] == 'audio' and attempt_id is None and not preview:
+            asset = {
+                **asset,
+                'url': None,
+                'variants': [{**variant, 'url': None} for variant in asset['variants']],
+            }
+        elif asset['type'] == 'audio':
+            token = make_audio_token(asset['section_id'], attempt_id=attempt_id, user_id=request.user.id)
+            url = request.build_absolute_uri(reverse('section-audio', args=[token]))
+            asset = {
+                **asset,
+                'url': url,
+                'variants': [
+                    {**variant, 'url': f"{url}?variant={variant['profile']}"}
+                    for variant in asset['variants']
+                ],
+            }
+        else:
+            asset = {
+                **asset,
+                'url': request.build_absolute_uri(asset['url']),
+                'variants': {
+                    size: {fmt: request.build_absolute_uri(url) for fmt, url in formats.items()}
+                    for size, formats in (asset['variants'] or {}).items()
+                },
+            }
+        assets.append(asset)
+    result = {**manifest, 'assets': assets}
+    if not preview:
+        result.pop('missing', None)
+    return result
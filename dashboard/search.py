@@ -0,0 +1,73 @@
+"""
+Kontent bankida full-text search (PostgreSQL).
+
+Har bir model generated `search_vector` (tsvector) ustuniga va GIN indexga ega
+(app/models). Qidiruv websearch sintaksisida: "climate change" -plastic.
+Natija rank bo'yicha tartiblanadi, mos so'zlar headline da <mark> bilan.
+"""
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F
+
+from app.models import ListeningQuestion, ReadingPassage, ReadingQuestion, WritingTask
+
+
+SEARCH_CONFIG = 'english'
+SEARCH_MAX_LIMIT = 100
+HEADLINE_OPTIONS = {
+    'start_sel': '<mark>',
+    'stop_sel': '</mark>',
+    'max_fragments': 2,
+    'max_words': 30,
+    'min_words': 10,
+}
+
+# kind: (model, matn maydoni, test_id yo'li, test title yo'li)
+SEARCH_TARGETS = {
+    'reading_passage': (ReadingPassage, 'passage_text', 'test_id', 'test__title'),
+    'reading_question': (ReadingQuestion, 'question_text', 'passage__test_id', 'passage__test__title'),
+    'listening_question': (ListeningQuestion, 'question_text', 'section__test_id', 'section__test__title'),
+    'writing_task': (WritingTask, 'prompt_text', 'test_id', 'test__title'),
+}
+
+
+def search_content(text, kinds=None, test_id=None, limit=20):
+    """
+    Har bir tur bo'yicha eng mos `limit` ta natija, keyin umumiy rank bo'yicha.
+    Natija: [{'kind', 'id', 'test_id', 'test_title', 'rank', 'headline'}, ...]
+    """
+    query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+
+    hits = []
+    for kind in kinds or SEARCH_TARGETS:
+        model, text_field, test_path, title_path = SEARCH_TARGETS[kind]
+        queryset = model.objects.filter(search_vector=query)
+        if test_id is not None:
+            queryset = queryset.filter(**{test_path: test_id})
+
+        # ts_headline qimmat - LIMIT dan keyingi qatorlar uchungina hisoblanadi
+        rows = (
+            queryset
+            .annotate(
+                rank=SearchRank(F('search_vector'), query),
+                headline=SearchHeadline(text_field, query, config=SEARCH_CONFIG, **HEADLINE_OPTIONS),
+                hit_test_id=F(test_path),
+                test_title=F(title_path),
+            )
+            .order_by('-rank', 'pk')
+            .values('pk', 'hit_test_id', 'test_title', 'rank', 'headline')[:limit]
+        )
+        hits.extend(
+            {
+                'kind': kind,
+                'id': row['pk'],
+                'test_id': row['hit_test_id'],
+                'test_title': row['test_title'],
+                'rank': row['rank'],
+                'headline': row['headline'],
+            }
+            for row in rows
+        )
+
+    hits.sort(key=lambda hit: hit['rank'], reverse=True)
+    return hits[:limit]
@@ -3,6 +3,23 @@ from rest_framework import serializers
 from app.models import ReadingPassage, ReadingQuestion, Test
 
 
+def passage_questions_count(passage):
+    """
+    Passage savollari soni - annotate(questions_count=...) yoki prefetch bo'lsa
+    qo'shimcha query yo'q, aks holda COUNT
+    """
+    if hasattr(passage, 'questions_count'):
+        return passage.questions_count
+    if 'questions' in getattr(passage, '_prefetched_objects_cache', {}):
+        return len(passage.questions.all())
+    return passage.questions.count()
+
+
+def test_reading_passages(test):
+    """Test passagelari - prefetch qilingan bo'lsa qayta query qilinmaydi"""
+    return list(test.reading_passages.all())
+
+
 class TestBasicSerializer(serializers.ModelSerializer):
     """Basic Test information for nested use"""
 
@@ -117,7 +134,7 @@ class ReadingPassageSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'word_count', 'created_at', 'test_info']
 
     def get_questions_count(self, obj):
-        return obj.questions.count()
+        return passage_questions_count(obj)
 
 
 class ReadingPassageCreateUpdateSerializer(serializers.ModelSerializer):
@@ -185,7 +202,7 @@ class ReadingPassageListSerializer(serializers.ModelSerializer):
         ]
 
     def get_questions_count(self, obj):
-        return obj.questions.count()
+        return passage_questions_count(obj)
 
 
 
@@ -206,7 +223,8 @@ class ReadingPassageWithQuestionsSerializer(serializers.ModelSerializer):
 
     def get_questions(self, obj):
         """Foydalanuvchi roliga qarab javob bilan yoki javobsiz qaytarish"""
-        questions = obj.questions.all().order_by('question_number')
+        # Meta.ordering = question_number - prefetch qilingan tartib ishlatiladi
+        questions = obj.questions.all()
         request = self.context.get('request')
 
         if request and hasattr(request, 'user'):
@@ -233,10 +251,10 @@ class TestReadingOverviewSerializer(serializers.ModelSerializer):
         ]
 
     def get_total_passages(self, obj):
-        return obj.reading_passages.count()
+        return len(test_reading_passages(obj))
 
     def get_total_questions(self, obj):
-        return ReadingQuestion.objects.filter(passage__test=obj).count()
+        return sum(passage_questions_count(passage) for passage in test_reading_passages(obj))
 
 
 
@@ -257,7 +275,7 @@ class ReadingPassagesListSerializer(serializers.ModelSerializer):
         ]
 
     def get_questions_count(self, obj):
-        return obj.questions.count()
+        return passage_questions_count(obj)
 
 
 
@@ -284,11 +302,11 @@ class ReadingPassageTestSerializer(serializers.ModelSerializer):
 
     def get_passages_count(self, obj):
         """Nechta passage bor"""
-        return obj.reading_passages.count()
+        return len(test_reading_passages(obj))
 
     def get_total_questions(self, obj):
         """Jami nechta savol bor (barcha passagelar bo'yicha)"""
-        return sum(passage.questions.count() for passage in obj.reading_passages.all())
+        return sum(passage_questions_count(passage) for passage in test_reading_passages(obj))
 
 
 
@@ -1,4 +1,7 @@
 from .listining_serializer import *
 from .test_serializer import *
 from .Reading_serializer import *
-from .writing_serializer import *
\ No newline at end of file
+from .writing_serializer import *
+from .exam_bundle_serializer import *
+from .search_serializer import *
+from .audio_upload_serializer import *
@@ -0,0 +1,35 @@
+from rest_framework import serializers
+
+from app.models import AudioUpload, ListeningSection
+
+
+class AudioUploadSerializer(serializers.ModelSerializer):
+    """Upload holati - received mijoz davom etishi kerak bo'lgan offset"""
+
+    class Meta:
+        model = AudioUpload
+        fields = [
+            'id',
+            'section',
+            'filename',
+            'total_size',
+            'received',
+            'sha256',
+            'status',
+            'error',
+            'audio_file',
+            'audio_duration',
+            'created_at',
+            'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class AudioUploadStartSerializer(serializers.Serializer):
+    """Sessiya ochish. section berilsa - tugaganda audio shu sectionga biriktiriladi"""
+    filename = serializers.CharField(max_length=255)
+    total_size = serializers.IntegerField(min_value=1)
+    sha256 = serializers.CharField(max_length=64, required=False, allow_blank=True, default='')
+    section = serializers.PrimaryKeyRelatedField(
+        queryset=ListeningSection.objects.all(), required=False, allow_null=True
+    )
@@ -0,0 +1,86 @@
+from rest_framework import serializers
+from app.models import Test, ListeningSection, ListeningQuestion, ReadingPassage, WritingTask
+from .Reading_serializer import ReadingQuestionListSerializer
+
+
+class ExamListeningQuestionSerializer(serializers.ModelSerializer):
+    """Student uchun - correct_answer siz"""
+
+    class Meta:
+        model = ListeningQuestion
+        fields = [
+            'id',
+            'question_number',
+            'question_text',
+            'question_type',
+            'question_data',
+            'question_image',
+        ]
+
+
+class ExamListeningSectionSerializer(serializers.ModelSerializer):
+    """Audio fayl manzilisiz - imzolangan havolalar bundle view'da qo'shiladi (audio_urls)"""
+    questions = ExamListeningQuestionSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ListeningSection
+        fields = [
+            'id',
+            'section_number',
+            'audio_duration',
+            'instructions',
+            'questions',
+        ]
+
+
+class ExamReadingPassageSerializer(serializers.ModelSerializer):
+    questions = ReadingQuestionListSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ReadingPassage
+        fields = [
+            'id',
+            'passage_number',
+            'title',
+            'passage_text',
+            'word_count',
+            'questions',
+        ]
+
+
+class ExamWritingTaskSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = WritingTask
+        fields = [
+            'id',
+            'task_number',
+            'task_type',
+            'prompt_text',
+            'image',
+            'instructions',
+            'word_limit',
+            'time_suggestion',
+        ]
+
+
+class ExamBundleSerializer(serializers.ModelSerializer):
+    """
+    Butun test bitta JSON hujjatda (student-safe).
+    Request context siz ishlatiladi - media URL lar nisbiy, natija cache'lanadi.
+    """
+    listening_sections = ExamListeningSectionSerializer(many=True, read_only=True)
+    reading_passages = ExamReadingPassageSerializer(many=True, read_only=True)
+    writing_tasks = ExamWritingTaskSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Test
+        fields = [
+            'id',
+            'title',
+            'description',
+            'difficulty_level',
+            'listening_sections',
+            'reading_passages',
+            'writing_tasks',
+        ]
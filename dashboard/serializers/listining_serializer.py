@@ -1,5 +1,9 @@
+from django.db.models import Sum
 from rest_framework import serializers
-from app.models import Test, ListeningSection, ListeningQuestion
+from app.models import Test, ListeningSection, ListeningQuestion, AudioUpload
+from app.services.audio_probe import probe_uploaded_file
+from app.services.image_derivatives import image_variant_urls
+from app.services.audio_delivery import active_listening_attempt_id, can_preview_audio, section_audio_url
 
 
 class ListeningQuestionSerializer(serializers.ModelSerializer):
@@ -8,6 +12,8 @@ class ListeningQuestionSerializer(serializers.ModelSerializer):
     O'qituvchilar/Admin uchun to'liq ma'lumot
     String va JSON formatlarni avtomatik qabul qiladi
     """
+    # Kichraytirilgan rasm variantlari: {'thumb': {'webp': url, 'jpeg': url}, ...}
+    question_image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = ListeningQuestion
@@ -19,15 +25,26 @@ class ListeningQuestionSerializer(serializers.ModelSerializer):
             'question_type',
             'question_data',
             'question_image',
-            # 'correct_answer',
+            'question_image_variants',
+            'correct_answer',
         ]
         extra_kwargs = {
             'section': {'required': True},
             'question_type': {'required': True},
-            # 'correct_answer': {'write_only': True},  # Foydalanuvchiga ko'rsatmaslik
         }
         read_only_fields = ['question_number','id']
 
+    def get_question_image_variants(self, obj):
+        return image_variant_urls(obj.question_image, 'listening-question', obj.pk, self.context.get('request'))
+
+    def to_representation(self, instance):
+        """correct_answer faqat Teacher/Admin ga ko'rsatiladi"""
+        data = super().to_representation(instance)
+        request = self.context.get('request')
+        if not (request and request.user.is_authenticated and request.user.role in ['teacher', 'admin']):
+            data.pop('correct_answer', None)
+        return data
+
     def validate(self, data):
         """Validation - model.clean() ga o'xshash"""
         question_type = data.get('question_type')
@@ -64,6 +81,18 @@ class ListeningQuestionSerializer(serializers.ModelSerializer):
                     'Table uchun question_data (headers, rows) yoki question_image kerak'
                 )
 
+        correct_answer = data.get('correct_answer')
+        if correct_answer is not None:
+            if question_type == 'matching':
+                if not isinstance(correct_answer, dict):
+                    raise serializers.ValidationError({
+                        'correct_answer': 'Matching uchun {"1": "A", "2": "C"} ko\'rinishida bo\'lishi kerak'
+                    })
+            elif not isinstance(correct_answer, (str, list)):
+                raise serializers.ValidationError({
+                    'correct_answer': 'Javob string yoki alternativlar listi bo\'lishi kerak'
+                })
+
         return data
 
     # def validate_question_number(self, value):
@@ -75,14 +104,121 @@ class ListeningQuestionSerializer(serializers.ModelSerializer):
 
 
 
+class ListeningQuestionBulkSerializer(ListeningQuestionSerializer):
+    """
+    bulk-create uchun (faqat JSON).
+    Sectionlar view'da bitta query bilan olinadi (context['sections']),
+    question_number ixtiyoriy - berilmasa view MAX dan keyin ketma-ket beradi.
+    Rasm alohida yuklanadi: PATCH /listening-questions/{id}/ (multipart).
+    """
+    section = serializers.IntegerField()
+    question_number = serializers.IntegerField(min_value=1, required=False)
+
+    class Meta(ListeningQuestionSerializer.Meta):
+        read_only_fields = ['id', 'question_image']
+
+    def validate_section(self, value):
+        section = self.context['sections'].get(value)
+        if section is None:
+            raise serializers.ValidationError(f"Section {value} topilmadi")
+        return section
+
+
 class ListeningSectionSerializer(serializers.ModelSerializer):
-    # Sectionni o'qiganda uning ichidagi savollar sonini ham ko'rsatib ketish foydali
-    questions_count = serializers.IntegerField(source='questions.count', read_only=True)
+    # Sectionni o'qiganda uning ichidagi savollar sonini ham ko'rsatib ketish foydali.
+    # Qiymatlar view'dagi annotatsiyalardan olinadi (section uchun alohida query yo'q)
+    questions_count = serializers.SerializerMethodField()
+    total_points = serializers.SerializerMethodField()
+    test_audio_duration = serializers.SerializerMethodField(
+        help_text="Testdagi barcha sectionlar audio davomiyligi (sekund)"
+    )
+    # Bo'lakli upload orqali yuklangan audio (POST /audio-uploads/) - audio_file o'rniga
+    audio_upload = serializers.PrimaryKeyRelatedField(
+        queryset=AudioUpload.objects.filter(status='complete'), write_only=True, required=False
+    )
+    # Fayl manzili ochiq berilmaydi - imzolangan havola (teacher preview yoki faol attempt)
+    audio_url = serializers.SerializerMethodField()
 
     class Meta:
         model = ListeningSection
         fields = [
-            'id', 'test', 'section_number', 'audio_file',
-            'audio_duration', 'instructions', 'created_at', 'questions_count'
+            'id', 'test', 'section_number', 'audio_file', 'audio_upload', 'audio_url',
+            'audio_duration', 'instructions', 'created_at', 'questions_count',
+            'total_points', 'test_audio_duration'
         ]
-        read_only_fields = ['created_at', 'questions_count']
\ No newline at end of file
+        read_only_fields = ['created_at', 'questions_count', 'total_points', 'test_audio_duration']
+        extra_kwargs = {
+            'audio_file': {'required': False, 'write_only': True},
+            'audio_duration': {'required': False, 'help_text': "Fayldan aniqlanadi; aniqlab bo'lmasa qo'lda kiritiladi"},
+        }
+
+    def validate(self, attrs):
+        """Audio davomiyligi fayldan olinadi - qo'lda kiritilgan qiymat faqat zaxira"""
+        upload = attrs.pop('audio_upload', None)
+        if upload is not None:
+            user = self.context['request'].user
+            if upload.created_by_id != user.id and not user.is_staff:
+                raise serializers.ValidationError({'audio_upload': "Bu upload sizga tegishli emas"})
+            attrs['audio_file'] = upload.audio_file.name
+            attrs['audio_duration'] = upload.audio_duration
+            self._audio_upload = upload
+        elif attrs.get('audio_file') is not None:
+            duration = probe_uploaded_file(attrs['audio_file'])
+            if duration:
+                attrs['audio_duration'] = duration
+            elif attrs.get('audio_duration') is None:
+                raise serializers.ValidationError({
+                    'audio_duration': "Audio davomiyligini fayldan aniqlab bo'lmadi - qo'lda kiriting"
+                })
+
+        if self.instance is None:
+            if not attrs.get('audio_file'):
+                raise serializers.ValidationError({'audio_file': "audio_file yoki audio_upload majburiy"})
+            if attrs.get('audio_duration') is None:
+                raise serializers.ValidationError({'audio_duration': "Bu maydon majburiy"})
+        return attrs
+
+    def _link_upload(self, section):
+        upload = getattr(self, '_audio_upload', None)
+        if upload is not None and upload.section_id != section.id:
+            upload.section = section
+            upload.save(update_fields=['section', 'updated_at'])
+
+    def create(self, validated_data):
+        section = super().create(validated_data)
+        self._link_upload(section)
+        return section
+
+    def update(self, instance, validated_data):
+        section = super().update(instance, validated_data)
+        self._link_upload(section)
+        return section
+
+    def get_audio_url(self, obj):
+        request = self.context.get('request')
+        if request is None or not request.user.is_authenticated or not obj.audio_file:
+            return None
+        if can_preview_audio(request.user):
+            return section_audio_url(request, obj.id, preview=True)
+        # Ro'yxatda bir testning sectionlari - attempt bir marta qidiriladi
+        attempts = self.context.setdefault('audio_attempts', {})
+        if obj.test_id not in attempts:
+            attempts[obj.test_id] = active_listening_attempt_id(request.user, obj.test_id)
+        return section_audio_url(request, obj.id, attempt_id=attempts[obj.test_id])
+
+    def get_questions_count(self, obj):
+        if hasattr(obj, 'questions_count'):
+            return obj.questions_count
+        return obj.questions.count()
+
+    def get_total_points(self, obj):
+        if hasattr(obj, 'total_points'):
+            return obj.total_points
+        return obj.questions.aggregate(total=Sum('points'))['total'] or 0
+
+    def get_test_audio_duration(self, obj):
+        if hasattr(obj, 'test_audio_duration'):
+            return obj.test_audio_duration
+        return ListeningSection.objects.filter(test_id=obj.test_id).aggregate(
+            total=Sum('audio_duration')
+        )['total'] or 0
\ No newline at end of file
@@ -0,0 +1,13 @@
+from rest_framework import serializers
+
+from dashboard.search import SEARCH_TARGETS
+
+
+class ContentSearchHitSerializer(serializers.Serializer):
+    """Qidiruv natijasi - headline da mos so'zlar <mark> ichida"""
+    kind = serializers.ChoiceField(choices=list(SEARCH_TARGETS))
+    id = serializers.IntegerField()
+    test_id = serializers.IntegerField()
+    test_title = serializers.CharField()
+    rank = serializers.FloatField()
+    headline = serializers.CharField()
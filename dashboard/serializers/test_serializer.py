@@ -1,12 +1,33 @@
 from rest_framework import serializers
-from app.models import Test
+from app.models import Test, TestSummary
+from app.services.test_summary import get_test_summary
 
 
 
 
+class TestSummarySerializer(serializers.ModelSerializer):
+    """Test tarkibi - tayyor hisoblangan (COUNT siz)"""
+
+    class Meta:
+        model = TestSummary
+        fields = [
+            'listening_sections',
+            'listening_questions',
+            'reading_passages',
+            'reading_questions',
+            'writing_tasks',
+            'audio_duration',
+            'total_points',
+            'is_ready',
+            'updated_at'
+        ]
+        read_only_fields = fields
+
+
 class TestSerializer(serializers.ModelSerializer):
 
     created_by = serializers.StringRelatedField(read_only=True)
+    summary = TestSummarySerializer(read_only=True)
 
     class Meta:
         model = Test
@@ -18,6 +39,25 @@ class TestSerializer(serializers.ModelSerializer):
             'is_published',
             'created_by',
             'created_at',
-            'updated_at'
+            'updated_at',
+            'parent',
+            'version',
+            'frozen_at',
+            'summary'
         ]
-        read_only_fields = ['created_at', 'updated_at', 'created_by']
+        read_only_fields = ['created_at', 'updated_at', 'created_by', 'parent', 'version', 'frozen_at']
+
+    def validate_is_published(self, value):
+        """To'liq bo'lmagan testni nashr qilib bo'lmaydi"""
+        if not value or (self.instance is not None and self.instance.is_published):
+            return value
+        if self.instance is None:
+            raise serializers.ValidationError("Yangi test bo'sh - avval kontent qo'shing, keyin nashr qiling")
+
+        summary = get_test_summary(self.instance)
+        if not summary.is_ready:
+            raise serializers.ValidationError({
+                'detail': "Test to'liq emas",
+                'missing': summary.missing(),
+            })
+        return value
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from app.models import WritingTask, Test
+from app.services.image_derivatives import image_variant_urls
 
 
 class WritingTaskSerializer(serializers.ModelSerializer):
@@ -50,6 +51,8 @@ class WritingTaskListSerializer(serializers.ModelSerializer):
     """
     test_title = serializers.CharField(source='test.title', read_only=True)
     task_type_display = serializers.CharField(source='get_task_type_display', read_only=True)
+    # Kichraytirilgan rasm variantlari: {'thumb': {'webp': url, 'jpeg': url}, ...}
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = WritingTask
@@ -62,12 +65,16 @@ class WritingTaskListSerializer(serializers.ModelSerializer):
             'task_type_display',
             'prompt_text',
             'image',
+            'image_variants',
             'instructions',
             # 'word_limit',
             # 'time_suggestion'
         ]
         read_only_fields = fields  # Barcha maydonlar faqat o'qish uchun
 
+    def get_image_variants(self, obj):
+        return image_variant_urls(obj.image, 'writing-task', obj.pk, self.context.get('request'))
+
 
 class WritingTaskDetailSerializer(serializers.ModelSerializer):
     """
@@ -75,6 +82,8 @@ class WritingTaskDetailSerializer(serializers.ModelSerializer):
     """
     test_title = serializers.CharField(source='test.title', read_only=True)
     task_type_display = serializers.CharField(source='get_task_type_display', read_only=True)
+    # Kichraytirilgan rasm variantlari: {'thumb': {'webp': url, 'jpeg': url}, ...}
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = WritingTask
@@ -87,8 +96,12 @@ class WritingTaskDetailSerializer(serializers.ModelSerializer):
             'task_type_display',
             'prompt_text',
             'image',
+            'image_variants',
             'instructions',
             # 'word_limit',
             # 'time_suggestion',
             'created_at'
-        ]
\ No newline at end of file
+        ]
+
+    def get_image_variants(self, obj):
+        return image_variant_urls(obj.image, 'writing-task', obj.pk, self.context.get('request'))
@@ -0,0 +1,191 @@
+import threading
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from rest_framework.test import APIClient
+
+from app.models import (
+    ListeningQuestion, ListeningSection, ReadingPassage, ReadingQuestion, Test, User, WritingTask,
+)
+
+
+class ReadingPassageQueryCountTests(TestCase):
+    """Reading passage endpointlari - query soni passage/savollar soniga bog'liq emas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user(username='teacher', password='x', role='teacher')
+        cls.test = Test.objects.create(title='Mock 1', created_by=cls.teacher)
+        cls.passages = [
+            ReadingPassage.objects.create(
+                test=cls.test, passage_number=number, title=f'Passage {number}', passage_text='text'
+            )
+            for number in (1, 2, 3)
+        ]
+        for passage in cls.passages:
+            ReadingQuestion.objects.bulk_create([
+                ReadingQuestion(
+                    passage=passage, question_number=number, question_text=f'Q{number}',
+                    question_type='true_false', correct_answer='True',
+                )
+                for number in range(1, 6)
+            ])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+
+    def test_list_query_count(self):
+        # conditional validator (MAX updated_at) + passagelar (test JOIN, savollar soni)
+        with self.assertNumQueries(2):
+            response = self.client.get('/dashboard/passages/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 3)
+
+    def test_list_by_test_query_count(self):
+        # test + passagelar + barcha savollar bitta prefetch bilan
+        with self.assertNumQueries(3):
+            response = self.client.get('/dashboard/passages/', {'test_id': self.test.id})
+        self.assertEqual(response.status_code, 200)
+
+    def test_retrieve_query_count(self):
+        # validator + passage + savollar
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/dashboard/passages/{self.passages[0].id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['questions']), 5)
+
+
+class ListeningSectionQueryCountTests(TestCase):
+    """Listening section endpointlari - statistikalar subquery bilan, N+1 yo'q"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user(username='teacher', password='x', role='teacher')
+        cls.test = Test.objects.create(title='Mock 1', created_by=cls.teacher)
+        cls.sections = [
+            ListeningSection.objects.create(
+                test=cls.test, section_number=number, audio_file=f'listening/audios/s{number}.mp3',
+                audio_duration=300,
+            )
+            for number in (1, 2, 3, 4)
+        ]
+        for section in cls.sections:
+            ListeningQuestion.objects.bulk_create([
+                ListeningQuestion(
+                    section=section, question_number=number, question_text=f'Q{number}',
+                    question_type='short_answer', correct_answer='answer',
+                )
+                for number in range(1, 11)
+            ])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+
+    def test_list_query_count(self):
+        # conditional validator + sectionlar (savollar soni, ball, davomiylik subquery)
+        with self.assertNumQueries(2):
+            response = self.client.get('/dashboard/listening-sections/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 4)
+        self.assertEqual(response.data[0]['questions_count'], 10)
+
+    def test_list_by_test_query_count(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/dashboard/listening-sections/', {'test_id': self.test.id})
+        self.assertEqual(response.status_code, 200)
+
+    def test_retrieve_query_count(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/dashboard/listening-sections/{self.sections[0].id}/')
+        self.assertEqual(response.status_code, 200)
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentNumberingTests(TransactionTestCase):
+    """Parallel muharrirlar - ota qator bloki tufayli raqamlar takrorlanmaydi"""
+
+    WRITERS = 6
+
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(username='teacher', password='x', role='teacher')
+        self.test = Test.objects.create(title='Mock 1', created_by=self.teacher)
+        self.passage = ReadingPassage.objects.create(
+            test=self.test, passage_number=1, title='Passage 1', passage_text='text'
+        )
+
+    def run_concurrently(self, request):
+        """WRITERS ta thread bir vaqtda so'rov yuboradi; status kodlar qaytadi"""
+        barrier = threading.Barrier(self.WRITERS)
+        statuses = []
+
+        def writer():
+            client = APIClient()
+            client.force_authenticate(self.teacher)
+            try:
+                barrier.wait()
+                statuses.append(request(client).status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=writer) for _ in range(self.WRITERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return statuses
+
+    def question_payload(self, count):
+        return [
+            {
+                'passage': self.passage.id, 'question_text': f'Q{index}',
+                'question_type': 'true_false', 'question_data': {}, 'correct_answer': 'True',
+            }
+            for index in range(count)
+        ]
+
+    def test_bulk_create_numbers_are_unique(self):
+        statuses = self.run_concurrently(
+            lambda client: client.post(
+                '/dashboard/questions/bulk_create/', self.question_payload(5), format='json'
+            )
+        )
+        self.assertEqual(statuses, [201] * self.WRITERS)
+
+        numbers = list(
+            ReadingQuestion.objects.filter(passage=self.passage).order_by('question_number')
+            .values_list('question_number', flat=True)
+        )
+        self.assertEqual(numbers, list(range(1, self.WRITERS * 5 + 1)))
+
+    def test_single_create_numbers_are_unique(self):
+        statuses = self.run_concurrently(
+            lambda client: client.post(
+                '/dashboard/questions/', self.question_payload(1)[0], format='json'
+            )
+        )
+        self.assertEqual(statuses, [201] * self.WRITERS)
+
+        numbers = list(
+            ReadingQuestion.objects.filter(passage=self.passage).order_by('question_number')
+            .values_list('question_number', flat=True)
+        )
+        self.assertEqual(numbers, list(range(1, self.WRITERS + 1)))
+
+    def test_writing_bulk_create_allocates_two_tasks_once(self):
+        payload = [
+            {'test': self.test.id, 'task_type': task_type, 'prompt_text': 'prompt'}
+            for task_type in ('TASK_1', 'TASK_2')
+        ]
+        statuses = self.run_concurrently(
+            lambda client: client.post('/dashboard/writing-tasks/bulk_create/', payload, format='json')
+        )
+        self.assertEqual(sorted(statuses), [201] + [400] * (self.WRITERS - 1))
+        self.assertEqual(
+            list(WritingTask.objects.filter(test=self.test).values_list('task_number', flat=True)), [1, 2]
+        )
@@ -3,7 +3,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 from dashboard.views import ListeningSectionViewSet, ListeningQuestionViewSet, TestViewSet, ReadingQuestionViewSet, \
-    ReadingPassageViewSet, WritingTaskViewSet
+    ReadingPassageViewSet, WritingTaskViewSet, ContentSearchView, AudioUploadViewSet
 
 
 
@@ -15,9 +15,11 @@ router.register(r'Tests', TestViewSet, basename='Ielts-tests')
 router.register(r'passages', ReadingPassageViewSet, basename='reading-passage')
 router.register(r'questions', ReadingQuestionViewSet, basename='reading-question')
 router.register(r'writing-tasks', WritingTaskViewSet, basename='writing-task')
+router.register(r'audio-uploads', AudioUploadViewSet, basename='audio-upload')
 
 
 
 urlpatterns = [
+    path('search/', ContentSearchView.as_view(), name='content-search'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
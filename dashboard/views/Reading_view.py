@@ -1,10 +1,18 @@
 # views.py
+from functools import partial
+
 from drf_spectacular.types import OpenApiTypes
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Count, Prefetch
 from django.shortcuts import get_object_or_404
 from app.models import ReadingPassage, ReadingQuestion, Test
+from app.models.numbering import lock_last_numbers
+from app.services.content_version import touch_test
+from app.services.scoring import invalidate_answer_key
+from app.services.test_summary import refresh_test_summary
 from dashboard.serializers import (
     ReadingPassageSerializer,
     ReadingPassageListSerializer,
@@ -13,20 +21,53 @@ from dashboard.serializers import (
     ReadingQuestionListSerializer,
     TestReadingOverviewSerializer, ReadingPassageTestSerializer
 )
-from dashboard.custom_permission import IsTeacherOrAdminOrReadOnly
+from dashboard.conditional import ConditionalContentMixin, conditional_content
+from dashboard.custom_permission import IsTeacherOrAdminOrReadOnly, IsTestContentEditable, request_values
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 
+def annotated_passages():
+    """Passagelar + savollar soni (har bir passage uchun alohida COUNT yo'q)"""
+    return ReadingPassage.objects.annotate(questions_count=Count('questions')).order_by('passage_number')
+
+
+def ordered_questions_prefetch():
+    return Prefetch('questions', queryset=ReadingQuestion.objects.order_by('question_number'))
+
+
+def reading_overview_queryset():
+    """TestReadingOverviewSerializer uchun - o'zgarmas sondagi query"""
+    return Test.objects.prefetch_related(
+        Prefetch(
+            'reading_passages',
+            queryset=annotated_passages().prefetch_related(ordered_questions_prefetch())
+        )
+    )
+
+
+def reading_passages_by_test_queryset():
+    """ReadingPassageTestSerializer uchun - savollarsiz, faqat soni"""
+    return Test.objects.prefetch_related(
+        Prefetch('reading_passages', queryset=annotated_passages())
+    )
+
+
 @extend_schema(tags=['Reading_passage crud'])
-class ReadingPassageViewSet(viewsets.ModelViewSet):
+class ReadingPassageViewSet(ConditionalContentMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Reading Passages
 
     Teachers: Full CRUD access
     Students: Read-only access
     """
-    queryset = ReadingPassage.objects.all().select_related('test').prefetch_related('questions')
-    permission_classes = [IsTeacherOrAdminOrReadOnly]
+    queryset = ReadingPassage.objects.all().select_related('test')
+    permission_classes = [IsTeacherOrAdminOrReadOnly, IsTestContentEditable]
+
+    def get_request_test_ids(self, request):
+        return request_values(request.data, 'test')
+
+    def get_object_test_id(self, obj):
+        return obj.test_id
 
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -38,12 +79,16 @@ class ReadingPassageViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filter passages by test_id if provided"""
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().annotate(questions_count=Count('questions'))
         test_id = self.request.query_params.get('test_id')
 
         if test_id:
             queryset = queryset.filter(test_id=test_id)
 
+        # Savollar faqat ReadingPassageSerializer (detail) uchun kerak
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(ordered_questions_prefetch())
+
         return queryset.order_by('passage_number')
 
     @extend_schema(
@@ -67,7 +112,7 @@ class ReadingPassageViewSet(viewsets.ModelViewSet):
 
         if test_id:
             # Test ID berilgan bo'lsa - to'liq ma'lumot
-            test = get_object_or_404(Test, pk=test_id)
+            test = get_object_or_404(reading_overview_queryset(), pk=test_id)
             serializer = TestReadingOverviewSerializer(test, context={'request': request})
             return Response(serializer.data)
 
@@ -102,10 +147,11 @@ class ReadingPassageViewSet(viewsets.ModelViewSet):
         return Response(output_serializer.data)
 
     @action(detail=True, methods=['get'])
+    @conditional_content
     def questions(self, request, pk=None):
         """Get all questions for a specific passage"""
         passage = self.get_object()
-        questions = passage.questions.all().order_by('question_number')
+        questions = ReadingQuestion.objects.filter(passage=passage).order_by('question_number')
 
         # Show different data based on user role
         if request.user.role == 'teacher' or request.user.role == 'admin':
@@ -132,6 +178,7 @@ class ReadingPassageViewSet(viewsets.ModelViewSet):
         }
     )
     @action(detail=False, methods=['get'])
+    @conditional_content
     def by_test(self, request):
         """Get all passages for a specific test with overview"""
         test_id = request.query_params.get('test_id')
@@ -142,7 +189,7 @@ class ReadingPassageViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        test = get_object_or_404(Test, pk=test_id)
+        test = get_object_or_404(reading_passages_by_test_queryset(), pk=test_id)
         serializer = ReadingPassageTestSerializer(test)
         return Response(serializer.data)
 
@@ -157,7 +204,14 @@ class ReadingQuestionViewSet(viewsets.ModelViewSet):
     Students: Read-only access (without correct_answer)
     """
     queryset = ReadingQuestion.objects.all().select_related('passage')
-    permission_classes = [IsTeacherOrAdminOrReadOnly]
+    permission_classes = [IsTeacherOrAdminOrReadOnly, IsTestContentEditable]
+
+    def get_request_test_ids(self, request):
+        passage_ids = request_values(request.data, 'passage')
+        return ReadingPassage.objects.filter(pk__in=passage_ids).values_list('test_id', flat=True)
+
+    def get_object_test_id(self, obj):
+        return obj.passage.test_id
 
     def get_serializer_class(self):
         """Return appropriate serializer based on user role"""
@@ -262,8 +316,28 @@ class ReadingQuestionViewSet(viewsets.ModelViewSet):
 
         serializer = ReadingQuestionSerializer(data=request.data, many=True)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+        with transaction.atomic():
+            # Passagelarni bloklab oxirgi raqamlar - raqamlash xotirada, bitta INSERT
+            next_numbers = lock_last_numbers(
+                ReadingQuestion, 'passage', 'question_number',
+                [item['passage'].id for item in serializer.validated_data]
+            )
+            questions = []
+            for item in serializer.validated_data:
+                question = ReadingQuestion(**item)
+                next_numbers[question.passage_id] += 1
+                question.question_number = next_numbers[question.passage_id]
+                questions.append(question)
+            ReadingQuestion.objects.bulk_create(questions)
+
+            # bulk_create post_save signal yubormaydi - cache'larni qo'lda eskirtirish
+            for test_id in {item['passage'].test_id for item in serializer.validated_data}:
+                touch_test(test_id)
+                transaction.on_commit(partial(invalidate_answer_key, 'reading', test_id))
+                refresh_test_summary(test_id)
+
+        return Response(ReadingQuestionSerializer(questions, many=True).data, status=status.HTTP_201_CREATED)
 
 
 
@@ -1,4 +1,7 @@
 from .listening_view import *
 from .test_view import *
 from .Reading_view import *
-from .writing_view import *
\ No newline at end of file
+from .writing_view import *
+from .search_view import *
+
+from .audio_upload_view import *
@@ -0,0 +1,95 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+
+from app.custom_permission import IsTeacherOrAdmin
+from app.models import AudioUpload
+from app.services.audio_upload import UploadError, complete_upload, start_upload, write_chunk
+from app.services.test_versions import FrozenTestError
+from dashboard.serializers import AudioUploadSerializer, AudioUploadStartSerializer
+
+
+def upload_error_response(error):
+    body = {'error': str(error)}
+    if error.offset is not None:
+        body['offset'] = error.offset
+    return Response(body, status=error.status)
+
+
+@extend_schema(tags=['Audio Upload'])
+class AudioUploadViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Section audiosi uchun bo'lakli, qayta davom ettiriladigan upload.
+
+    1. POST /audio-uploads/ {filename, total_size, sha256?, section?}
+    2. PUT /audio-uploads/{id}/chunk/ - xom baytlar, Content-Range: bytes start-end/total
+    3. GET /audio-uploads/{id}/ - uzilishdan keyin `received` dan davom etish
+    4. POST /audio-uploads/{id}/complete/ - checksum, davomiylik, section ga biriktirish
+    """
+    serializer_class = AudioUploadSerializer
+    permission_classes = [IsTeacherOrAdmin]
+    parser_classes = [JSONParser]
+
+    def get_queryset(self):
+        queryset = AudioUpload.objects.all()
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(created_by=self.request.user)
+        return queryset
+
+    @extend_schema(
+        summary="Upload sessiyasini ochish",
+        request=AudioUploadStartSerializer,
+        responses={201: AudioUploadSerializer, 400: OpenApiTypes.OBJECT}
+    )
+    def create(self, request):
+        serializer = AudioUploadStartSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            upload = start_upload(request.user, **serializer.validated_data)
+        except UploadError as e:
+            return upload_error_response(e)
+        except FrozenTestError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(AudioUploadSerializer(upload).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Bo'lak yuborish",
+        description="So'rov tanasi - xom baytlar (application/octet-stream). Bo'lak joriy offset dan "
+                    "boshlanishi kerak, aks holda 409 va to'g'ri `offset` qaytadi.",
+        parameters=[
+            OpenApiParameter(
+                name='Content-Range', type=OpenApiTypes.STR, location=OpenApiParameter.HEADER, required=True,
+                description='bytes start-end/total'
+            )
+        ],
+        request={'application/octet-stream': OpenApiTypes.BINARY},
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT, 409: OpenApiTypes.OBJECT}
+    )
+    @action(detail=True, methods=['put'])
+    def chunk(self, request, pk=None):
+        upload = self.get_object()
+        try:
+            # request.data ga tegilmaydi - tana oqimdan to'g'ridan-to'g'ri diskka
+            offset = write_chunk(upload.pk, request.stream, request.headers.get('Content-Range'))
+        except UploadError as e:
+            return upload_error_response(e)
+        return Response({'offset': offset, 'total_size': upload.total_size}, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Uploadni yakunlash",
+        request=None,
+        responses={200: AudioUploadSerializer, 400: OpenApiTypes.OBJECT, 409: OpenApiTypes.OBJECT}
+    )
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        upload = self.get_object()
+        try:
+            upload = complete_upload(upload.pk)
+        except UploadError as e:
+            return upload_error_response(e)
+        except FrozenTestError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(AudioUploadSerializer(upload).data, status=status.HTTP_200_OK)
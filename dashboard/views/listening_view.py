@@ -1,21 +1,58 @@
+from functools import partial
+
+from django.conf import settings
+from django.urls import reverse
 from drf_spectacular.types import OpenApiTypes
 from rest_framework import viewsets, status, parsers
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 
-from dashboard.custom_permission import IsTeacherOrAdminOrReadOnly
+from dashboard.conditional import ConditionalContentMixin
+from dashboard.custom_permission import IsTeacherOrAdminOrReadOnly, IsTestContentEditable, request_values
 from app.models import ListeningSection, ListeningQuestion
-from dashboard.serializers import ListeningSectionSerializer, ListeningQuestionSerializer
-
-
+from app.models.numbering import lock_last_numbers
+from dashboard.serializers import (
+    ListeningSectionSerializer, ListeningQuestionSerializer, ListeningQuestionBulkSerializer
+)
+from app.services.scoring import invalidate_answer_key
+from app.services.content_version import touch_test
+from app.services.test_summary import refresh_test_summary
+from app.services.media_storage import sync_media_refs_on_commit
+from app.services.audio_delivery import make_audio_token
+
+
+def annotate_section_stats(queryset):
+    """
+    Har bir section uchun savollar soni, jami ball va test audio davomiyligi -
+    bitta SELECT ichidagi correlated subquery'lar bilan
+    """
+    section_questions = ListeningQuestion.objects.filter(section=OuterRef('pk')).order_by().values('section')
+    test_sections = ListeningSection.objects.filter(test=OuterRef('test')).order_by().values('test')
+
+    return queryset.annotate(
+        questions_count=Coalesce(
+            Subquery(section_questions.annotate(total=Count('id')).values('total'), output_field=IntegerField()),
+            0
+        ),
+        total_points=Coalesce(
+            Subquery(section_questions.annotate(total=Sum('points')).values('total'), output_field=IntegerField()),
+            0
+        ),
+        test_audio_duration=Coalesce(
+            Subquery(test_sections.annotate(total=Sum('audio_duration')).values('total'), output_field=IntegerField()),
+            0
+        ),
+    )
 
 
 @extend_schema(tags=["Listening_section"])
-class ListeningSectionViewSet(viewsets.ModelViewSet):
+class ListeningSectionViewSet(ConditionalContentMixin, viewsets.ModelViewSet):
     """
     Listening Sectionlari bilan ishlash:
     - Audio yuklash (multipart/form-data)
@@ -24,13 +61,19 @@ class ListeningSectionViewSet(viewsets.ModelViewSet):
     """
     queryset = ListeningSection.objects.all()
     serializer_class = ListeningSectionSerializer
-    permission_classes = [IsTeacherOrAdminOrReadOnly]
-    parser_classes = [parsers.MultiPartParser, parsers.FormParser]
+    permission_classes = [IsTeacherOrAdminOrReadOnly, IsTestContentEditable]
+    parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     ordering = ['id']
 
+    def get_request_test_ids(self, request):
+        return request_values(request.data, 'test')
+
+    def get_object_test_id(self, obj):
+        return obj.test_id
+
     def get_queryset(self):
         """Test ID bo'yicha filterlash imkonini beradi: /sections/?test_id=1"""
-        queryset = super().get_queryset()
+        queryset = annotate_section_stats(super().get_queryset())
         test_id = self.request.query_params.get('test_id')
         if test_id:
             queryset = queryset.filter(test_id=test_id)
@@ -80,8 +123,9 @@ class ListeningSectionViewSet(viewsets.ModelViewSet):
         Yangi listening section yaratish. 
         - Section raqami 1-4 oralig'ida bo'lishi kerak
         - Har bir test uchun section_number unique bo'lishi kerak
-        - Audio fayl majburiy
-        - Audio duration sekundlarda kiritiladi
+        - Audio fayl (yoki tugagan audio_upload) majburiy
+        - Audio duration fayldan aniqlanadi (aniqlab bo'lmasa qo'lda kiritiladi)
+        - Katta fayllar uchun bo'lakli upload: POST /audio-uploads/
         """,
         request={
             'multipart/form-data': {
@@ -102,9 +146,14 @@ class ListeningSectionViewSet(viewsets.ModelViewSet):
                         'format': 'binary',
                         'description': 'Audio fayl (MP3, WAV, va boshqalar) - majburiy'
                     },
+                    'audio_upload': {
+                        'type': 'string',
+                        'format': 'uuid',
+                        'description': 'Tugagan bo\'lakli upload ID (audio_file o\'rniga)'
+                    },
                     'audio_duration': {
                         'type': 'integer',
-                        'description': 'Audio davomiyligi (sekundlarda) - majburiy',
+                        'description': 'Audio davomiyligi (sekundlarda) - fayldan aniqlanmasa majburiy',
                         'example': 180
                     },
                     'instructions': {
@@ -113,7 +162,7 @@ class ListeningSectionViewSet(viewsets.ModelViewSet):
                         'example': 'Listen carefully and answer questions 1-10'
                     }
                 },
-                'required': ['test', 'section_number', 'audio_file', 'audio_duration']
+                'required': ['test', 'section_number']
             }
         },
         examples=[
@@ -177,7 +226,7 @@ class ListeningSectionViewSet(viewsets.ModelViewSet):
                         'description': 'Section ko\'rsatmalari'
                     }
                 },
-                'required': ['test', 'section_number', 'audio_duration']
+                'required': ['test', 'section_number']
             }
         },
         responses={
@@ -260,6 +309,26 @@ class ListeningSectionViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
+    @extend_schema(
+        summary="Audio preview havolasi (Teacher/Admin)",
+        description="Imzolangan, muddatli havola - Range qo'llab uzatiladi (/web/audio/{token}/).",
+        request=None,
+        responses={200: OpenApiTypes.OBJECT, 403: OpenApiTypes.OBJECT}
+    )
+    @action(detail=True, methods=['get'])
+    def audio_url(self, request, pk=None):
+        if not (request.user.is_staff or request.user.role in ['admin', 'teacher']):
+            return Response(
+                {'error': 'Faqat teacher yoki admin'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        section = self.get_object()
+        token = make_audio_token(section.id, user_id=request.user.id)
+        return Response({
+            'url': request.build_absolute_uri(reverse('section-audio', args=[token])),
+            'expires_in': settings.AUDIO_URL_MAX_AGE,
+        })
+
 
 @extend_schema(tags=['Listening Question'])
 class ListeningQuestionViewSet(viewsets.ModelViewSet):
@@ -269,7 +338,7 @@ class ListeningQuestionViewSet(viewsets.ModelViewSet):
     Teachers/Admin: Full CRUD access
     """
     serializer_class = ListeningQuestionSerializer
-    permission_classes = [IsTeacherOrAdminOrReadOnly]
+    permission_classes = [IsTeacherOrAdminOrReadOnly, IsTestContentEditable]
     parser_classes = [parsers.MultiPartParser, parsers.JSONParser]
 
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
@@ -281,6 +350,13 @@ class ListeningQuestionViewSet(viewsets.ModelViewSet):
         """Optimized queryset with select_related"""
         return ListeningQuestion.objects.select_related('section', 'section__test')
 
+    def get_request_test_ids(self, request):
+        section_ids = request_values(request.data, 'section')
+        return ListeningSection.objects.filter(pk__in=section_ids).values_list('test_id', flat=True)
+
+    def get_object_test_id(self, obj):
+        return obj.section.test_id
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -325,7 +401,7 @@ class ListeningQuestionViewSet(viewsets.ModelViewSet):
                     },
                     'question_data': {'type': 'object'},
                     'question_image': {'type': 'string', 'format': 'binary'},
-                    # 'correct_answer': {'type': 'string'},
+                    'correct_answer': {'type': 'object'},
                 },
                 'required': ['section', 'question_type']
             }
@@ -343,7 +419,8 @@ class ListeningQuestionViewSet(viewsets.ModelViewSet):
         - matching: question_data = {"left": [...], "right": [...]}
         - table: question_data = {"headers": [...], "rows": [...]} OR question_image
 
-        Note: correct_answer can be a string or JSON object
+        Note: correct_answer can be a string, a list of alternates or
+        (for matching) a JSON object like {"1": "C", "2": "A"}
         """
     )
     def create(self, request, *args, **kwargs):
@@ -364,7 +441,7 @@ class ListeningQuestionViewSet(viewsets.ModelViewSet):
                     },
                     'question_data': {'type': 'object'},
                     'question_image': {'type': 'string', 'format': 'binary'},
-                    # 'correct_answer': {'type': 'object'},
+                    'correct_answer': {'type': 'object'},
                 }
             }
         },
@@ -391,7 +468,7 @@ class ListeningQuestionViewSet(viewsets.ModelViewSet):
                     },
                     'question_data': {'type': 'object'},
                     'question_image': {'type': 'string', 'format': 'binary'},
-                    # 'correct_answer': {'type': 'object'},
+                    'correct_answer': {'type': 'object'},
                 }
             }
         },
@@ -415,7 +492,10 @@ class ListeningQuestionViewSet(viewsets.ModelViewSet):
                             'type': 'integer',
                             'description': 'Section ID'
                         },
-
+                        'question_number': {
+                            'type': 'integer',
+                            'description': 'Ixtiyoriy - berilmasa avtomatik'
+                        },
                         'question_text': {
                             'type': 'string',
                             'description': 'Savol matni'
@@ -431,8 +511,7 @@ class ListeningQuestionViewSet(viewsets.ModelViewSet):
                             'example': {"options": ["A) Economy", "B) Technology"]}
                         },
                         'correct_answer': {
-                            'type': 'string',
-                            'description': 'To\'g\'ri javob'
+                            'description': 'To\'g\'ri javob: "A", ["answer1", "answer2"] yoki {"1": "C"}'
                         }
                     },
                     'required': ['section', 'question_type']
@@ -443,12 +522,14 @@ class ListeningQuestionViewSet(viewsets.ModelViewSet):
                         "question_text": "What is the main topic?",
                         "question_type": "multiple_choice",
                         "question_data": {"options": ["A) Economy", "B) Technology"]},
+                        "correct_answer": "B",
                     },
                     {
                         "section": 1,
                         "question_text": "Complete: The speaker mentions ___",
                         "question_type": "completion",
-                        "question_data": {},
+                        "question_data": {"word_limit": 2},
+                        "correct_answer": ["city hall", "town hall"],
                     }
                 ]
             }
@@ -479,6 +560,8 @@ class ListeningQuestionViewSet(viewsets.ModelViewSet):
         Create multiple listening questions at once.
         Send an array of question objects.
         Optional: Add ?test_id=X to validate all sections belong to test X
+        Optional: question_number per item - otherwise numbers continue after the section's last question
+        Images are not accepted here - upload them with PATCH /listening-questions/{id}/ (multipart)
         """
     )
     @action(detail=False, methods=['post'], url_path='bulk-create')
@@ -497,23 +580,15 @@ class ListeningQuestionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # 2. Serializer validation
-        serializer = self.get_serializer(data=request.data, many=True)
-
-        if not serializer.is_valid():
+        if not all(isinstance(item, dict) for item in request.data):
             return Response(
-                {"error": "Validation xatosi", "details": serializer.errors},
+                {"error": "Har bir element obyekt bo'lishi kerak"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # 3. test_id parametrini olish
+        # 2. test_id parametrini olish
         target_test_id = request.query_params.get('test_id')
-
-        # 4. Section validatsiyasi
-        section_ids = {item['section'].id for item in serializer.validated_data}
-
         if target_test_id:
-            # test_id ko'rsatilgan bo'lsa
             try:
                 target_test_id = int(target_test_id)
             except ValueError:
@@ -522,46 +597,46 @@ class ListeningQuestionViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            valid_sections = ListeningSection.objects.filter(
-                id__in=section_ids,
-                test_id=target_test_id
-            ).values_list('id', flat=True)
+        # 3. Sectionlar - bitta query (har bir element uchun alohida lookup yo'q)
+        section_ids = set()
+        for item in request.data:
+            try:
+                section_ids.add(int(item.get('section')))
+            except (TypeError, ValueError):
+                pass
+        sections = ListeningSection.objects.in_bulk(section_ids)
 
-            if set(valid_sections) != section_ids:
-                invalid_sections = section_ids - set(valid_sections)
+        if target_test_id:
+            invalid_sections = {pk for pk, section in sections.items() if section.test_id != target_test_id}
+            if invalid_sections:
                 return Response(
                     {
                         "error": f"Barcha savollar test_id={target_test_id} ga tegishli bo'lishi kerak",
-                        "invalid_section_ids": list(invalid_sections)
-                    },
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        else:
-            # test_id ko'rsatilmagan bo'lsa - section mavjudligini tekshirish
-            existing_sections = ListeningSection.objects.filter(
-                id__in=section_ids
-            ).values_list('id', flat=True)
-
-            if set(existing_sections) != section_ids:
-                missing_sections = section_ids - set(existing_sections)
-                return Response(
-                    {
-                        "error": "Ba'zi section ID lar mavjud emas",
-                        "missing_section_ids": list(missing_sections)
+                        "invalid_section_ids": sorted(invalid_sections)
                     },
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-        # 5. Duplicate question_number tekshirish
-        section_question_numbers = {}
+        # 4. Serializer validation (section context'dan olinadi)
+        serializer = ListeningQuestionBulkSerializer(
+            data=request.data, many=True,
+            context={**self.get_serializer_context(), 'sections': sections}
+        )
+        if not serializer.is_valid():
+            return Response(
+                {"error": "Validation xatosi", "details": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # 5. So'rov ichidagi takroriy question_number lar
+        requested_numbers = {}
         for item in serializer.validated_data:
+            question_num = item.get('question_number')
+            if question_num is None:
+                continue
             section_id = item['section'].id
-            question_num = item['question_number']
-
-            if section_id not in section_question_numbers:
-                section_question_numbers[section_id] = []
-
-            if question_num in section_question_numbers[section_id]:
+            numbers = requested_numbers.setdefault(section_id, set())
+            if question_num in numbers:
                 return Response(
                     {
                         "error": f"Section {section_id} da {question_num} raqamli savol takrorlanmoqda",
@@ -570,46 +645,73 @@ class ListeningQuestionViewSet(viewsets.ModelViewSet):
                     },
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            numbers.add(question_num)
 
-            section_question_numbers[section_id].append(question_num)
-
-        # 6. Mavjud question_number lar bilan konflikt tekshirish
-        for section_id, question_numbers in section_question_numbers.items():
-            existing_questions = ListeningQuestion.objects.filter(
-                section_id=section_id,
-                question_number__in=question_numbers
-            ).values_list('question_number', flat=True)
-
-            if existing_questions:
-                return Response(
-                    {
-                        "error": f"Section {section_id} da ushbu raqamli savollar allaqachon mavjud",
-                        "section_id": section_id,
-                        "existing_question_numbers": list(existing_questions)
-                    },
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-        # 7. Saqlash
         try:
             with transaction.atomic():
-                questions = serializer.save()
-                response_serializer = self.get_serializer(questions, many=True)
-
-                return Response(
-                    {
-                        "message": f"{len(questions)} ta savol muvaffaqiyatli yaratildi",
-                        "data": response_serializer.data
-                    },
-                    status=status.HTTP_201_CREATED
-                )
-
-        except Exception as e:
+                # 6. Sectionlarni bloklab oxirgi raqamlarni olish - parallel muharrirlar navbat kutadi
+                next_numbers = lock_last_numbers(ListeningQuestion, 'section', 'question_number', sections.keys())
+
+                # 7. Mavjud savollar bilan konflikt - barcha sectionlar uchun bitta query
+                if requested_numbers:
+                    conflict_filter = Q()
+                    for section_id, numbers in requested_numbers.items():
+                        conflict_filter |= Q(section_id=section_id, question_number__in=numbers)
+                    conflicts = list(
+                        ListeningQuestion.objects.filter(conflict_filter)
+                        .values_list('section_id', 'question_number')
+                    )
+                    if conflicts:
+                        return Response(
+                            {
+                                "error": "Ushbu raqamli savollar allaqachon mavjud",
+                                "existing_question_numbers": [
+                                    {"section_id": section_id, "question_number": number}
+                                    for section_id, number in sorted(conflicts)
+                                ]
+                            },
+                            status=status.HTTP_400_BAD_REQUEST
+                        )
+
+                # 8. Raqamlash xotirada
+                for section_id, numbers in requested_numbers.items():
+                    next_numbers[section_id] = max(next_numbers.get(section_id, 0), max(numbers))
+
+                questions = []
+                for item in serializer.validated_data:
+                    question = ListeningQuestion(**item)
+                    if question.question_number is None:
+                        next_numbers[question.section_id] = next_numbers.get(question.section_id, 0) + 1
+                        question.question_number = next_numbers[question.section_id]
+                    questions.append(question)
+
+                # 9. Bitta INSERT
+                ListeningQuestion.objects.bulk_create(questions)
+
+                # bulk_create post_save signal yubormaydi - cache'larni qo'lda eskirtirish
+                for test_id in {sections[pk].test_id for pk in {q.section_id for q in questions}}:
+                    touch_test(test_id)
+                    transaction.on_commit(partial(invalidate_answer_key, 'listening', test_id))
+                    refresh_test_summary(test_id)
+                sync_media_refs_on_commit(q.question_image.name for q in questions if q.question_image)
+
+        except IntegrityError as e:
             return Response(
-                {"error": "Saqlashda xatolik yuz berdi", "details": str(e)},
+                {"error": "Saqlashda xatolik yuz berdi (raqamlar band bo'lgan bo'lishi mumkin)", "details": str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        response_serializer = ListeningQuestionSerializer(
+            questions, many=True, context=self.get_serializer_context()
+        )
+        return Response(
+            {
+                "message": f"{len(questions)} ta savol muvaffaqiyatli yaratildi",
+                "data": response_serializer.data
+            },
+            status=status.HTTP_201_CREATED
+        )
+
 
     # @extend_schema(
     #     request={
@@ -0,0 +1,61 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from app.custom_permission import IsTeacherOrAdmin
+from dashboard.search import SEARCH_TARGETS, search_content
+from dashboard.serializers import ContentSearchHitSerializer
+
+
+@extend_schema(tags=['Content Search'])
+class ContentSearchView(APIView):
+    """
+    Kontent bankida qidiruv (passage, savollar, writing promptlar).
+    Mualliflar mavzular takrorlanmasligi uchun ishlatadi - faqat Teacher/Admin.
+    """
+    permission_classes = [IsTeacherOrAdmin]
+
+    @extend_schema(
+        summary="Kontent bankida full-text qidiruv",
+        description="Natijalar rank bo'yicha tartiblangan, headline da mos so'zlar <mark> bilan belgilangan. "
+                    "q - websearch sintaksisi: \"climate change\" -plastic",
+        parameters=[
+            OpenApiParameter(name='q', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=True),
+            OpenApiParameter(
+                name='kind', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=False,
+                description=f"Vergul bilan: {', '.join(SEARCH_TARGETS)}"
+            ),
+            OpenApiParameter(name='test_id', type=OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False),
+            OpenApiParameter(name='limit', type=OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False),
+        ],
+        responses={200: ContentSearchHitSerializer(many=True), 400: OpenApiTypes.OBJECT}
+    )
+    def get(self, request):
+        text = request.query_params.get('q', '').strip()
+        if len(text) < 2:
+            return Response(
+                {'error': 'q parametri kamida 2 ta belgidan iborat bo\'lishi kerak'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        kinds = [kind for kind in request.query_params.get('kind', '').split(',') if kind]
+        unknown = set(kinds) - set(SEARCH_TARGETS)
+        if unknown:
+            return Response(
+                {'error': f"Noma'lum kind: {', '.join(sorted(unknown))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            test_id = int(request.query_params['test_id']) if request.query_params.get('test_id') else None
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            return Response(
+                {'error': 'test_id va limit butun son bo\'lishi kerak'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        hits = search_content(text, kinds=kinds or None, test_id=test_id, limit=limit)
+        return Response(ContentSearchHitSerializer(hits, many=True).data)
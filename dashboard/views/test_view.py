@@ -1,30 +1,56 @@
 from django.template.context_processors import request
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import parse_etags
 
-from dashboard.serializers import TestSerializer
-from rest_framework import viewsets, filters
+from dashboard.serializers import TestSerializer, ExamBundleSerializer
+from dashboard.exam_bundle import get_exam_bundle, with_audio_urls
+from dashboard.media_manifest import get_media_manifest, with_urls
+from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.response import Response
+from dashboard.conditional import ConditionalContentMixin
 from dashboard.custom_permission import IsTeacherOrAdminOrReadOnly
 from app.models import Test
+from app.services.rescoring import rescore_test, sync_rescore_error
+from app.services.test_package import PackageError, import_test_package, iter_test_package, export_filename
+from app.services.test_versions import clone_test
+from app.services.test_summary import get_test_summary
+from app.services.audio_delivery import active_listening_attempt_id, can_preview_audio
 from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
 
 @extend_schema(
     tags=["Tests"]
 )
-class TestViewSet(viewsets.ModelViewSet):
+class TestViewSet(ConditionalContentMixin, viewsets.ModelViewSet):
     queryset = Test.objects.all()
     serializer_class = TestSerializer
     permission_classes = [IsTeacherOrAdminOrReadOnly]  # Custom permission
+    content_test_field = ''
 
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'difficulty_level']
 
+    @staticmethod
+    def audio_access(request, test):
+        """(preview, attempt_id) - audio havolasi kimga va qaysi token bilan beriladi"""
+        if can_preview_audio(request.user):
+            return True, None
+        return False, active_listening_attempt_id(request.user, test.id)
+
+    @staticmethod
+    def audio_audience(preview, attempt_id):
+        return 'preview' if preview else f'attempt{attempt_id}' if attempt_id else 'anon'
+
     def get_queryset(self):
         user = self.request.user
 
         if user.is_staff or user.role in ['admin', 'teacher']:
-            return Test.objects.all()
+            return Test.objects.select_related('summary')
 
-        return Test.objects.filter(is_published=True)
+        return Test.objects.filter(is_published=True).select_related('summary')
 
     @extend_schema(
         summary="Yangi Test yaratish",
@@ -33,4 +59,180 @@ class TestViewSet(viewsets.ModelViewSet):
         responses={201: TestSerializer}
     )
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
\ No newline at end of file
+        serializer.save(created_by=self.request.user)
+
+    @extend_schema(
+        summary="Test attemptlarini qayta baholash",
+        description="correct_answer o'zgargandan keyin barcha Listening/Reading javoblarini qayta baholaydi. "
+                    "So'rov ichida SYNC_RESCORE_MAX_ATTEMPTS tagacha attempt baholanadi, "
+                    "kattaroq testlar uchun 400 - `manage.py rescore_test` buyrug'idan foydalaning.",
+        request=None,
+        responses={200: {'type': 'object'}, 400: OpenApiTypes.OBJECT}
+    )
+    @action(detail=True, methods=['post'])
+    def rescore(self, request, pk=None):
+        test = self.get_object()
+        error = sync_rescore_error(test.id)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        stats = rescore_test(test.id)
+        return Response({
+            'message': f"{stats['attempts']} ta attempt qayta baholandi",
+            'attempts': stats['attempts'],
+            'answers': stats['answers'],
+            'changed_answers': stats['changed'],
+            'elapsed': round(stats['elapsed'], 2),
+        }, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Butun test bitta JSON hujjatda (exam bundle)",
+        description="Sectionlar, savollar (javoblarsiz), passagelar, writing tasklar va rasm URL lari. "
+                    "audio_urls - imzolangan section audio havolalari (teacher yoki faol attempt uchun). "
+                    "Javob ETag bilan qaytadi; If-None-Match mos kelsa 304.",
+        responses={200: ExamBundleSerializer, 304: None}
+    )
+    @action(detail=True, methods=['get'])
+    def bundle(self, request, pk=None):
+        test = self.get_object()
+        preview, attempt_id = self.audio_access(request, test)
+        body, etag = get_exam_bundle(test.id)
+        # Audio havolalari so'rovchiga bog'liq - ETag ham
+        etag = f'{etag[:-1]}-{self.audio_audience(preview, attempt_id)}"'
+
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            body = with_audio_urls(body, request, test.id, attempt_id=attempt_id, preview=preview)
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    @extend_schema(
+        summary="Exam media manifest (oldindan yuklash uchun)",
+        description="Section audiolari, savol va writing rasmlari: hajm, sha256, ETag/Last-Modified. "
+                    "Audio havolalari faqat faol attempt (yoki teacher) uchun beriladi. "
+                    "If-None-Match mos kelsa 304.",
+        responses={200: {'type': 'object'}, 304: None}
+    )
+    @action(detail=True, methods=['get'], url_path='media-manifest')
+    def media_manifest(self, request, pk=None):
+        test = self.get_object()
+        preview, attempt_id = self.audio_access(request, test)
+
+        manifest, version = get_media_manifest(test.id)
+        # Audio havolalari so'rovchiga bog'liq - ETag ham
+        etag = f'"media-{test.id}-{version}-{self.audio_audience(preview, attempt_id)}"'
+
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = Response({
+                'version': str(version),
+                **with_urls(manifest, request, attempt_id=attempt_id, preview=preview),
+            })
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    @extend_schema(
+        summary="Testni zip paket sifatida yuklab olish",
+        description="manifest.json + audio/rasmlar bitta arxivda. Arxiv oqim bilan yuboriladi. "
+                    "Faqat Admin yoki Teacher.",
+        responses={(200, 'application/zip'): OpenApiTypes.BINARY}
+    )
+    @action(detail=True, methods=['get'])
+    def export(self, request, pk=None):
+        # Paketda correct_answer bor - GET bo'lsa ham faqat teacher/admin
+        if not (request.user.is_staff or request.user.role in ['admin', 'teacher']):
+            return Response(
+                {'error': 'Faqat teacher yoki admin eksport qila oladi'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        test = self.get_object()
+        response = StreamingHttpResponse(iter_test_package(test.id), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="{export_filename(test)}"'
+        return response
+
+    @extend_schema(
+        summary="Zip paketdan yangi test yaratish",
+        description="Export qilingan paketni import qiladi. Avval hammasi tekshiriladi, keyin test "
+                    "bitta transaction ichida yaratiladi (nashr qilinmagan holda).",
+        request={
+            'multipart/form-data': {
+                'type': 'object',
+                'properties': {
+                    'package': {'type': 'string', 'format': 'binary'}
+                },
+                'required': ['package']
+            }
+        },
+        responses={201: TestSerializer, 400: OpenApiTypes.OBJECT}
+    )
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser, FormParser])
+    def import_package(self, request):
+        package = request.FILES.get('package')
+        if not package:
+            return Response(
+                {'error': 'package fayli majburiy'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            test = import_test_package(package, user=request.user)
+        except PackageError as e:
+            return Response(
+                {'error': "Paket noto'g'ri", 'details': e.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(TestSerializer(test).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Testni nusxalash",
+        description="Sectionlar, savollar, passagelar va tasklar bilan mustaqil nusxa yaratadi. "
+                    "Media fayllar qayta yuklanmaydi. Nusxa nashr qilinmagan holda bo'ladi.",
+        request=None,
+        responses={201: TestSerializer}
+    )
+    @action(detail=True, methods=['post'])
+    def clone(self, request, pk=None):
+        test = self.get_object()
+        copy = clone_test(test.id, user=request.user)
+        return Response(TestSerializer(copy).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Testning yangi versiyasini yaratish",
+        description="Nashr qilingan (muzlatilgan) test o'zgartirilmaydi - uning o'rniga tahrirlanadigan "
+                    "yangi versiya yaratiladi. Eski attemptlar eski versiyaga bog'langan holda qoladi.",
+        request=None,
+        responses={201: TestSerializer}
+    )
+    @action(detail=True, methods=['post'])
+    def new_version(self, request, pk=None):
+        test = self.get_object()
+        version = clone_test(test.id, user=request.user, as_version=True)
+        return Response(TestSerializer(version).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Testni nashr qilish",
+        description="Test to'liq bo'lsa (4 section, 40 listening savol, 3 passage, 40 reading savol, "
+                    "2 writing task) nashr qilinadi va muzlatiladi. Tekshiruv tayyor summary qatoridan.",
+        request=None,
+        responses={200: TestSerializer, 400: OpenApiTypes.OBJECT}
+    )
+    @action(detail=True, methods=['post'])
+    def publish(self, request, pk=None):
+        test = self.get_object()
+        summary = get_test_summary(test)
+        if not summary.is_ready:
+            return Response(
+                {'error': "Test to'liq emas", 'missing': summary.missing()},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not test.is_published:
+            test.is_published = True
+            test.save(update_fields=['is_published', 'updated_at'])
+        return Response(TestSerializer(test).data, status=status.HTTP_200_OK)
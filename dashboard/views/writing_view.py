@@ -2,23 +2,29 @@ from trace import Trace
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.response import Response
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
 from app.models import WritingTask, Test
+from app.models.numbering import lock_last_numbers
+from app.services.content_version import touch_test
+from app.services.media_storage import instance_media_names, sync_media_refs_on_commit
+from app.services.test_summary import refresh_test_summary
 from dashboard.serializers import (
     WritingTaskSerializer,
     WritingTaskListSerializer,
     WritingTaskDetailSerializer
 )
-from dashboard.custom_permission import IsTeacherOrAdminOrReadOnly
+from dashboard.conditional import ConditionalContentMixin
+from dashboard.custom_permission import IsTeacherOrAdminOrReadOnly, IsTestContentEditable, request_values
 
 
 @extend_schema(tags=['Writing Tasks'])
-class WritingTaskViewSet(viewsets.ModelViewSet):
+class WritingTaskViewSet(ConditionalContentMixin, viewsets.ModelViewSet):
     """
     Writing Task CRUD
 
@@ -26,10 +32,16 @@ class WritingTaskViewSet(viewsets.ModelViewSet):
     Student: Read only
     """
     queryset = WritingTask.objects.all().select_related('test')
-    permission_classes = [IsTeacherOrAdminOrReadOnly]
+    permission_classes = [IsTeacherOrAdminOrReadOnly, IsTestContentEditable]
 
     parser_classes = (MultiPartParser, FormParser)
 
+    def get_request_test_ids(self, request):
+        return request_values(request.data, 'test')
+
+    def get_object_test_id(self, obj):
+        return obj.test_id
+
 
     def get_serializer_class(self):
         """Role ga qarab serializer tanlash"""
@@ -138,7 +150,8 @@ class WritingTaskViewSet(viewsets.ModelViewSet):
         },
         description="Create both tasks for a test at once"
     )
-    @action(detail=False, methods=['post'])
+    # List faqat JSON da keladi (multipart list yubora olmaydi)
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser])
     def bulk_create(self, request):
         """
         Bir testning ikkala taskini bir vaqtda yaratish
@@ -177,6 +190,30 @@ class WritingTaskViewSet(viewsets.ModelViewSet):
 
         serializer = WritingTaskSerializer(data=request.data, many=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
 
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
\ No newline at end of file
+        with transaction.atomic():
+            # Testni bloklab oxirgi task raqami - raqamlash xotirada, bitta INSERT
+            next_numbers = lock_last_numbers(
+                WritingTask, 'test', 'task_number', [item['test'].id for item in serializer.validated_data]
+            )
+            tasks = []
+            for item in serializer.validated_data:
+                task = WritingTask(**item)
+                next_numbers[task.test_id] += 1
+                task.task_number = next_numbers[task.test_id]
+                tasks.append(task)
+
+            if any(task.task_number > 2 for task in tasks):
+                return Response(
+                    {'error': 'Test already has Task 1 and Task 2'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            WritingTask.objects.bulk_create(tasks)
+
+            # bulk_create post_save signal yubormaydi
+            for test_id in {task.test_id for task in tasks}:
+                touch_test(test_id)
+                refresh_test_summary(test_id)
+            sync_media_refs_on_commit(name for task in tasks for name in instance_media_names(task))
+
+        return Response(WritingTaskSerializer(tasks, many=True).data, status=status.HTTP_201_CREATED)
\ No newline at end of file